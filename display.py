@@ -1,3 +1,4 @@
+from drivers.spi_stream import make_stream
 from drivers.tft_spi import ILI9341, TFTBase
 from machine import Pin, SPI
 import pins
@@ -13,7 +14,8 @@ def initialize() -> TFTBase:
     Initialize the ILI9341 TFT display and clear the screen to black.
 
     Configures the SPI bus and control pins, instantiates and initializes the
-    ILI9341 display driver, and clears the display.
+    ILI9341 display driver (streaming pixels by DMA when the port supports it),
+    and clears the display.
 
     Side effects:
         Prints the configured SPI object to the console.
@@ -33,7 +35,10 @@ def initialize() -> TFTBase:
     dc  = Pin(pins.TFT_DC_PIN, Pin.OUT)
     rst = Pin(pins.TFT_RST_PIN, Pin.OUT)
 
-    tft = ILI9341(spi, cs, dc, rst=rst, rotation=SCR_ROT, bgr=True, invert=False)
+    # Pixel data goes out by DMA when available
+    stream = make_stream(spi, 0)
+
+    tft = ILI9341(spi, cs, dc, rst=rst, rotation=SCR_ROT, bgr=True, invert=False, stream=stream)
 
     tft.init()
     tft.erase()
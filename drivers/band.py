@@ -0,0 +1,295 @@
+# band.py
+# Banded off-screen renderer for TFTBase displays
+#
+# A full RGB565 framebuffer for a 240x320 panel is 150 KB, which does not
+# fit on the Pico. BandRenderer instead records the draw calls for a screen
+# and rasterizes them one horizontal band at a time into a single reusable
+# RGB565 strip. Each finished strip is streamed with one window, so a whole
+# screen goes out as a handful of large writes instead of hundreds of small
+# ones.
+#
+# Usage:
+#     canvas = BandRenderer(tft, ram_budget=10240)
+#     canvas.fill_rect(10, 10, 100, 16, WHITE)
+#     canvas.text("Alpine", 14, 14, BLACK)
+#     canvas.render()
+
+from drivers.tft_spi import _circle_rects, _glyph_runs, _line_runs
+
+_OP_RECT = 0
+_OP_TEXT = 1
+_OP_BLIT = 2
+
+# Default strip size in bytes (~21 rows of a 240 pixel wide panel)
+_DEFAULT_BUDGET = 10240
+
+
+class BandRenderer:
+    """
+    Record draw calls for a screen and stream them band by band.
+
+    The recorder exposes the same drawing API as :class:`TFTBase` for the
+    primitives it supports (``fill``, ``fill_rect``, ``rect``, ``hline``,
+    ``vline``, ``pixel``, ``line``, ``circle``, ``fill_circle``, ``text``
+    and ``blit_rgb565``). Nothing is sent to the panel until
+    :meth:`render` is called; every pixel in the rendered region is then
+    written exactly once.
+
+    Parameters:
+        tft (TFTBase): Display the bands are streamed to.
+        band_height (int or None): Rows per band. When None it is derived
+            from ``ram_budget`` and the display width.
+        ram_budget (int): Maximum size in bytes of the reusable strip. With
+            an asynchronous (DMA) stream two strips of this size are used.
+        bg (int): RGB565 color for pixels no recorded op covers.
+    """
+    def __init__(self, tft, band_height=None, ram_budget=_DEFAULT_BUDGET, bg=0x0000):
+        self.tft = tft
+        row_bytes = 2 * tft.width
+        if band_height is None:
+            band_height = ram_budget // row_bytes
+        self.band_height = max(1, band_height)
+        # With an asynchronous stream, rasterize into one strip while the
+        # other is still being sent
+        count = 2 if getattr(tft._stream, "asynchronous", False) else 1
+        self._strips = [bytearray(row_bytes * self.band_height) for _ in range(count)]
+        self._ops = []
+        self._font = tft._font
+        self._patterns = {}
+        self.bg = bg
+
+    # --- Recording ---
+    def clear(self):
+        """Drop every recorded op so the recorder can be reused for a new screen."""
+        self._ops = []
+        self._patterns = {}
+
+    def set_font(self, font):
+        self._font = font
+
+    def fill(self, color):
+        # Everything recorded so far would be painted over anyway
+        self._ops = []
+        self.bg = color
+
+    def erase(self):
+        self.fill(0x0000)
+
+    def fill_rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return
+        self._ops.append((_OP_RECT, y, y + h, x, w, color))
+
+    def pixel(self, x, y, color):
+        self.fill_rect(x, y, 1, 1, color)
+
+    def hline(self, x, y, w, color):
+        self.fill_rect(x, y, w, 1, color)
+
+    def vline(self, x, y, h, color):
+        self.fill_rect(x, y, 1, h, color)
+
+    def rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return
+        self.hline(x, y, w, color)
+        self.hline(x, y + h - 1, w, color)
+        self.vline(x, y, h, color)
+        self.vline(x + w - 1, y, h, color)
+
+    def line(self, x0, y0, x1, y1, color):
+        for x, y, w, h in _line_runs(x0, y0, x1, y1):
+            self.fill_rect(x, y, w, h, color)
+
+    def circle(self, x0, y0, r, color):
+        if r < 0:
+            return
+        for dx, dy, w, h in _circle_rects(r, False):
+            self.fill_rect(x0 + dx, y0 + dy, w, h, color)
+
+    def fill_circle(self, x0, y0, r, color):
+        if r < 0:
+            return
+        for dx, dy, w, h in _circle_rects(r, True):
+            self.fill_rect(x0 + dx, y0 + dy, w, h, color)
+
+    def text(self, s, x, y, color, bg=None, spacing=1):
+        """
+        Record a string; arguments and return value match :meth:`TFTBase.text`.
+        """
+        font = self._font
+        font_height = font.height()
+        lines = s.count("\n") + 1
+        bottom = y + lines * (font_height + 2)
+        self._ops.append((_OP_TEXT, y, bottom, x, s, color, bg, spacing, font))
+        return bottom
+
+    def blit_rgb565(self, x, y, w, h, data, key=None):
+        if w <= 0 or h <= 0:
+            return
+        self._ops.append((_OP_BLIT, y, y + h, x, w, data, key))
+
+    # --- Rasterization ---
+    def _pattern(self, color):
+        # A full strip-row of one color, used to fill spans with slice copies
+        pat = self._patterns.get(color)
+        if pat is None:
+            pat = bytearray(2 * self.tft.width)
+            pat[0] = (color >> 8) & 0xFF
+            pat[1] = color & 0xFF
+            n = 2
+            while n < len(pat):
+                k = min(n, len(pat) - n)
+                pat[n:n + k] = pat[:k]
+                n += k
+            pat = memoryview(pat)
+            self._patterns[color] = pat
+        return pat
+
+    def render(self, x=0, y=0, w=None, h=None):
+        """
+        Rasterize the recorded ops and stream them to the display.
+
+        Only the region (x, y, w, h) is sent, defaulting to the full screen.
+        The region is processed in bands of up to ``band_height`` rows (more
+        when the region is narrower than the screen), each one streamed
+        under a single window.
+        """
+        tft = self.tft
+        tft.begin()
+        try:
+            for _ in self.render_steps(x, y, w, h):
+                pass
+        finally:
+            tft.end()
+
+    def render_steps(self, x=0, y=0, w=None, h=None):
+        """
+        Generator form of :meth:`render` that yields after each band.
+
+        Each band is its own bus transaction, so the caller may run other
+        work (or other SPI users) between steps.
+        """
+        tft = self.tft
+        if w is None:
+            w = tft.width - x
+        if h is None:
+            h = tft.height - y
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        w = min(w, tft.width - x)
+        h = min(h, tft.height - y)
+        if w <= 0 or h <= 0:
+            return
+
+        stride = 2 * w
+        strips = self._strips
+        rows = len(strips[0]) // stride
+        which = 0
+        bg = self._pattern(self.bg)[:stride]
+        ops = self._ops
+
+        by = y
+        while by < y + h:
+            bh = min(rows, y + h - by)
+            band = memoryview(strips[which])[:stride * bh]
+            which = (which + 1) % len(strips)
+            for r in range(bh):
+                band[r * stride:(r + 1) * stride] = bg
+            b1 = by + bh
+            for op in ops:
+                if op[1] >= b1 or op[2] <= by:
+                    continue
+                kind = op[0]
+                if kind == _OP_RECT:
+                    self._raster_rect(band, x, by, w, bh, op)
+                elif kind == _OP_TEXT:
+                    self._raster_text(band, x, by, w, bh, op)
+                else:
+                    self._raster_blit(band, x, by, w, bh, op)
+            tft.begin()
+            try:
+                tft.blit_rgb565(x, by, w, bh, band)
+            finally:
+                tft.end()
+            by = b1
+            yield
+
+    def _raster_rect(self, band, bx, by, bw, bh, op):
+        _, ry0, ry1, rx, rw, color = op
+        x0 = max(rx, bx)
+        x1 = min(rx + rw, bx + bw)
+        if x0 >= x1:
+            return
+        y0 = max(ry0, by)
+        y1 = min(ry1, by + bh)
+        if y0 >= y1:
+            return
+        pat = self._pattern(color)
+        n = 2 * (x1 - x0)
+        stride = 2 * bw
+        p = (y0 - by) * stride + 2 * (x0 - bx)
+        for _ in range(y1 - y0):
+            band[p:p + n] = pat[:n]
+            p += stride
+
+    def _raster_text(self, band, bx, by, bw, bh, op):
+        _, ty, _, tx, s, color, bg, spacing, font = op
+        font_height = font.height()
+        by1 = by + bh
+        bx1 = bx + bw
+        cx = tx
+        n = len(s)
+        for i in range(n):
+            ch = s[i]
+            if ch == "\n":
+                cx = tx
+                ty += font_height + 2
+                continue
+            runs, char_width = _glyph_runs(font, ch)
+            # Like TFTBase.text: opaque glyphs cover their cell plus the spacing
+            # row/column, and every glyph but the last of a line also covers
+            # the gap from a wider spacing
+            cell = char_width + 1
+            if spacing > 1 and i + 1 < n and s[i + 1] != "\n":
+                cell = char_width + spacing
+            if ty >= by1 or ty + font_height + 1 <= by or cx >= bx1 or cx + cell <= bx:
+                cx += char_width + spacing
+                continue
+            if bg is not None:
+                self._raster_rect(band, bx, by, bw, bh,
+                                  (_OP_RECT, ty, ty + font_height + 1, cx, cell, bg))
+            for i in range(0, len(runs), 4):
+                ry = ty + runs[i + 1]
+                self._raster_rect(band, bx, by, bw, bh,
+                                  (_OP_RECT, ry, ry + runs[i + 3], cx + runs[i], runs[i + 2], color))
+            cx += char_width + spacing
+
+    def _raster_blit(self, band, bx, by, bw, bh, op):
+        _, iy0, iy1, ix, iw, data, key = op
+        x0 = max(ix, bx)
+        x1 = min(ix + iw, bx + bw)
+        if x0 >= x1:
+            return
+        y0 = max(iy0, by)
+        y1 = min(iy1, by + bh)
+        stride = 2 * bw
+        src = memoryview(data)
+        n = 2 * (x1 - x0)
+        for yy in range(y0, y1):
+            s = ((yy - iy0) * iw + (x0 - ix)) * 2
+            p = (yy - by) * stride + 2 * (x0 - bx)
+            if key is None:
+                band[p:p + n] = src[s:s + n]
+                continue
+            khi, klo = (key >> 8) & 0xFF, key & 0xFF
+            for i in range(0, n, 2):
+                hi = src[s + i]
+                lo = src[s + i + 1]
+                if hi != khi or lo != klo:
+                    band[p + i] = hi
+                    band[p + i + 1] = lo
@@ -0,0 +1,164 @@
+# console.py
+# On-screen text console stream for TFTBase displays
+#
+# Console is a MicroPython stream (io.IOBase with write/readinto/ioctl) that
+# shows what is written to it in a hardware-scrolled TextViewport. Attached
+# with os.dupterm() it mirrors everything the REPL and print() output; it can
+# also be passed as print(..., file=console).
+#
+# Writes are only buffered; a line is drawn when its "\n" arrives. Each new
+# line costs one line of pixels plus one VSCRSADD register write once the
+# screen is full, and lines wider than the screen wrap at word boundaries.
+# Output is never read back, so the REPL itself is not slowed down.
+#
+# Usage:
+#     console = Console(tft, fg=GREEN)
+#     console.attach()            # os.dupterm: mirror the REPL and print()
+#     print("Connecting to WiFi...")
+#     console.close()             # detach and restore an unscrolled panel
+
+import io
+import os
+
+from drivers.text_layout import WRAP_GREEDY, break_lines
+from drivers.viewport import TextViewport
+
+# Longest partial line kept while waiting for "\n"
+_MAX_PENDING = 256
+
+
+def _printable(raw):
+    # Decode one line and drop what the fonts cannot draw: "\r", other control
+    # characters and ANSI escape sequences (the REPL uses them when editing)
+    try:
+        s = raw.decode()
+    except UnicodeError:
+        s = "".join(chr(b) if b < 128 else "?" for b in raw)
+    if "\x1b" not in s and "\r" not in s and "\x08" not in s:
+        return s
+    out = []
+    i = 0
+    n = len(s)
+    while i < n:
+        ch = s[i]
+        i += 1
+        if ch == "\x1b":
+            # CSI: ESC [ parameters final-letter
+            if i < n and s[i] == "[":
+                i += 1
+                while i < n and not s[i].isalpha():
+                    i += 1
+            i += 1
+        elif ch == "\x08":
+            if out:
+                out.pop()
+        elif ch >= " ":
+            out.append(ch)
+    return "".join(out)
+
+
+class Console(io.IOBase):
+    """
+    Line-buffered text stream shown in a hardware-scrolled viewport.
+
+    Parameters:
+        tft (TFTBase): Display in rotation 0 or 2 (hardware scrolling).
+        top (int): First row of the console area.
+        height (int or None): Height of the console area; defaults to the
+            rest of the screen.
+        fg, bg (int): RGB565 text and background colors.
+        font: Font module; defaults to the display's current font.
+    """
+    def __init__(self, tft, top=0, height=None, fg=0xFFFF, bg=0x0000, font=None):
+        if height is None:
+            height = tft.height - top
+        view = TextViewport(tft, top, height, fg, bg, font)
+        # One line more than fits keeps scrolling to a single new row per line
+        view.max_lines = view.rows + 1
+        self.view = view
+        self.tft = tft
+        self.width = tft.width - view.x
+        self._pending = b""
+        self._prev = None
+        self._attached = False
+
+    # --- Stream protocol ---
+    def write(self, buf):
+        """
+        Buffer ``buf`` (str or bytes-like) and draw every line it completes.
+
+        Returns:
+            int: Number of bytes or characters accepted (all of them).
+        """
+        data = buf.encode() if isinstance(buf, str) else bytes(buf)
+        pending = self._pending + data
+        start = 0
+        end = pending.find(b"\n")
+        while end >= 0:
+            self._show(pending[start:end])
+            start = end + 1
+            end = pending.find(b"\n", start)
+        if start:
+            pending = pending[start:]
+        if len(pending) > _MAX_PENDING:
+            self._show(pending)
+            pending = b""
+        self._pending = pending
+        return len(buf)
+
+    def readinto(self, buf):
+        # Output only: dupterm never gets input from the console
+        return None
+
+    def ioctl(self, req, arg):
+        # Never readable (MP_STREAM_POLL), nothing else to do
+        return 0
+
+    def flush(self):
+        """Draw the unfinished line, if any, as a line of its own."""
+        if self._pending:
+            self._show(self._pending)
+            self._pending = b""
+
+    def _show(self, raw):
+        s = _printable(raw)
+        view = self.view
+        if not s:
+            view.append("")
+            return
+        for start, end, _ in break_lines(view.font, s, self.width, WRAP_GREEDY):
+            view.append(s[start:end])
+
+    # --- dupterm ---
+    @property
+    def attached(self):
+        return self._attached
+
+    def attach(self):
+        """
+        Mirror the REPL and print() output with os.dupterm().
+
+        Returns:
+            bool: False if this port has no os.dupterm(); write to the
+            console directly (print(..., file=console)) instead.
+        """
+        if not self._attached:
+            dupterm = getattr(os, "dupterm", None)
+            if dupterm is None:
+                return False
+            self._prev = dupterm(self)
+            self._attached = True
+        return True
+
+    def detach(self):
+        """Stop mirroring and restore the previous dupterm stream."""
+        if self._attached:
+            os.dupterm(self._prev)
+            self._prev = None
+            self._attached = False
+
+    def close(self):
+        """Flush, detach and return the panel to a single unscrolled region."""
+        self.flush()
+        self.detach()
+        self.view.close()
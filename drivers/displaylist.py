@@ -0,0 +1,339 @@
+# displaylist.py
+# Recordable, replayable and serializable display lists for TFTBase
+#
+# A DisplayList exposes the TFTBase drawing API but, instead of drawing,
+# appends each call to a compact byte buffer: one opcode byte followed by
+# the packed arguments. Strings, fonts and sprite data are interned, so a
+# label drawn many times is stored once and a font is stored as its module
+# name. The list can be replayed onto any TFTBase (or anything with the same
+# API, such as a BandRenderer) and saved to / loaded from flash.
+#
+# Usage:
+#     dl = DisplayList()
+#     dl.fill_rect(10, 10, 100, 16, WHITE)
+#     dl.text("Alpine", 14, 14, BLACK)
+#     dl.save("forecast.dl")
+#     DisplayList.load("forecast.dl").replay(tft)
+
+try:
+    import ustruct as struct
+except ImportError:
+    import struct
+
+import fonts.tt7
+
+_MAGIC = b"TDL1"
+
+# Opcodes
+_FILL_RECT = 0
+_TEXT = 1
+_TEXT_BG = 2
+_FONT = 3
+_FILL = 4
+_RECT = 5
+_LINE = 6
+_CIRCLE = 7
+_FILL_CIRCLE = 8
+_BLIT = 9
+_BLIT_KEY = 10
+_PUSH_CLIP = 11
+_POP_CLIP = 12
+
+# Argument layouts (little-endian, no padding)
+_FMT_RECT = "<hhhhH"         # x, y, w, h, color (also line: x0, y0, x1, y1)
+_FMT_TEXT = "<HhhHb"         # string, x, y, color, spacing
+_FMT_TEXT_BG = "<HhhHHb"     # string, x, y, color, bg, spacing
+_FMT_FONT = "<B"             # font
+_FMT_COLOR = "<H"            # color
+_FMT_CIRCLE = "<hhhH"        # x0, y0, r, color
+_FMT_BLIT = "<hhhhH"         # x, y, w, h, blob
+_FMT_BLIT_KEY = "<hhhhHH"    # x, y, w, h, blob, key
+_FMT_CLIP = "<hhhh"          # x, y, w, h
+
+
+def _resolve_font(name):
+    # Import a font module from its dotted name ("fonts.tt14")
+    mod = __import__(name)
+    for part in name.split(".")[1:]:
+        mod = getattr(mod, part)
+    return mod
+
+
+class DisplayList:
+    """
+    Compact recording of TFTBase draw calls.
+
+    Supports ``fill``, ``erase``, ``fill_rect``, ``pixel``, ``hline``,
+    ``vline``, ``rect``, ``line``, ``circle``, ``fill_circle``, ``text``,
+    ``set_font``, ``blit_rgb565``, ``push_clip`` and ``pop_clip`` with the
+    same arguments as :class:`TFTBase`.
+
+    Parameters:
+        font: Font module text is recorded with until :meth:`set_font` is
+            called; defaults to ``fonts.tt7`` like TFTBase.
+    """
+    def __init__(self, font=None):
+        self._ops = bytearray()
+        self._strings = []
+        self._string_ids = {}
+        self._fonts = []
+        self._font_ids = {}
+        self._blobs = []
+        self._font = fonts.tt7 if font is None else font
+        self._recorded_font = None
+
+    def __len__(self):
+        return len(self._ops)
+
+    def __eq__(self, other):
+        """True if both lists hold the same ops, i.e. :meth:`save` writes the same file."""
+        if not isinstance(other, DisplayList):
+            return NotImplemented
+        return (self._ops == other._ops and self._strings == other._strings
+                and self._fonts == other._fonts
+                and [bytes(b) for b in self._blobs] == [bytes(b) for b in other._blobs])
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    def clear(self):
+        self.__init__(self._font)
+
+    # --- Interning ---
+    def _intern_string(self, s):
+        index = self._string_ids.get(s)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(s)
+            self._string_ids[s] = index
+        return index
+
+    def _intern_font(self, font):
+        name = font.__name__
+        index = self._font_ids.get(name)
+        if index is None:
+            index = len(self._fonts)
+            self._fonts.append(font)
+            self._font_ids[name] = index
+        return index
+
+    def _emit(self, op, fmt, *args):
+        ops = self._ops
+        ops.append(op)
+        ops.extend(struct.pack(fmt, *args))
+
+    # --- Recording ---
+    def set_font(self, font):
+        self._font = font
+
+    def fill(self, color):
+        self._emit(_FILL, _FMT_COLOR, color)
+
+    def erase(self):
+        self.fill(0x0000)
+
+    def fill_rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return
+        self._emit(_FILL_RECT, _FMT_RECT, x, y, w, h, color)
+
+    def pixel(self, x, y, color):
+        self.fill_rect(x, y, 1, 1, color)
+
+    def hline(self, x, y, w, color):
+        self.fill_rect(x, y, w, 1, color)
+
+    def vline(self, x, y, h, color):
+        self.fill_rect(x, y, 1, h, color)
+
+    def rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return
+        self._emit(_RECT, _FMT_RECT, x, y, w, h, color)
+
+    def line(self, x0, y0, x1, y1, color):
+        self._emit(_LINE, _FMT_RECT, x0, y0, x1, y1, color)
+
+    def circle(self, x0, y0, r, color):
+        self._emit(_CIRCLE, _FMT_CIRCLE, x0, y0, r, color)
+
+    def fill_circle(self, x0, y0, r, color):
+        self._emit(_FILL_CIRCLE, _FMT_CIRCLE, x0, y0, r, color)
+
+    def text(self, s, x, y, color, bg=None, spacing=1):
+        """
+        Record a string; arguments and return value match :meth:`TFTBase.text`.
+        """
+        font = self._font
+        if font is not self._recorded_font:
+            # Font changes are only recorded where text needs them
+            self._emit(_FONT, _FMT_FONT, self._intern_font(font))
+            self._recorded_font = font
+        index = self._intern_string(s)
+        if bg is None:
+            self._emit(_TEXT, _FMT_TEXT, index, x, y, color, spacing)
+        else:
+            self._emit(_TEXT_BG, _FMT_TEXT_BG, index, x, y, color, bg, spacing)
+        return y + (s.count("\n") + 1) * (font.height() + 2)
+
+    def blit_rgb565(self, x, y, w, h, data, key=None):
+        """Record a sprite blit; ``data`` is kept by reference and saved with the list."""
+        if w <= 0 or h <= 0:
+            return
+        index = len(self._blobs)
+        self._blobs.append(data)
+        if key is None:
+            self._emit(_BLIT, _FMT_BLIT, x, y, w, h, index)
+        else:
+            self._emit(_BLIT_KEY, _FMT_BLIT_KEY, x, y, w, h, index, key)
+
+    def push_clip(self, x, y, w, h):
+        self._emit(_PUSH_CLIP, _FMT_CLIP, x, y, w, h)
+
+    def pop_clip(self):
+        self._ops.append(_POP_CLIP)
+
+    # --- Replay ---
+    def replay(self, target):
+        """
+        Draw the recorded calls onto ``target``.
+
+        ``target`` is a TFTBase or any recorder with the same API. On a
+        TFTBase the whole list is drawn in one bus transaction, and the
+        target's font is restored afterwards.
+        """
+        ops = self._ops
+        strings = self._strings
+        fonts_ = self._fonts
+        blobs = self._blobs
+        unpack = struct.unpack_from
+        n = len(ops)
+        pos = 0
+        saved_font = getattr(target, "_font", None)
+        begin = getattr(target, "begin", None)
+        if begin is not None:
+            begin()
+        try:
+            while pos < n:
+                op = ops[pos]
+                pos += 1
+                if op == _FILL_RECT:
+                    x, y, w, h, c = unpack(_FMT_RECT, ops, pos)
+                    pos += 10
+                    target.fill_rect(x, y, w, h, c)
+                elif op == _TEXT:
+                    i, x, y, c, sp = unpack(_FMT_TEXT, ops, pos)
+                    pos += 9
+                    target.text(strings[i], x, y, c, None, sp)
+                elif op == _TEXT_BG:
+                    i, x, y, c, bg, sp = unpack(_FMT_TEXT_BG, ops, pos)
+                    pos += 11
+                    target.text(strings[i], x, y, c, bg, sp)
+                elif op == _FONT:
+                    target.set_font(fonts_[ops[pos]])
+                    pos += 1
+                elif op == _FILL:
+                    target.fill(unpack(_FMT_COLOR, ops, pos)[0])
+                    pos += 2
+                elif op == _RECT:
+                    x, y, w, h, c = unpack(_FMT_RECT, ops, pos)
+                    pos += 10
+                    target.rect(x, y, w, h, c)
+                elif op == _LINE:
+                    x0, y0, x1, y1, c = unpack(_FMT_RECT, ops, pos)
+                    pos += 10
+                    target.line(x0, y0, x1, y1, c)
+                elif op == _CIRCLE or op == _FILL_CIRCLE:
+                    x0, y0, r, c = unpack(_FMT_CIRCLE, ops, pos)
+                    pos += 8
+                    if op == _CIRCLE:
+                        target.circle(x0, y0, r, c)
+                    else:
+                        target.fill_circle(x0, y0, r, c)
+                elif op == _BLIT:
+                    x, y, w, h, i = unpack(_FMT_BLIT, ops, pos)
+                    pos += 10
+                    target.blit_rgb565(x, y, w, h, blobs[i])
+                elif op == _BLIT_KEY:
+                    x, y, w, h, i, key = unpack(_FMT_BLIT_KEY, ops, pos)
+                    pos += 12
+                    target.blit_rgb565(x, y, w, h, blobs[i], key)
+                elif op == _PUSH_CLIP:
+                    target.push_clip(*unpack(_FMT_CLIP, ops, pos))
+                    pos += 8
+                elif op == _POP_CLIP:
+                    target.pop_clip()
+                else:
+                    raise ValueError("bad display list opcode %d" % op)
+        finally:
+            if saved_font is not None:
+                target.set_font(saved_font)
+            if begin is not None:
+                target.end()
+
+    # --- Serialization ---
+    def save(self, path):
+        """
+        Write the list to a file.
+
+        Layout: ``b"TDL1"``, then the string, font and blob tables (each a
+        u16 count followed by u16/u32 length-prefixed entries; fonts are
+        stored as module names), then the u32 length of the op bytes and the
+        op bytes themselves.
+        """
+        with open(path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(struct.pack("<H", len(self._strings)))
+            for s in self._strings:
+                b = s.encode()
+                f.write(struct.pack("<H", len(b)))
+                f.write(b)
+            f.write(struct.pack("<H", len(self._fonts)))
+            for font in self._fonts:
+                b = font.__name__.encode()
+                f.write(struct.pack("<H", len(b)))
+                f.write(b)
+            f.write(struct.pack("<H", len(self._blobs)))
+            for blob in self._blobs:
+                f.write(struct.pack("<I", len(blob)))
+                f.write(blob)
+            f.write(struct.pack("<I", len(self._ops)))
+            f.write(self._ops)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a list written by :meth:`save`.
+
+        Raises:
+            ValueError: If the file is not a display list.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != _MAGIC:
+            raise ValueError("not a display list")
+        dl = cls()
+        pos = 4
+
+        def table(size_fmt, size_len):
+            nonlocal pos
+            count = struct.unpack_from("<H", data, pos)[0]
+            pos += 2
+            items = []
+            for _ in range(count):
+                n = struct.unpack_from(size_fmt, data, pos)[0]
+                pos += size_len
+                items.append(data[pos:pos + n])
+                pos += n
+            return items
+
+        for s in table("<H", 2):
+            dl._intern_string(s.decode())
+        for name in table("<H", 2):
+            dl._intern_font(_resolve_font(name.decode()))
+        dl._blobs = table("<I", 4)
+        n = struct.unpack_from("<I", data, pos)[0]
+        pos += 4
+        dl._ops = bytearray(data[pos:pos + n])
+        return dl
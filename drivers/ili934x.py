@@ -72,6 +72,11 @@ class ILI9341:
         self._scroll = 0
         self._buf = bytearray(_CHUNK * 2)
         self._colormap = bytearray(b'\x00\x00\xFF\xFF') #default white foregraound, black background
+        # framebuf reads and writes RGB565 little-endian, so palette entries
+        # stored big-endian come out big-endian again in the band
+        self._palette = framebuf.FrameBuffer(self._colormap, 2, 1, framebuf.RGB565)
+        # fill_rectangle() paints the whole chunk buffer through this one
+        self._chunk = framebuf.FrameBuffer(self._buf, _CHUNK, 1, framebuf.RGB565)
         self._x = 0
         self._y = 0
         self._font = glcdfont
@@ -215,9 +220,8 @@ class ILI9341:
         else:
             color = self._colormap[0:2] #background
 
-        for i in range(_CHUNK):
-            self._buf[2*i]=color[0]
-            self._buf[2*i+1]=color[1]
+        # Byte-swapped, so the little-endian fill leaves big-endian pixels
+        self._chunk.fill((color[1] << 8) | color[0])
 
         chunks, rest = divmod(w * h, _CHUNK)
         self._writeblock(int(x), int(y), int(x + w - 1), int(y + h - 1), None)
@@ -236,23 +240,16 @@ class ILI9341:
         y = min(self.height - 1, max(0, y))
         w = min(self.width - x, max(1, w))
         h = min(self.height - y, max(1, h))
-        chunks, rest = divmod(w * h, _CHUNK)
+        # Expand bitbuff a band of rows at a time: framebuf.blit maps each
+        # pixel through the 2-color palette into an RGB565 band in C
+        rows = max(1, _CHUNK // w)
+        band = framebuf.FrameBuffer(self._buf, w, rows, framebuf.RGB565)
+        mv = memoryview(self._buf)
         self._writeblock(x, y, x + w - 1, y + h - 1, None)
-        written = 0
-        for iy in range(h):
-            for ix in range(w):
-                index = ix+iy*w - written
-                if index >=_CHUNK:
-                    self._data(self._buf)
-                    written += _CHUNK
-                    index   -= _CHUNK
-                c = bitbuff.pixel(ix,iy)
-                self._buf[index*2] = self._colormap[c*2]
-                self._buf[index*2+1] = self._colormap[c*2+1]
-        rest = w*h - written
-        if rest != 0:
-            mv = memoryview(self._buf)
-            self._data(mv[:rest*2])
+        for iy in range(0, h, rows):
+            n = min(rows, h - iy)
+            band.blit(bitbuff, 0, -iy, -1, self._palette)
+            self._data(mv[:2 * w * n])
 
     def chars(self, str, x, y):
         str_w  = self._font.get_width(str)
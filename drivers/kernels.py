@@ -0,0 +1,231 @@
+# kernels.py
+# Pixel hot loops, compiled with the viper emitter where available
+#
+# On MicroPython builds with the native emitter the kernels come from
+# drivers/kernels_viper.py, which runs them as machine code with no
+# per-byte bytecode dispatch or allocation. Everywhere else (CPython, the
+# Linux emulator, ports without the emitter) the pure Python versions
+# below are used; they produce the same bytes (tests/test_kernels.py checks
+# both sets against the loops tft_spi used to inline).
+#
+# The viper versions live in a module of their own because a
+# @micropython.viper decorator on a port without the emitter is a compile
+# error that would otherwise make this module fail to import.
+#
+# Usage:
+#     from drivers import kernels
+#     kernels.fill16(buf, 0xF800)
+#     kernels.selftest()          # speedup table on the device
+
+import sys
+import time
+
+# --- Pure Python versions ---
+def _fill16(buf, color):
+    # Repeatedly double the copied prefix
+    size = len(buf)
+    if size < 2:
+        return
+    buf[0] = (color >> 8) & 0xFF
+    buf[1] = color & 0xFF
+    n = 2
+    while n < size:
+        k = n if n < size - n else size - n
+        buf[n:n + k] = buf[:k]
+        n += k
+
+
+def _glyph(data, tile, shape, color):
+    height = shape & 0xFF
+    w = shape >> 8
+    bytes_per_col = (height + 7) // 8
+    glyph_len = len(data)
+    hi, lo = (color >> 8) & 0xFF, color & 0xFF
+    for col in range(min(w, (glyph_len + bytes_per_col - 1) // bytes_per_col)):
+        base = col * bytes_per_col
+        for byte_idx in range(bytes_per_col):
+            glyph_idx = base + byte_idx
+            if glyph_idx >= glyph_len:
+                break
+            bits = data[glyph_idx]
+            row = byte_idx * 8
+            while bits and row < height:
+                if bits & 1:
+                    p = (row * w + col) * 2
+                    tile[p] = hi
+                    tile[p + 1] = lo
+                bits >>= 1
+                row += 1
+
+
+def _skip_key(data, p, end, key):
+    hi, lo = (key >> 8) & 0xFF, key & 0xFF
+    while p < end and data[p] == hi and data[p + 1] == lo:
+        p += 2
+    return p
+
+
+def _find_key(data, p, end, key):
+    hi, lo = (key >> 8) & 0xFF, key & 0xFF
+    while p < end and (data[p] != hi or data[p + 1] != lo):
+        p += 2
+    return p
+
+
+def _expand_gs4(src, lut, dst):
+    d = 0
+    for i in range(len(src)):
+        p = src[i] << 2
+        dst[d] = lut[p]
+        dst[d + 1] = lut[p + 1]
+        dst[d + 2] = lut[p + 2]
+        dst[d + 3] = lut[p + 3]
+        d += 4
+
+
+def _rgb565_to_666(src, lut, dst, n):
+    d = 0
+    for i in range(0, 2 * n, 2):
+        hi = src[i]
+        lo = src[i + 1]
+        dst[d] = lut[hi]
+        dst[d + 1] = lut[256 + hi] | lut[512 + lo]
+        dst[d + 2] = lut[768 + lo]
+        d += 3
+
+
+# --- Kernel selection ---
+# True when the viper kernels are in use
+VIPER = False
+
+fill16 = _fill16
+_glyph_kernel = _glyph
+skip_key = _skip_key
+find_key = _find_key
+expand_gs4 = _expand_gs4
+rgb565_to_666 = _rgb565_to_666
+
+if sys.implementation.name == "micropython":
+    try:
+        from drivers import kernels_viper as _viper
+    except (ImportError, SyntaxError, ValueError):
+        # No native emitter, or a .mpy built for another architecture
+        _viper = None
+    if _viper is not None:
+        fill16 = _viper.fill16
+        _glyph_kernel = _viper.glyph
+        skip_key = _viper.skip_key
+        find_key = _viper.find_key
+        expand_gs4 = _viper.expand_gs4
+        rgb565_to_666 = _viper.rgb565_to_666
+        VIPER = True
+
+
+def glyph_expand(glyph, height, tile, w, color):
+    """
+    Paint the lit pixels of a column-major mono glyph into an RGB565 tile.
+
+    Parameters:
+        glyph: Glyph bytes as returned by ``font.get_ch``; each column is
+            ``(height + 7) // 8`` bytes, least significant bit at the top.
+        height (int): Font height in pixels (at most 255).
+        tile: Big-endian RGB565 buffer ``w`` pixels wide, already filled
+            with the background.
+        w (int): Tile width in pixels (at most 255).
+        color (int): RGB565 color of the lit pixels.
+    """
+    _glyph_kernel(glyph, tile, (w << 8) | height, color)
+
+
+# --- Self test ---
+def _pseudo_random(n, seed):
+    # Deterministic bytes without depending on a random module
+    out = bytearray(n)
+    x = seed
+    for i in range(n):
+        x = (x * 1103515245 + 12345) & 0x7FFFFFFF
+        out[i] = x >> 16 & 0xFF
+    return out
+
+
+def _key_runs(scan, data, key):
+    # All (start, end) byte ranges of non-key pixels found with the scanners
+    skip, find = scan
+    runs = []
+    p = 0
+    end = len(data)
+    while p < end:
+        p = skip(data, p, end, key)
+        q = find(data, p, end, key)
+        if q > p:
+            runs.append((p, q))
+        p = q
+    return runs
+
+
+def _cases():
+    # (name, run(kernels)) pairs; kernels is a dict of implementations
+    import fonts.tt14
+    glyph, char_width = fonts.tt14.get_ch("W")
+    height = fonts.tt14.height()
+    w = char_width + 1
+    image = _pseudo_random(2 * 240, 1)
+    # A sprite row with key-colored holes
+    sprite = bytearray(image)
+    for i in range(0, len(sprite), 14):
+        sprite[i:i + 6] = b"\x00\x00\x00\x00\x00\x00"
+    gs4 = _pseudo_random(120, 2)
+    lut = _pseudo_random(1024, 3)
+    # Output buffers are allocated once so only the kernels are timed
+    fill_buf = bytearray(512)
+    blank = bytes(2 * w * (height + 1))
+    tile = bytearray(blank)
+    gs4_buf = bytearray(4 * len(gs4))
+    rgb_buf = bytearray(3 * 240)
+
+    def fill(k):
+        k["fill16"](fill_buf, 0xF81F)
+
+    def glyph_case(k):
+        tile[:] = blank
+        k["glyph"](glyph, tile, (w << 8) | height, 0xFFFF)
+
+    def keys(k):
+        _key_runs((k["skip_key"], k["find_key"]), sprite, 0x0000)
+
+    def gs4_case(k):
+        k["expand_gs4"](gs4, lut, gs4_buf)
+
+    def rgb666(k):
+        k["rgb565_to_666"](image, lut, rgb_buf, 240)
+
+    return (("fill16", fill), ("glyph_expand", glyph_case), ("key_runs", keys),
+            ("expand_gs4", gs4_case), ("rgb565_to_666", rgb666))
+
+
+def selftest(repeat=20):
+    """
+    Print a speedup table of the selected kernels over the pure Python
+    versions (time per call in microseconds). Run it on the device; the
+    host tests in tests/test_kernels.py cover equivalence.
+
+    Parameters:
+        repeat (int): Timed calls per kernel and implementation.
+    """
+    python = {"fill16": _fill16, "glyph": _glyph, "skip_key": _skip_key,
+              "find_key": _find_key, "expand_gs4": _expand_gs4,
+              "rgb565_to_666": _rgb565_to_666}
+    selected = {"fill16": fill16, "glyph": _glyph_kernel, "skip_key": skip_key,
+                "find_key": find_key, "expand_gs4": expand_gs4,
+                "rgb565_to_666": rgb565_to_666}
+    print("kernels:", "viper" if VIPER else "pure Python")
+    print("%-14s %9s %9s %8s" % ("kernel", "python", "kernel", "speedup"))
+    for name, case in _cases():
+        times = []
+        for impl in (python, selected):
+            t0 = time.ticks_us()
+            for _ in range(repeat):
+                case(impl)
+            times.append(time.ticks_diff(time.ticks_us(), t0) // repeat)
+        print("%-14s %9d %9d %7.1fx" % (
+            name, times[0], times[1], times[0] / max(times[1], 1)))
@@ -0,0 +1,112 @@
+# kernels_viper.py
+# Viper-emitter implementations of the pixel kernels in drivers/kernels.py
+#
+# Import drivers.kernels instead of this module: it falls back to the pure
+# Python versions when the viper emitter is unavailable. Viper functions
+# take at most four arguments, and every buffer argument must support the
+# buffer protocol (bytes, bytearray, memoryview, array).
+
+import micropython
+
+
+@micropython.viper
+def fill16(buf, color: int):
+    p = ptr8(buf)
+    n = int(len(buf)) - 1
+    hi = (color >> 8) & 0xFF
+    lo = color & 0xFF
+    i = 0
+    while i < n:
+        p[i] = hi
+        p[i + 1] = lo
+        i += 2
+    # An odd length ends with the high byte, as in the pure Python version
+    if i == n and n > 0:
+        p[i] = hi
+
+
+@micropython.viper
+def glyph(data, tile, shape: int, color: int):
+    g = ptr8(data)
+    t = ptr8(tile)
+    glyph_len = int(len(data))
+    height = shape & 0xFF
+    w = shape >> 8
+    bytes_per_col = (height + 7) >> 3
+    hi = (color >> 8) & 0xFF
+    lo = color & 0xFF
+    col = 0
+    base = 0
+    while col < w and base < glyph_len:
+        row = 0
+        while row < height:
+            idx = base + (row >> 3)
+            if idx >= glyph_len:
+                break
+            if g[idx] & (1 << (row & 7)):
+                q = (row * w + col) << 1
+                t[q] = hi
+                t[q + 1] = lo
+            row += 1
+        col += 1
+        base += bytes_per_col
+
+
+@micropython.viper
+def skip_key(data, p: int, end: int, key: int) -> int:
+    d = ptr8(data)
+    hi = (key >> 8) & 0xFF
+    lo = key & 0xFF
+    while p < end:
+        if d[p] != hi or d[p + 1] != lo:
+            return p
+        p += 2
+    return end
+
+
+@micropython.viper
+def find_key(data, p: int, end: int, key: int) -> int:
+    d = ptr8(data)
+    hi = (key >> 8) & 0xFF
+    lo = key & 0xFF
+    while p < end:
+        if d[p] == hi and d[p + 1] == lo:
+            return p
+        p += 2
+    return end
+
+
+@micropython.viper
+def expand_gs4(src, lut, dst):
+    s = ptr8(src)
+    t = ptr8(lut)
+    d = ptr8(dst)
+    n = int(len(src))
+    i = 0
+    o = 0
+    while i < n:
+        q = s[i] << 2
+        d[o] = t[q]
+        d[o + 1] = t[q + 1]
+        d[o + 2] = t[q + 2]
+        d[o + 3] = t[q + 3]
+        i += 1
+        o += 4
+
+
+@micropython.viper
+def rgb565_to_666(src, lut, dst, n: int):
+    s = ptr8(src)
+    t = ptr8(lut)
+    d = ptr8(dst)
+    end = n << 1
+    i = 0
+    o = 0
+    while i < end:
+        hi = s[i]
+        lo = s[i + 1]
+        d[o] = t[hi]
+        d[o + 1] = t[256 + hi] | t[512 + lo]
+        d[o + 2] = t[768 + lo]
+        i += 2
+        o += 3
@@ -0,0 +1,207 @@
+# render_worker.py
+# Display rendering on the RP2040's second core
+#
+# RenderWorker runs on core 1 (via _thread) and owns the display SPI bus.
+# Core 0 hands it jobs through a bounded, lock-protected queue and goes
+# straight back to polling touch or waiting on the network while the panel
+# is being redrawn.
+#
+# Forecasts are handed over double-buffered: core 0 lays out the next
+# forecast into a display list of its own (the back buffer) and publishes
+# it only once complete. The worker always draws the newest published list
+# (the front buffer), so a half-parsed forecast is never drawn and several
+# quick updates collapse into one redraw.
+#
+# Usage:
+#     worker = RenderWorker(tft)
+#     worker.start()
+#     worker.submit(tft.fill_rect, 0, 0, 240, 20, RED)
+#     forecasts = DoubleBuffer()
+#     forecasts.publish(display_list)        # core 0, when complete
+#     worker.submit(draw_latest, forecasts)  # core 1 draws the front buffer
+
+import _thread
+import time
+
+
+class RenderWorker:
+    """
+    Bounded job queue drained by a thread on the second core.
+
+    Once started, only the worker may touch the display; core 0 must go
+    through :meth:`submit` for every draw.
+
+    Parameters:
+        tft (TFTBase): Display the worker owns.
+        depth (int): Maximum queued jobs.
+    """
+    def __init__(self, tft, depth=8):
+        self.tft = tft
+        self.depth = depth
+        self._lock = _thread.allocate_lock()
+        self._queue = []
+        self._busy = False
+        self._running = False
+        self._stopped = True
+        self.jobs = 0
+        self.busy_us = 0
+
+    # --- Core 0 side ---
+    def start(self):
+        """Start the worker thread (on core 1 on the RP2040)."""
+        if self._running:
+            return
+        self._running = True
+        self._stopped = False
+        _thread.start_new_thread(self._run, ())
+
+    def submit(self, fn, *args, block=True):
+        """
+        Queue ``fn(*args)`` to run on the worker.
+
+        Parameters:
+            block (bool): Wait for room when the queue is full; otherwise
+                drop the job.
+
+        Returns:
+            bool: False if the job was dropped.
+        """
+        lock = self._lock
+        while True:
+            lock.acquire()
+            if len(self._queue) < self.depth:
+                self._queue.append((fn, args))
+                lock.release()
+                return True
+            lock.release()
+            if not block:
+                return False
+            time.sleep_ms(1)
+
+    def draw(self, display_list):
+        """Queue a display list to be replayed onto the display."""
+        return self.submit(display_list.replay, self.tft)
+
+    def idle(self):
+        """True when no job is queued or running."""
+        lock = self._lock
+        lock.acquire()
+        idle = not self._queue and not self._busy
+        lock.release()
+        return idle
+
+    def wait_idle(self):
+        while not self.idle():
+            time.sleep_ms(1)
+
+    def stop(self):
+        """Finish the queued jobs, then end the worker thread."""
+        self.wait_idle()
+        self._running = False
+        while not self._stopped:
+            time.sleep_ms(1)
+
+    # --- Core 1 side ---
+    def _run(self):
+        lock = self._lock
+        queue = self._queue
+        while self._running:
+            lock.acquire()
+            job = queue.pop(0) if queue else None
+            self._busy = job is not None
+            lock.release()
+            if job is None:
+                time.sleep_ms(1)
+                continue
+            t0 = time.ticks_us()
+            try:
+                job[0](*job[1])
+            except Exception as e:
+                print("Render worker job failed:", e)
+            us = time.ticks_diff(time.ticks_us(), t0)
+            lock.acquire()
+            self._busy = False
+            self.jobs += 1
+            self.busy_us += us
+            lock.release()
+        self._stopped = True
+
+
+class DoubleBuffer:
+    """
+    Front/back handoff of complete values between the two cores.
+
+    The producer builds each new value privately (the back buffer) and
+    calls :meth:`publish` when it is complete; the consumer only ever sees
+    published values. Values must not be changed after publishing.
+    """
+    def __init__(self, value=None):
+        self._lock = _thread.allocate_lock()
+        self._front = value
+        self.version = 0
+
+    def publish(self, value):
+        lock = self._lock
+        lock.acquire()
+        self._front = value
+        self.version += 1
+        lock.release()
+
+    def front(self):
+        """
+        Returns:
+            tuple: (value, version) of the newest published value.
+        """
+        lock = self._lock
+        lock.acquire()
+        value = self._front
+        version = self.version
+        lock.release()
+        return value, version
+
+
+def draw_latest(buffer, draw):
+    """
+    Worker job: call ``draw(value)`` with the newest published value.
+
+    Jobs queued for versions that were already drawn do nothing, so a
+    burst of publishes costs a single redraw.
+    """
+    value, version = buffer.front()
+    if value is None or version == getattr(buffer, "drawn", -1):
+        return
+    buffer.drawn = version
+    draw(value)
+
+
+class LatencyProbe:
+    """
+    Measures the gaps between successive calls of :meth:`tick`, e.g. in a
+    touch polling loop, where the longest gap is the worst-case touch latency.
+    """
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._last = None
+        self.count = 0
+        self.max_us = 0
+        self.total_us = 0
+
+    def tick(self):
+        now = time.ticks_us()
+        if self._last is not None:
+            gap = time.ticks_diff(now, self._last)
+            self.count += 1
+            self.total_us += gap
+            if gap > self.max_us:
+                self.max_us = gap
+        self._last = now
+
+    def stats(self):
+        """
+        Returns:
+            dict: ``polls``, ``max_us`` and ``mean_us`` since the last reset.
+        """
+        mean = self.total_us // self.count if self.count else 0
+        return {"polls": self.count, "max_us": self.max_us, "mean_us": mean}
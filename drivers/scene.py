@@ -0,0 +1,285 @@
+# scene.py
+# Damage-tracked retained-mode scene for TFTBase displays
+#
+# Items (rectangles, text runs and sprites) are kept by stable id. On
+# commit() the scene compares the current items with the ones it last sent,
+# collects the bounding boxes of everything that was added, removed or
+# changed, merges them, and re-renders only those regions through a
+# BandRenderer. Unchanged parts of the panel receive no SPI traffic.
+#
+# Usage:
+#     scene = Scene(tft)
+#     scene.rect("alp.bg", 112, 28, 100, 16, bg_color)
+#     scene.text("alp.rating", "2 - Moderate", 116, 32, BLACK, font=fonts.tt7)
+#     scene.commit()
+
+from drivers.band import BandRenderer
+
+_RECT = 0
+_TEXT = 1
+_SPRITE = 2
+
+# Damaged rects whose union wastes fewer pixels than this are merged
+_MERGE_SLACK = 256
+
+
+def _text_size(font, s, spacing):
+    # Bounding box of TFTBase.text output, including the opaque spacing column
+    font_height = font.height()
+    lines = s.split("\n")
+    w = 0
+    for line in lines:
+        lw = 0
+        for ch in line:
+            lw += font.get_ch(ch)[1] + spacing
+        if lw:
+            lw += 1 - spacing
+        if lw > w:
+            w = lw
+    return w, len(lines) * (font_height + 2)
+
+
+def _union(a, b):
+    x0 = min(a[0], b[0])
+    y0 = min(a[1], b[1])
+    x1 = max(a[0] + a[2], b[0] + b[2])
+    y1 = max(a[1] + a[3], b[1] + b[3])
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def _should_merge(a, b):
+    u = _union(a, b)
+    # Overlapping or touching rects always merge; disjoint ones only when the
+    # union adds little area the two rects did not already cover
+    if (a[0] <= b[0] + b[2] and b[0] <= a[0] + a[2] and
+            a[1] <= b[1] + b[3] and b[1] <= a[1] + a[3]):
+        return True
+    return u[2] * u[3] - a[2] * a[3] - b[2] * b[3] <= _MERGE_SLACK
+
+
+def merge_rects(rects):
+    """
+    Merge a list of (x, y, w, h) rects until no two of them should be combined.
+
+    Returns:
+        list: The merged rects.
+    """
+    rects = [r for r in rects if r[2] > 0 and r[3] > 0]
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        while rects:
+            r = rects.pop()
+            i = 0
+            while i < len(rects):
+                if _should_merge(r, rects[i]):
+                    r = _union(r, rects.pop(i))
+                    merged = True
+                else:
+                    i += 1
+            out.append(r)
+        rects = out
+    return rects
+
+
+class Scene:
+    """
+    Retained set of drawable items that repaints only what changed.
+
+    Every item is addressed by a caller-chosen id. Setting an item whose id
+    already exists replaces it in place (keeping its stacking order); items
+    are painted in the order their ids were first added.
+
+    Parameters:
+        tft (TFTBase): Display the scene is rendered to.
+        bg (int): RGB565 background color for areas no item covers.
+        ram_budget (int or None): Strip budget passed to the BandRenderer.
+
+    The BandRenderer's strips are only allocated on the first commit or
+    replay, so a scene used just to lay out and :meth:`record` items costs
+    no strip RAM.
+
+    After :meth:`commit`, ``last_damage`` holds the rects that were
+    repainted and ``last_pixels`` the number of pixels sent.
+    """
+    def __init__(self, tft, bg=0x0000, ram_budget=None):
+        self.tft = tft
+        self._ram_budget = ram_budget
+        self._band = None
+        self.bg = bg
+        self._items = {}
+        self._order = []
+        self._sent = {}
+        self._damage = []
+        self._full = True
+        self.last_damage = []
+        self.last_pixels = 0
+
+    @property
+    def _renderer(self):
+        band = self._band
+        if band is None:
+            if self._ram_budget is None:
+                band = BandRenderer(self.tft, bg=self.bg)
+            else:
+                band = BandRenderer(self.tft, ram_budget=self._ram_budget, bg=self.bg)
+            self._band = band
+        return band
+
+    # --- Items ---
+    def _set(self, item_id, item):
+        if item_id not in self._items:
+            self._order.append(item_id)
+        self._items[item_id] = item
+
+    def rect(self, item_id, x, y, w, h, color):
+        """Add or replace a filled rectangle."""
+        self._set(item_id, (_RECT, x, y, w, h, color))
+
+    def text(self, item_id, s, x, y, color, bg=None, font=None, spacing=1):
+        """
+        Add or replace a text run; ``font`` defaults to the display's current font.
+        """
+        if font is None:
+            font = self.tft._font
+        w, h = _text_size(font, s, spacing)
+        self._set(item_id, (_TEXT, x, y, w, h, s, color, bg, font, spacing))
+
+    def sprite(self, item_id, x, y, w, h, data, key=None):
+        """Add or replace an RGB565 sprite (see :meth:`TFTBase.blit_rgb565`)."""
+        self._set(item_id, (_SPRITE, x, y, w, h, data, key))
+
+    def remove(self, item_id):
+        if item_id in self._items:
+            del self._items[item_id]
+            self._order.remove(item_id)
+
+    def clear(self):
+        """Remove every item; the next commit erases what they covered."""
+        self._items = {}
+        self._order = []
+
+    def invalidate(self, rect=None):
+        """
+        Force a region to be repainted on the next commit.
+
+        Call this after drawing on the panel outside the scene. With no
+        rect the whole screen is repainted.
+        """
+        if rect is None:
+            self._full = True
+        else:
+            self._damage.append(rect)
+
+    # --- Damage / commit ---
+    def damage(self):
+        """
+        Compute the merged rects that differ from what was last committed.
+
+        Returns:
+            list: (x, y, w, h) rects clipped to the screen.
+        """
+        sw = self.tft.width
+        sh = self.tft.height
+        if self._full:
+            return [(0, 0, sw, sh)]
+        rects = list(self._damage)
+        sent = self._sent
+        items = self._items
+        for item_id, item in items.items():
+            old = sent.get(item_id)
+            if old != item:
+                rects.append(item[1:5])
+                if old is not None:
+                    rects.append(old[1:5])
+        for item_id, old in sent.items():
+            if item_id not in items:
+                rects.append(old[1:5])
+
+        clipped = []
+        for x, y, w, h in rects:
+            x1 = min(x + w, sw)
+            y1 = min(y + h, sh)
+            x = max(x, 0)
+            y = max(y, 0)
+            if x < x1 and y < y1:
+                clipped.append((x, y, x1 - x, y1 - y))
+        return merge_rects(clipped)
+
+    def commit(self):
+        """
+        Repaint every damaged region and remember the current items as sent.
+
+        Returns:
+            int: Number of pixels written to the panel.
+        """
+        tft = self.tft
+        tft.begin()
+        try:
+            for _ in self.commit_steps():
+                pass
+        finally:
+            tft.end()
+        return self.last_pixels
+
+    def commit_steps(self):
+        """
+        Generator form of :meth:`commit` that yields after every rendered band,
+        so a cooperative scheduler can run between them.
+        """
+        rects = self.damage()
+        pixels = 0
+        if rects:
+            renderer = self._renderer
+            renderer.clear()
+            renderer.bg = self.bg
+            self.record(renderer)
+            for x, y, w, h in rects:
+                for _ in renderer.render_steps(x, y, w, h):
+                    yield
+                pixels += w * h
+            renderer.clear()
+
+        self._sent = dict(self._items)
+        self._damage = []
+        self._full = False
+        self.last_damage = rects
+        self.last_pixels = pixels
+
+    def replay(self, display_list):
+        """
+        Paint a recorded DisplayList over the whole screen through the band
+        renderer, so it goes out as a few large windows.
+
+        The panel no longer shows the scene's items afterwards, so the next
+        commit repaints everything.
+        """
+        renderer = self._renderer
+        renderer.clear()
+        renderer.bg = self.bg
+        display_list.replay(renderer)
+        renderer.render()
+        renderer.clear()
+        self._full = True
+
+    def record(self, target):
+        """
+        Draw every item, in stacking order, onto ``target``.
+
+        ``target`` is anything with the TFTBase drawing API: the display
+        itself, a BandRenderer or a DisplayList. The background is not drawn.
+        """
+        items = self._items
+        for item_id in self._order:
+            self._record(target, items[item_id])
+
+    def _record(self, target, item):
+        kind = item[0]
+        if kind == _RECT:
+            target.fill_rect(item[1], item[2], item[3], item[4], item[5])
+        elif kind == _TEXT:
+            target.set_font(item[8])
+            target.text(item[5], item[1], item[2], item[6], item[7], item[9])
+        else:
+            target.blit_rgb565(item[1], item[2], item[3], item[4], item[5], item[6])
@@ -0,0 +1,210 @@
+# spi_stream.py
+# Pixel streaming backends for TFTBase
+#
+# TFTBase sends every pixel payload through a stream object with three
+# methods:
+#
+#   write(buf)            start sending buf; buf must not be modified until
+#                         the next wait()
+#   fill(pattern, nbytes) send nbytes of the repeating 2-byte color at the
+#                         start of pattern; returns the number of transfers
+#   wait()                block until everything started has left the bus
+#
+# Streams whose ``asynchronous`` attribute is True return from write()/fill()
+# before the transfer ends, so the CPU can prepare the next buffer while the
+# previous one is on the wire. TFTBase calls wait() before touching DC/CS or
+# any buffer of its own it lent out, and the outermost end() waits too, so
+# outside a transaction its public API stays synchronous. Inside begin()/end()
+# a caller's buffer passed to blit_rgb565() may still be in flight until end().
+#
+# - BlockingStream: plain spi.write, works everywhere
+# - DMAStream: RP2040/RP2350 DMA into the SPI TX FIFO
+# - RecordingStream: host stand-in that records transfers and checks that
+#   in-flight buffers are left untouched
+
+try:
+    import rp2
+    import uctypes
+    from machine import mem32
+except ImportError:
+    rp2 = None
+
+# PL022 SPI register offsets
+_SSPDR = 0x08
+_SSPSR = 0x0C
+_SSPICR = 0x20
+
+# SSPSR bits
+_SR_RNE = 0x04
+_SR_BSY = 0x10
+
+# (SPI0 base, SPI1 base), (SPI0 TX DREQ, SPI1 TX DREQ)
+_RP2040_SPI = ((0x4003C000, 0x40040000), (16, 18))
+_RP2350_SPI = ((0x40080000, 0x40088000), (24, 26))
+
+
+class BlockingStream:
+    """
+    Pure-Python fallback that writes synchronously with ``spi.write``.
+    """
+    asynchronous = False
+
+    def __init__(self, spi):
+        self.spi = spi
+
+    def write(self, buf):
+        self.spi.write(buf)
+
+    def fill(self, pattern, nbytes):
+        write = self.spi.write
+        size = len(pattern)
+        count = 0
+        while nbytes >= size:
+            write(pattern)
+            nbytes -= size
+            count += 1
+        if nbytes > 0:
+            write(pattern[:nbytes])
+            count += 1
+        return count
+
+    def wait(self):
+        pass
+
+
+class DMAStream:
+    """
+    Stream pixel data to the SPI TX FIFO with an ``rp2.DMA`` channel.
+
+    ``write`` starts a DMA transfer straight from the caller's buffer and
+    returns at once. ``fill`` uses the read-address ring feature to repeat a
+    single 4-byte (two pixel) pattern for the whole transfer, so even a
+    full-screen erase is one DMA transfer running at wire speed.
+
+    Parameters:
+        spi: machine.SPI the display is on (used for the blocking paths).
+        spi_id (int): Hardware SPI block number (0 or 1) of ``spi``.
+    """
+    asynchronous = True
+
+    def __init__(self, spi, spi_id=0):
+        if rp2 is None:
+            raise OSError("rp2.DMA not available")
+        import os
+        regs = _RP2350_SPI if "RP2350" in os.uname().machine else _RP2040_SPI
+        self.spi = spi
+        self._base = regs[0][spi_id]
+        self._dma = rp2.DMA()
+        self._ctrl = self._dma.pack_ctrl(size=0, inc_write=False, treq_sel=regs[1][spi_id])
+        # ring_size=2 wraps the read address on a 4-byte boundary
+        self._ring_ctrl = self._dma.pack_ctrl(size=0, inc_write=False, treq_sel=regs[1][spi_id],
+                                              ring_sel=False, ring_size=2)
+        self._ring = bytearray(8)
+        self._ring_addr = uctypes.addressof(self._ring)
+        self._ring_addr += (-self._ring_addr) & 3
+        self._busy = None
+
+    def write(self, buf):
+        self.wait()
+        self._busy = buf
+        self._dma.config(read=buf, write=self._base + _SSPDR, count=len(buf),
+                         ctrl=self._ctrl, trigger=True)
+
+    def fill(self, pattern, nbytes):
+        self.wait()
+        if nbytes <= 0:
+            return 0
+        addr = self._ring_addr
+        ring = self._ring
+        off = addr - uctypes.addressof(ring)
+        hi = pattern[0]
+        lo = pattern[1]
+        ring[off] = hi
+        ring[off + 1] = lo
+        ring[off + 2] = hi
+        ring[off + 3] = lo
+        self._busy = ring
+        self._dma.config(read=addr, write=self._base + _SSPDR, count=nbytes,
+                         ctrl=self._ring_ctrl, trigger=True)
+        return 1
+
+    def wait(self):
+        if self._busy is None:
+            return
+        dma = self._dma
+        while dma.active():
+            pass
+        base = self._base
+        # The FIFO may still be shifting out after the last DMA write
+        while mem32[base + _SSPSR] & _SR_BSY:
+            pass
+        # TX-only transfers leave received bytes behind; discard them
+        while mem32[base + _SSPSR] & _SR_RNE:
+            mem32[base + _SSPDR]
+        mem32[base + _SSPICR] = 1
+        self._busy = None
+
+
+class RecordingStream:
+    """
+    Host stand-in for :class:`DMAStream` that can be tested on Linux.
+
+    Transfers are forwarded to ``spi`` (if given) immediately and recorded
+    in ``transfers`` as ``("write", nbytes)`` or ``("fill", nbytes)``. Like a
+    real DMA stream it reports itself as asynchronous: a buffer passed to
+    :meth:`write` counts as in flight until the next :meth:`wait`, and
+    changing it before then raises ``RuntimeError``.
+    """
+    asynchronous = True
+
+    def __init__(self, spi=None):
+        self.spi = spi
+        self.transfers = []
+        self.waits = 0
+        self._busy = None
+        self._snapshot = None
+
+    def write(self, buf):
+        self.wait()
+        self._busy = buf
+        self._snapshot = bytes(buf)
+        self.transfers.append(("write", len(buf)))
+        if self.spi is not None:
+            self.spi.write(buf)
+
+    def fill(self, pattern, nbytes):
+        self.wait()
+        if nbytes <= 0:
+            return 0
+        self.transfers.append(("fill", nbytes))
+        spi = self.spi
+        if spi is not None:
+            size = len(pattern)
+            while nbytes > 0:
+                n = size if nbytes >= size else nbytes
+                spi.write(pattern[:n])
+                nbytes -= n
+        return 1
+
+    def wait(self):
+        if self._busy is None:
+            return
+        self.waits += 1
+        changed = bytes(self._busy) != self._snapshot
+        self._busy = None
+        self._snapshot = None
+        if changed:
+            raise RuntimeError("buffer modified while in flight")
+
+
+def make_stream(spi, spi_id=0):
+    """
+    Return a :class:`DMAStream` when ``rp2.DMA`` is available, otherwise a
+    :class:`BlockingStream`.
+    """
+    if rp2 is not None:
+        try:
+            return DMAStream(spi, spi_id)
+        except Exception as e:
+            print("DMA stream unavailable:", e)
+    return BlockingStream(spi)
@@ -0,0 +1,271 @@
+# text_layout.py
+# Word-wrapped text layout for TFTBase fonts
+#
+# Measuring a string through font.get_width() or font.get_ch() parses the
+# glyph index with int.from_bytes for every character. The layout engine
+# instead builds one width table per font (95 bytes, printable ASCII) and
+# breaks text in a single pass over the string: each character is measured
+# once, and the width of the current line is carried along instead of being
+# re-measured at every word.
+#
+# layout() returns line boxes, (x, y, width, text) tuples, that can be kept
+# and drawn again with draw_lines() without measuring anything.
+#
+# Usage:
+#     lines = layout(fonts.tt7, highlights, (10, 200, 220, 100), ALIGN_CENTER)
+#     draw_lines(tft, lines, WHITE)
+#     tft.text_box(highlights, (10, 200, 220, 100), WHITE)   # both in one call
+
+# Horizontal alignment of each line inside the box
+ALIGN_LEFT = 0
+ALIGN_CENTER = 1
+ALIGN_RIGHT = 2
+
+# Line breaking
+WRAP_NONE = 0      # break on "\n" only; long lines are truncated
+WRAP_GREEDY = 1    # fill each line as far as it goes
+WRAP_BALANCED = 2  # same number of lines as greedy, widths as even as possible
+
+# Per-font width tables: {font: bytearray of widths for chr(32)..chr(126)}
+_WIDTHS = {}
+
+
+def widths(font):
+    """
+    Width table of a font, built on first use.
+
+    Returns:
+        bytearray: Advance width in pixels of chr(32 + i) at index i. The
+        fonts draw characters outside 32..126 as a space (index 0).
+    """
+    table = _WIDTHS.get(font)
+    if table is None:
+        table = _WIDTHS[font] = bytearray(font.get_ch(chr(c))[1] for c in range(32, 127))
+    return table
+
+
+def measure(font, s, spacing=1):
+    """
+    Width of one line of text as drawn by :meth:`TFTBase.text`, including
+    the spacing column opaque text paints after the last character.
+    """
+    table = widths(font)
+    w = 0
+    for ch in s:
+        o = ord(ch) - 32
+        w += (table[o] if 0 <= o < 95 else table[0]) + spacing
+    return w + 1 - spacing if w else 0
+
+
+def _greedy(s, table, width, spacing, limit):
+    # Break s into at most `limit` lines of at most `width` pixels in one pass.
+    # Returns [(start, end, width)]; stops early once `limit` lines are full.
+    # Spaces at the end of a line are left out of its text and width, and the
+    # next line starts after the whole run of them.
+    lines = []
+    n = len(s)
+    start = 0
+    w = 0        # advance width of s[start:i]
+    run = -1     # first space of the run that ends at i, if s[i - 1] is one
+    run_w = 0    # advance width of s[start:run]
+    brk = -1     # end of the last space run on the current line
+    brk_end = 0  # the line is s[start:brk_end] when it breaks at brk
+    brk_w = 0    # advance width of s[start:brk_end]
+    brk_adv = 0  # advance width of s[start:brk]
+    i = 0
+    while i < n:
+        ch = s[i]
+        if ch == "\n":
+            end, lw = (run, run_w) if run >= 0 else (i, w)
+            lines.append((start, end, lw + 1 - spacing if lw else 0))
+            if len(lines) >= limit:
+                return lines
+            start = i + 1
+            w = 0
+            run = -1
+            brk = -1
+            i += 1
+            continue
+        o = ord(ch) - 32
+        adv = (table[o] if 0 <= o < 95 else table[0]) + spacing
+        if ch == " ":
+            # Spaces may hang past the edge; lines break after a run of them.
+            # Leading spaces are indentation, not a break.
+            if run < 0:
+                run = i
+                run_w = w
+            w += adv
+            i += 1
+            if run > start:
+                brk = i
+                brk_end = run
+                brk_w = run_w
+                brk_adv = w
+            continue
+        if w + adv + 1 - spacing > width and i > start:
+            if brk > start:
+                # Break at the last space run; the word after it moves down
+                lines.append((start, brk_end, brk_w + 1 - spacing if brk_w else 0))
+                w -= brk_adv
+                start = brk
+            else:
+                # A single word wider than the box: break inside it
+                end, lw = (run, run_w) if run >= 0 else (i, w)
+                lines.append((start, end, lw + 1 - spacing if lw else 0))
+                start = i
+                w = 0
+            run = -1
+            brk = -1
+            if len(lines) >= limit:
+                return lines
+            # The rest of the line may still be too wide, so check again
+            continue
+        w += adv
+        run = -1
+        i += 1
+    end, lw = (run, run_w) if run >= 0 else (n, w)
+    lines.append((start, end, lw + 1 - spacing if lw else 0))
+    return lines
+
+
+def _widest_word(s, table, spacing):
+    # Width of the widest run of characters between spaces and newlines
+    widest = 0
+    w = 0
+    for ch in s:
+        if ch == " " or ch == "\n":
+            w = 0
+            continue
+        o = ord(ch) - 32
+        w += (table[o] if 0 <= o < 95 else table[0]) + spacing
+        if w + 1 - spacing > widest:
+            widest = w + 1 - spacing
+    return widest
+
+
+def _truncate(font, s, width, spacing, ellipsis):
+    # Longest prefix of s that fits in width with the ellipsis after it. An
+    # ellipsis wider than the box is left out; the prefix may then be empty.
+    table = widths(font)
+    room = width - measure(font, ellipsis, spacing) if ellipsis else -1
+    if room < 0:
+        ellipsis = ""
+        room = width - 1 + spacing
+    w = 0
+    end = 0
+    for ch in s:
+        o = ord(ch) - 32
+        adv = (table[o] if 0 <= o < 95 else table[0]) + spacing
+        if w + adv > room:
+            break
+        w += adv
+        end += 1
+    s = s[:end].rstrip() + ellipsis
+    return s, measure(font, s, spacing)
+
+
+def break_lines(font, s, width, wrap=WRAP_GREEDY, spacing=1, max_lines=None):
+    """
+    Split text into lines that fit a width.
+
+    Parameters:
+        font: Font module used for drawing.
+        s (str): Text; "\\n" always starts a new line.
+        width (int): Box width in pixels.
+        wrap (int): WRAP_NONE, WRAP_GREEDY or WRAP_BALANCED.
+        spacing (int): Extra pixels between characters, as for text().
+        max_lines (int or None): Stop after this many lines.
+
+    Returns:
+        list: (start, end, width) of each line; s[start:end] is its text.
+    """
+    table = widths(font)
+    limit = max_lines if max_lines is not None else len(s) + 1
+    if wrap == WRAP_NONE:
+        lines = []
+        start = 0
+        while len(lines) < limit:
+            end = s.find("\n", start)
+            if end < 0:
+                end = len(s)
+            lines.append((start, end, measure(font, s[start:end], spacing)))
+            if end == len(s):
+                break
+            start = end + 1
+        return lines
+    lines = _greedy(s, table, width, spacing, limit)
+    if wrap == WRAP_BALANCED and 1 < len(lines) < limit:
+        # Narrowest width that still needs no more lines; never below the
+        # widest word, so balancing does not split words. Each probe is
+        # another linear pass.
+        count = len(lines)
+        lo = min(width, _widest_word(s, table, spacing))
+        hi = width
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if len(_greedy(s, table, mid, spacing, count + 1)) <= count:
+                hi = mid
+            else:
+                lo = mid + 1
+        if hi < width:
+            lines = _greedy(s, table, hi, spacing, limit)
+    return lines
+
+
+def layout(font, s, rect, align=ALIGN_LEFT, wrap=WRAP_GREEDY, spacing=1, ellipsis="..."):
+    """
+    Lay out text in a box.
+
+    Lines are font.height() + 2 pixels apart, like text(). Text that needs
+    more lines than fit in the box is cut after the last line that fits; if
+    ``ellipsis`` is set, that line (or with WRAP_NONE, any line that is too
+    wide) ends with it. No line box extends past the box: an ellipsis wider
+    than the box is left out, and a line of which nothing fits is dropped.
+
+    Parameters:
+        font: Font module used for drawing.
+        s (str): Text.
+        rect (tuple): (x, y, w, h) box.
+        align (int): ALIGN_LEFT, ALIGN_CENTER or ALIGN_RIGHT.
+        wrap (int): WRAP_NONE, WRAP_GREEDY or WRAP_BALANCED.
+        spacing (int): Extra pixels between characters, as for text().
+        ellipsis (str or None): Marks truncated text.
+
+    Returns:
+        list: Line boxes (x, y, width, text), for :func:`draw_lines`.
+    """
+    x, y, w, h = rect
+    line_h = font.height() + 2
+    max_lines = (h + 1) // line_h
+    if max_lines <= 0 or w <= 0:
+        return []
+    lines = break_lines(font, s, w, wrap, spacing, max_lines + 1)
+    cut = len(lines) > max_lines
+    if cut:
+        lines = lines[:max_lines]
+    out = []
+    last = len(lines) - 1
+    for i, (start, end, lw) in enumerate(lines):
+        text = s[start:end]
+        if lw > w or (ellipsis and cut and i == last):
+            text, lw = _truncate(font, text, w, spacing, ellipsis)
+            if not text:
+                continue
+        if align == ALIGN_CENTER:
+            lx = x + (w - lw) // 2
+        elif align == ALIGN_RIGHT:
+            lx = x + w - lw
+        else:
+            lx = x
+        out.append((lx, y + i * line_h, lw, text))
+    return out
+
+
+def draw_lines(target, lines, color, bg=None, spacing=1):
+    """
+    Draw line boxes from :func:`layout` with the target's current font.
+
+    ``target`` is anything with text(): a TFTBase, BandRenderer or DisplayList.
+    """
+    for x, y, _, text in lines:
+        target.text(text, x, y, color, bg, spacing)
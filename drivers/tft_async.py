@@ -0,0 +1,102 @@
+# tft_async.py
+# Cooperative (uasyncio) versions of the heavy TFTBase operations
+#
+# A full-screen fill or forecast repaint keeps the CPU busy for tens of
+# milliseconds. AsyncTFT splits that work into slices of bounded size, each
+# drawn with the ordinary synchronous call under its own window, and awaits
+# between slices so touch polling, networking and other tasks keep running.
+# The synchronous TFTBase API is unchanged.
+#
+# Usage:
+#     atft = AsyncTFT(tft)
+#     await atft.erase()
+#     await atft.text("Loading...", 10, 10, WHITE)
+#     await atft.commit(scene)
+
+try:
+    import uasyncio as asyncio
+except ImportError:
+    import asyncio
+
+# Default pixel bytes drawn between two yields (~1 ms of SPI at 40 MHz)
+_SLICE_BYTES = 4096
+
+
+class AsyncTFT:
+    """
+    Awaitable drawing on a TFTBase display.
+
+    Parameters:
+        tft (TFTBase): Display to draw on.
+        slice_bytes (int): Pixel bytes sent between two yields.
+
+    Awaiting calls on the same AsyncTFT from several tasks is safe: each
+    call holds ``lock`` until it finishes, so slices never interleave.
+    """
+    def __init__(self, tft, slice_bytes=_SLICE_BYTES):
+        self.tft = tft
+        self.slice_bytes = slice_bytes
+        self.lock = asyncio.Lock()
+
+    def _rows(self, w):
+        # Rows of width w that fit in one slice
+        return max(1, self.slice_bytes // (2 * max(w, 1)))
+
+    async def fill_rect(self, x, y, w, h, color):
+        """Like :meth:`TFTBase.fill_rect`, one band of rows per slice."""
+        if w <= 0 or h <= 0:
+            return
+        tft = self.tft
+        rows = self._rows(w)
+        async with self.lock:
+            for by in range(y, y + h, rows):
+                tft.fill_rect(x, by, w, min(rows, y + h - by), color)
+                await asyncio.sleep(0)
+
+    async def fill(self, color):
+        await self.fill_rect(0, 0, self.tft.width, self.tft.height, color)
+
+    async def erase(self):
+        await self.fill(0x0000)
+
+    async def blit_rgb565(self, x, y, w, h, data, key=None):
+        """Like :meth:`TFTBase.blit_rgb565`, one band of image rows per slice."""
+        if w <= 0 or h <= 0:
+            return
+        tft = self.tft
+        rows = self._rows(w)
+        src = memoryview(data)
+        async with self.lock:
+            for r in range(0, h, rows):
+                n = min(rows, h - r)
+                tft.blit_rgb565(x, y + r, w, n, src[2 * w * r:2 * w * (r + n)], key)
+                await asyncio.sleep(0)
+
+    async def text(self, s, x, y, color, bg=None, spacing=1):
+        """Like :meth:`TFTBase.text`, yielding after every line."""
+        tft = self.tft
+        font_height = tft._font.height()
+        async with self.lock:
+            for line in s.split("\n"):
+                tft.text(line, x, y, color, bg, spacing)
+                y += font_height + 2
+                await asyncio.sleep(0)
+        return y
+
+    async def render(self, renderer, x=0, y=0, w=None, h=None):
+        """Stream a BandRenderer's recorded ops, yielding after every band."""
+        async with self.lock:
+            for _ in renderer.render_steps(x, y, w, h):
+                await asyncio.sleep(0)
+
+    async def commit(self, scene):
+        """
+        Commit a Scene, yielding after every band.
+
+        Returns:
+            int: Number of pixels written (see :meth:`Scene.commit`).
+        """
+        async with self.lock:
+            for _ in scene.commit_steps():
+                await asyncio.sleep(0)
+        return scene.last_pixels
@@ -0,0 +1,194 @@
+# tft_profile.py
+# Opt-in SPI traffic profiler for TFTBase displays
+#
+# Profiler wraps the public draw calls of one TFTBase instance, plus its SPI
+# bus and pixel stream, and charges every command byte, payload byte, CS
+# cycle, window and microsecond to the outermost draw call that caused it.
+# Results go into a fixed-size table that can be dumped from the REPL.
+#
+# The wrappers are instance attributes installed by enable() and removed by
+# disable(), so a display that is not being profiled runs the plain class
+# methods with no extra cost.
+#
+# Usage:
+#     prof = Profiler(tft)
+#     prof.enable()
+#     forecast.display_forecast(data, 10)
+#     prof.disable()
+#     prof.dump()
+
+from array import array
+import time
+
+# Draw calls profiled by default
+DRAW_CALLS = (
+    "fill", "erase", "fill_rect", "pixel", "hline", "vline", "rect",
+    "line", "polyline", "circle", "fill_circle", "text",
+    "blit_rgb565", "blit_rle565", "scroll_to", "set_scroll_area",
+)
+
+# Columns of the stats table
+CALLS = 0
+COMMANDS = 1
+BYTES = 2
+CS = 3
+WINDOWS = 4
+US = 5
+_COLS = 6
+_COL_NAMES = ("calls", "commands", "bytes", "cs", "windows", "us")
+
+
+class _SPIProxy:
+    # Counts bytes written to the bus; bytes sent with DC low are commands
+    def __init__(self, spi, dc, prof):
+        self._spi = spi
+        self._dc = dc
+        self._prof = prof
+
+    def write(self, buf):
+        n = len(buf)
+        prof = self._prof
+        if self._dc():
+            prof.bytes += n
+        else:
+            prof.commands += n
+        self._spi.write(buf)
+
+    def __getattr__(self, name):
+        return getattr(self._spi, name)
+
+
+class _StreamProxy:
+    # Counts pixel payload bytes handed to the stream
+    def __init__(self, stream, prof):
+        self._stream = stream
+        self._prof = prof
+        self.asynchronous = getattr(stream, "asynchronous", False)
+
+    def write(self, buf):
+        self._prof.bytes += len(buf)
+        self._stream.write(buf)
+
+    def fill(self, pattern, nbytes):
+        if nbytes > 0:
+            self._prof.bytes += nbytes
+        return self._stream.fill(pattern, nbytes)
+
+    def wait(self):
+        self._stream.wait()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class Profiler:
+    """
+    Per-call bus statistics for one display.
+
+    Parameters:
+        tft (TFTBase): Display to instrument.
+        calls (tuple): Names of the methods to profile; defaults to
+            :data:`DRAW_CALLS`. The table has one row per name.
+    """
+    def __init__(self, tft, calls=DRAW_CALLS):
+        self.tft = tft
+        self.calls = tuple(calls)
+        self.table = array("L", [0] * (_COLS * len(self.calls)))
+        # Running totals updated by the bus proxies
+        self.commands = 0
+        self.bytes = 0
+        self._depth = 0
+        self._saved = None
+
+    # --- Enable / disable ---
+    def enable(self):
+        """Install the wrappers and bus proxies. Does nothing if already enabled."""
+        if self._saved is not None:
+            return
+        tft = self.tft
+        self._saved = (tft.spi, tft._stream)
+        tft.spi = _SPIProxy(tft.spi, tft.dc, self)
+        tft._stream = _StreamProxy(tft._stream, self)
+        for row, name in enumerate(self.calls):
+            method = getattr(tft, name, None)
+            if method is not None:
+                setattr(tft, name, self._wrap(row, method))
+
+    def disable(self):
+        """Remove every wrapper so the display runs its class methods again."""
+        if self._saved is None:
+            return
+        tft = self.tft
+        tft.spi, tft._stream = self._saved
+        self._saved = None
+        for name in self.calls:
+            try:
+                # Removes the instance wrapper; the class method shows again
+                delattr(tft, name)
+            except AttributeError:
+                pass
+
+    def _wrap(self, row, method):
+        tft = self.tft
+        table = self.table
+        base = row * _COLS
+
+        def wrapper(*args, **kwargs):
+            if self._depth:
+                # Nested calls (rect -> hline -> fill_rect) belong to the outer one
+                return method(*args, **kwargs)
+            self._depth = 1
+            commands = self.commands
+            nbytes = self.bytes
+            cs = tft.cs_cycles
+            windows = tft.windows
+            t0 = time.ticks_us()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                us = time.ticks_diff(time.ticks_us(), t0)
+                self._depth = 0
+                table[base + CALLS] += 1
+                table[base + COMMANDS] += self.commands - commands
+                table[base + BYTES] += self.bytes - nbytes
+                table[base + CS] += tft.cs_cycles - cs
+                table[base + WINDOWS] += tft.windows - windows
+                table[base + US] += us
+        return wrapper
+
+    # --- Results ---
+    def reset(self):
+        """Zero the stats table."""
+        table = self.table
+        for i in range(len(table)):
+            table[i] = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: ``{name: {"calls", "commands", "bytes", "cs", "windows", "us"}}``
+            for every call made at least once.
+        """
+        out = {}
+        table = self.table
+        for row, name in enumerate(self.calls):
+            base = row * _COLS
+            if table[base + CALLS]:
+                out[name] = {col: table[base + i] for i, col in enumerate(_COL_NAMES)}
+        return out
+
+    def dump(self):
+        """Print the stats table, busiest call first."""
+        rows = sorted(self.stats().items(), key=lambda item: -item[1]["us"])
+        print("%-14s %6s %8s %8s %5s %7s %9s %8s" % (
+            "call", "calls", "commands", "bytes", "cs", "windows", "us", "us/call"))
+        total = [0] * _COLS
+        for name, s in rows:
+            print("%-14s %6d %8d %8d %5d %7d %9d %8d" % (
+                name, s["calls"], s["commands"], s["bytes"], s["cs"], s["windows"],
+                s["us"], s["us"] // s["calls"]))
+            for i, col in enumerate(_COL_NAMES):
+                total[i] += s[col]
+        print("%-14s %6d %8d %8d %5d %7d %9d" % (
+            "total", total[CALLS], total[COMMANDS], total[BYTES], total[CS],
+            total[WINDOWS], total[US]))
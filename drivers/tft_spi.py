@@ -1,16 +1,32 @@
 # tft_spi.py
-# MicroPython SPI TFT driver supporting ILI9341 and ST7796S
+# MicroPython SPI TFT driver supporting ILI9341, ST7796S and ILI9488
 #
 # Features:
 # - RGB565 drawing directly to GRAM (no full framebuffer)
 # - Text (5x7), lines, rectangles, circles, filled shapes
-# - RGB565 sprite blit
+# - LRU cache of rendered glyph tiles for opaque text, composed into
+#   whole-string strips streamed under a single window
+# - Transparent text drawn as cached per-glyph runs of lit pixels
+# - Word-wrapped, aligned text boxes with ellipsis (drivers/text_layout.py)
+# - RGB565 sprite blit, with color-keyed transparency sent as opaque runs
+# - Run-length encoded sprites decoded while streaming (memory or flash file)
+# - Pluggable pixel streaming (blocking spi.write or RP2 DMA)
+# - Hardware vertical scroll region (VSCRDEF/VSCRSADD)
+# - Clip-rectangle stack; primitives outside it send nothing
+# - Optional 4bpp indexed full-screen canvas expanded to RGB565 on show()
+# - ILI9488 (18-bit only over SPI) with RGB565 -> RGB666 conversion while streaming
+# - Per-pixel loops run as viper kernels where available (drivers/kernels.py)
 #
 # Tested API assumptions:
 # - MicroPython machine.SPI, machine.Pin
 # - Optional: time.sleep_ms
 
 from machine import Pin
+from array import array
+from collections import OrderedDict
+from drivers.kernels import expand_gs4, fill16, find_key, glyph_expand, rgb565_to_666, skip_key
+from drivers.spi_stream import BlockingStream
+from drivers.text_layout import ALIGN_LEFT, WRAP_GREEDY, draw_lines, layout
 import time
 import fonts.tt7
 
@@ -27,6 +43,8 @@ _MADCTL   = 0x36
 _COLMOD   = 0x3A
 _INVON    = 0x21
 _INVOFF   = 0x20
+_VSCRDEF  = 0x33
+_VSCRSADD = 0x37
 
 # MADCTL bits (common)
 _MADCTL_MY  = 0x80
@@ -34,8 +52,25 @@ _MADCTL_MX  = 0x40
 _MADCTL_MV  = 0x20
 _MADCTL_BGR = 0x08
 
-# RGB565 pixel format value for COLMOD
+# Pixel format values for COLMOD
 _COLMOD_16BIT = 0x55
+_COLMOD_18BIT = 0x66
+
+# Pixels in the reusable solid-fill chunk
+_FILL_CHUNK_PIXELS = 256
+
+# Default byte budget for cached opaque glyph tiles
+_GLYPH_CACHE_BYTES = 8192
+
+# Size of the buffer opaque text lines are composed into before streaming
+_TEXT_STRIP_BYTES = 4096
+
+# Pixels per RGB666 conversion buffer (ILI9488)
+_RGB666_PIXELS = 256
+
+# RLE sprite header magic and file read buffer size
+_RLE_MAGIC = b"R565"
+_RLE_READ_BYTES = 512
 
 def color565(r, g, b):
     """
@@ -51,6 +86,265 @@ def color565(r, g, b):
     """
     return ((r & 0xF8) << 8) | ((g & 0xFC) << 3) | (b >> 3)
 
+def _line_runs(x0, y0, x1, y1):
+    """
+    Yield the Bresenham pixels of a line as (x, y, w, h) runs.
+
+    Shallow lines produce horizontal runs and steep lines vertical runs, so
+    consecutive pixels on the same row (or column) collapse into one rect.
+    """
+    dx = abs(x1 - x0)
+    sx = 1 if x0 < x1 else -1
+    dy = -abs(y1 - y0)
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    steep = -dy > dx
+    rx, ry = x0, y0
+    while True:
+        if x0 == x1 and y0 == y1:
+            break
+        e2 = 2 * err
+        nx, ny = x0, y0
+        if e2 >= dy:
+            err += dy
+            nx += sx
+        if e2 <= dx:
+            err += dx
+            ny += sy
+        if steep:
+            if nx != x0:
+                yield rx, min(ry, y0), 1, abs(y0 - ry) + 1
+                rx, ry = nx, ny
+        elif ny != y0:
+            yield min(rx, x0), ry, abs(x0 - rx) + 1, 1
+            rx, ry = nx, ny
+        x0, y0 = nx, ny
+    if steep:
+        yield rx, min(ry, y0), 1, abs(y0 - ry) + 1
+    else:
+        yield min(rx, x0), ry, abs(x0 - rx) + 1, 1
+
+
+# Cached circle decompositions: {(r, filled): [(dx, dy, w, h), ...]}
+_CIRCLE_CACHE = {}
+_CIRCLE_CACHE_SIZE = 16
+
+
+def _circle_rects(r, filled):
+    """
+    Decompose a midpoint circle of radius r into deduplicated rects.
+
+    The outline is split into horizontal runs per row; a filled circle has
+    exactly one span per row. Runs that repeat unchanged on consecutive
+    rows are merged into taller rects (the flat sides of the outline and
+    the middle of the disc). Results are cached per radius.
+
+    Returns:
+        list: (dx, dy, w, h) rects relative to the center.
+    """
+    key = (r, filled)
+    rects = _CIRCLE_CACHE.get(key)
+    if rects is not None:
+        return rects
+
+    # Same point set as the classic midpoint loops
+    rows = {}
+    x = r
+    y = 0
+    err = 1 - r
+    while x >= y:
+        if filled:
+            for dy, hw in ((y, x), (-y, x), (x, y), (-x, y)):
+                if rows.get(dy, -1) < hw:
+                    rows[dy] = hw
+        else:
+            for px, py in ((x, y), (y, x), (-y, x), (-x, y),
+                           (-x, -y), (-y, -x), (y, -x), (x, -y)):
+                xs = rows.get(py)
+                if xs is None:
+                    xs = rows[py] = set()
+                xs.add(px)
+        y += 1
+        if err < 0:
+            err += 2 * y + 1
+        else:
+            x -= 1
+            err += 2 * (y - x) + 1
+
+    rects = []
+    open_runs = {}
+    for dy in range(-r, r + 2):
+        cur = {}
+        row = rows.get(dy)
+        if row is not None:
+            if filled:
+                cur[(-row, 2 * row + 1)] = dy
+            else:
+                xs = sorted(row)
+                start = xs[0]
+                prev = start
+                for px in xs[1:] + [None]:
+                    if px is not None and px == prev + 1:
+                        prev = px
+                        continue
+                    cur[(start, prev - start + 1)] = dy
+                    if px is not None:
+                        start = prev = px
+        for run, first in open_runs.items():
+            if run in cur:
+                cur[run] = first
+            else:
+                rects.append((run[0], first, run[1], dy - first))
+        open_runs = cur
+
+    if len(_CIRCLE_CACHE) >= _CIRCLE_CACHE_SIZE:
+        _CIRCLE_CACHE.clear()
+    _CIRCLE_CACHE[key] = rects
+    return rects
+
+
+# Per-font cache of transparent glyph runs: {font: {char: (runs, width)}}
+_RUN_CACHE = {}
+
+
+def _glyph_runs(font, ch):
+    """
+    Decompose a glyph into rectangles of lit pixels, cached per font.
+
+    The glyph is split into vertical runs (per column) and horizontal runs
+    (per row); whichever needs fewer rects is kept, after merging runs that
+    repeat unchanged in neighbouring columns or rows into wider rects.
+
+    Returns:
+        tuple: (bytes of packed (dx, dy, w, h) quads, character width).
+    """
+    runs = _RUN_CACHE.get(font)
+    if runs is None:
+        runs = _RUN_CACHE[font] = {}
+    entry = runs.get(ch)
+    if entry is not None:
+        return entry
+
+    glyph, char_width = font.get_ch(ch)
+    font_height = font.height()
+    bytes_per_col = (font_height + 7) // 8
+    glyph_len = len(glyph)
+
+    def lit(col, row):
+        glyph_idx = col * bytes_per_col + (row >> 3)
+        return glyph_idx < glyph_len and glyph[glyph_idx] & (1 << (row & 7))
+
+    # Vertical runs, merged across columns with identical runs
+    vert = []
+    open_runs = {}
+    for col in range(char_width + 1):
+        cur = {}
+        row = 0
+        while col < char_width and row < font_height:
+            if lit(col, row):
+                start = row
+                while row < font_height and lit(col, row):
+                    row += 1
+                cur[(start, row - start)] = col
+            row += 1
+        for key, first in open_runs.items():
+            if key in cur:
+                cur[key] = first
+            else:
+                vert.append((first, key[0], col - first, key[1]))
+        open_runs = cur
+
+    # Horizontal runs, merged across rows with identical runs
+    horiz = []
+    open_runs = {}
+    for row in range(font_height + 1):
+        cur = {}
+        col = 0
+        while row < font_height and col < char_width:
+            if lit(col, row):
+                start = col
+                while col < char_width and lit(col, row):
+                    col += 1
+                cur[(start, col - start)] = row
+            col += 1
+        for key, first in open_runs.items():
+            if key in cur:
+                cur[key] = first
+            else:
+                horiz.append((key[0], first, key[1], row - first))
+        open_runs = cur
+
+    best = vert if len(vert) <= len(horiz) else horiz
+    packed = bytearray(4 * len(best))
+    i = 0
+    for run in best:
+        packed[i:i + 4] = bytes(run)
+        i += 4
+    entry = (bytes(packed), char_width)
+    runs[ch] = entry
+    return entry
+
+
+class GlyphCache:
+    """
+    Byte-budgeted LRU cache of rendered RGB565 glyph tiles.
+
+    Entries are keyed by ``(font, char, fg, bg)`` and hold the tile bytes
+    together with the character width, so a cache hit skips the font lookup
+    entirely and the tile can be written straight to SPI. When adding a tile
+    would exceed ``budget`` bytes, the least recently used tiles are evicted.
+    """
+    def __init__(self, budget=_GLYPH_CACHE_BYTES):
+        self.budget = budget
+        self._tiles = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self._tiles.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        # Re-insert so the entry becomes the most recently used
+        self._tiles[key] = entry
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry, size):
+        if size > self.budget:
+            return
+        tiles = self._tiles
+        while self.bytes + size > self.budget:
+            oldest = next(iter(tiles))
+            self.bytes -= len(tiles.pop(oldest)[0])
+            self.evictions += 1
+        tiles[key] = entry
+        self.bytes += size
+
+    def clear(self):
+        """Drop every cached tile and zero the statistics."""
+        self._tiles = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Returns:
+            dict: ``hits``, ``misses``, ``evictions``, ``entries``, ``bytes`` and ``budget``.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._tiles),
+            "bytes": self.bytes,
+            "budget": self.budget,
+        }
+
 class TFTBase:
     """
     Base class providing core SPI TFT display functionality.
@@ -84,8 +378,11 @@ class TFTBase:
     controller-specific commands, and rely on the existing drawing and
     text methods where possible.
     """
+    # COLMOD value sent by common_init
+    _colmod = _COLMOD_16BIT
+
     def __init__(self, spi, cs, dc, rst=None, bl=None,
-                 width=0, height=0, rotation=0, bgr=True, invert=False):
+                 width=0, height=0, rotation=0, bgr=True, invert=False, stream=None):
         """
                  Initialize the TFTBase instance with the SPI bus, control pins, panel dimensions, rotation, color order, and inversion flag.
 
@@ -97,11 +394,13 @@ class TFTBase:
                      rotation: int — Rotation index 0..3 (rotations are applied modulo 4).
                      bgr: bool — True if the panel expects BGR color order instead of RGB.
                      invert: bool — True to enable panel inversion mode (driver-dependent).
+                     stream: Pixel streaming backend (see drivers/spi_stream.py); defaults to a blocking spi.write stream.
 
                  Notes:
-                     - The constructor stores provided interfaces and settings, initializes internal x/y offsets, sets a default font (tt7), and allocates a reusable 64-pixel RGB565 buffer for fast solid-fill operations.
+                     - The constructor stores provided interfaces and settings, initializes internal x/y offsets, sets a default font (tt7), and allocates a reusable 256-pixel RGB565 buffer for fast solid-fill operations plus the small command/address buffers used by window setup.
                  """
         self.spi = spi
+        self._stream = BlockingStream(spi) if stream is None else stream
         self.cs = cs if isinstance(cs, Pin) else Pin(cs, Pin.OUT, value=1)
         self.dc = dc if isinstance(dc, Pin) else Pin(dc, Pin.OUT, value=0)
         self.rst = None if rst is None else (rst if isinstance(rst, Pin) else Pin(rst, Pin.OUT, value=1))
@@ -121,32 +420,138 @@ class TFTBase:
         self._font = fonts.tt7
 
         # Reusable small buffer for solid fills (RGB565)
-        self._chunk = bytearray(2 * 64)  # 64 pixels worth
+        self._chunk = bytearray(2 * _FILL_CHUNK_PIXELS)
+        self._chunkmv = memoryview(self._chunk)
+        self._chunk_color = None
+
+        # Preallocated command/address buffers so window setup never allocates
+        self._cmdbuf = bytearray(1)
+        self._winbuf = bytearray(4)
+        self._pixbuf = bytearray(2)
+
+        # Ready-to-stream tiles for opaque text, and the strip they are
+        # composed into (allocated on first use)
+        self._glyphs = GlyphCache(_GLYPH_CACHE_BYTES)
+        self._strip = None
+
+        # Hardware scroll region (see set_scroll_area)
+        self._scroll_top = 0
+        self._scroll_height = height
+        self._scroll_mem_top = 0
+        self._scroll_offset = 0
+
+        # Current clip as (x0, y0, x1, y1) with exclusive ends, and the
+        # clips saved by push_clip()
+        self._clip = (0, 0, self.width, self.height)
+        self._clip_stack = []
+
+        # Transaction nesting depth; CS stays asserted while > 0
+        self._txn = 0
+
+        # Bus counters (see counters() / reset_counters())
+        self.cs_cycles = 0
+        self.spi_writes = 0
+        self.windows = 0
 
     # --- Low-level bus ---
     def _select(self):
-        self.cs(0)
+        if self._txn == 0:
+            self.cs(0)
+            self.cs_cycles += 1
 
     def _deselect(self):
-        self.cs(1)
+        if self._txn == 0:
+            try:
+                self._stream.wait()
+            finally:
+                self.cs(1)
 
     def _cmd(self, c):
+        self._stream.wait()
         self.dc(0)
         self._select()
-        self.spi.write(bytearray([c & 0xFF]))
+        buf = self._cmdbuf
+        buf[0] = c & 0xFF
+        self.spi.write(buf)
+        self.spi_writes += 1
         self._deselect()
 
     def _data(self, buf):
+        # Only pixel payloads are ever in flight, so DC is already high when
+        # a previous transfer is still running
         self.dc(1)
         self._select()
-        self.spi.write(buf)
+        self._stream.write(buf)
+        self.spi_writes += 1
         self._deselect()
 
+    # Pixel payloads for an open RAMWR window go through _pixels. It is plain
+    # _data for RGB565 controllers; ILI9488 converts to RGB666 here.
+    _pixels = _data
+
     def _cmd_data(self, c, data=b""):
         self._cmd(c)
         if data:
             self._data(data)
 
+    # --- Transactions ---
+    def begin(self):
+        """
+        Open a bus transaction.
+
+        CS is asserted on the outermost call and then held low across every
+        command and data write until the matching :meth:`end`, so a caller
+        drawing many primitives pays for a single CS cycle. Calls nest.
+
+        With an asynchronous stream the last pixel transfer may still be
+        running when a draw call returns inside a transaction; the outermost
+        :meth:`end` waits for it. Buffers passed to :meth:`blit_rgb565` must
+        therefore stay unchanged until then.
+        """
+        if self._txn == 0:
+            self.cs(0)
+            self.cs_cycles += 1
+        self._txn += 1
+
+    def end(self):
+        """Close a transaction opened by :meth:`begin`; CS is released when the outermost one ends."""
+        if self._txn == 0:
+            return
+        self._txn -= 1
+        if self._txn == 0:
+            try:
+                self._stream.wait()
+            finally:
+                self.cs(1)
+
+    def __enter__(self):
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end()
+        return False
+
+    def counters(self):
+        """
+        Return the bus counters accumulated since the last :meth:`reset_counters`.
+
+        Returns:
+            dict: ``cs_cycles`` (CS assertions), ``spi_writes`` (bus
+            transfers, including each chunk of a fill) and ``windows``
+            (CASET/RASET/RAMWR setups).
+        """
+        return {
+            "cs_cycles": self.cs_cycles,
+            "spi_writes": self.spi_writes,
+            "windows": self.windows,
+        }
+
+    def reset_counters(self):
+        self.cs_cycles = 0
+        self.spi_writes = 0
+        self.windows = 0
+
     def reset(self):
         """
         Perform a hardware reset sequence using the configured reset pin.
@@ -189,6 +594,8 @@ class TFTBase:
     def rotation(self, r):
         self._rotation = r & 3
         self._apply_madctl()
+        # Clip rects are in the old orientation's coordinates
+        self.reset_clip()
 
     def _apply_madctl(self):
         r = self._rotation
@@ -212,10 +619,140 @@ class TFTBase:
         y0 += self._yoff
         y1 += self._yoff
 
+        # CASET/RASET/RAMWR go out under one CS assertion, toggling only DC.
         # CASET/RASET want big-endian 16-bit
-        self._cmd_data(_CASET, bytes([x0 >> 8, x0 & 0xFF, x1 >> 8, x1 & 0xFF]))
-        self._cmd_data(_RASET, bytes([y0 >> 8, y0 & 0xFF, y1 >> 8, y1 & 0xFF]))
-        self._cmd(_RAMWR)
+        spi = self.spi
+        dc = self.dc
+        cmd = self._cmdbuf
+        win = self._winbuf
+        self._stream.wait()
+        self._select()
+        dc(0)
+        cmd[0] = _CASET
+        spi.write(cmd)
+        win[0] = x0 >> 8
+        win[1] = x0 & 0xFF
+        win[2] = x1 >> 8
+        win[3] = x1 & 0xFF
+        dc(1)
+        spi.write(win)
+        dc(0)
+        cmd[0] = _RASET
+        spi.write(cmd)
+        win[0] = y0 >> 8
+        win[1] = y0 & 0xFF
+        win[2] = y1 >> 8
+        win[3] = y1 & 0xFF
+        dc(1)
+        spi.write(win)
+        dc(0)
+        cmd[0] = _RAMWR
+        spi.write(cmd)
+        self._deselect()
+        self.spi_writes += 5
+        self.windows += 1
+
+    # --- Clipping ---
+    def push_clip(self, x, y, w, h):
+        """
+        Restrict drawing to (x, y, w, h) intersected with the current clip.
+
+        The previous clip is saved and restored by :meth:`pop_clip`. Every
+        primitive trims its spans to the clip before setting a window, and
+        one lying wholly outside it sends nothing.
+        """
+        c = self._clip
+        self._clip_stack.append(c)
+        x0 = max(x, c[0])
+        y0 = max(y, c[1])
+        x1 = min(x + w, c[2])
+        y1 = min(y + h, c[3])
+        # An empty intersection is kept as a zero-size clip
+        self._clip = (x0, y0, max(x0, x1), max(y0, y1))
+
+    def pop_clip(self):
+        """Restore the clip that was current before the last :meth:`push_clip`."""
+        if not self._clip_stack:
+            raise ValueError("clip stack empty")
+        self._clip = self._clip_stack.pop()
+
+    def reset_clip(self):
+        """Drop all pushed clips and allow drawing on the whole screen."""
+        self._clip = (0, 0, self.width, self.height)
+        self._clip_stack = []
+
+    def get_clip(self):
+        """
+        Returns:
+            tuple: The current clip as (x, y, w, h).
+        """
+        c = self._clip
+        return (c[0], c[1], c[2] - c[0], c[3] - c[1])
+
+    def _clipped(self, x, y, w, h):
+        # True if no pixel of (x, y, w, h) lies inside the clip
+        c = self._clip
+        return x >= c[2] or y >= c[3] or x + w <= c[0] or y + h <= c[1]
+
+    # --- Hardware vertical scroll ---
+    def set_scroll_area(self, top, height):
+        """
+        Define logical rows [top, top + height) as the hardware scroll region.
+
+        Rows above and below the region stay fixed. Hardware scrolling moves
+        GRAM rows, which are screen rows only in the portrait rotations, so
+        rotation must be 0 or 2. The region starts unscrolled.
+
+        Raises:
+            ValueError: In a landscape rotation or if the region does not fit.
+        """
+        if self._rotation & 1:
+            raise ValueError("hardware scroll needs rotation 0 or 2")
+        if top < 0 or height <= 0 or top + height > self.height:
+            raise ValueError("scroll area out of range")
+        rows = self._h
+        # With MY set (rotation 2) logical rows run bottom-up in GRAM
+        if self._rotation == 0:
+            mem_top = top + self._yoff
+        else:
+            mem_top = rows - top - height - self._yoff
+        bottom = rows - mem_top - height
+        self._cmd_data(_VSCRDEF, bytes([mem_top >> 8, mem_top & 0xFF,
+                                        height >> 8, height & 0xFF,
+                                        bottom >> 8, bottom & 0xFF]))
+        self._scroll_top = top
+        self._scroll_height = height
+        self._scroll_mem_top = mem_top
+        self.scroll_to(0)
+
+    def scroll_to(self, offset):
+        """
+        Scroll the region so that content drawn at region row ``offset`` shows
+        at its top. Only the VSCRSADD register is written.
+        """
+        height = self._scroll_height
+        offset %= height
+        self._scroll_offset = offset
+        d = offset if self._rotation == 0 else -offset
+        start = self._scroll_mem_top + d % height
+        self._cmd_data(_VSCRSADD, bytes([start >> 8, start & 0xFF]))
+
+    def scroll_row(self, row):
+        """
+        Return the logical y to draw at so it appears at region row ``row``
+        under the current scroll offset.
+        """
+        return self._scroll_top + (row + self._scroll_offset) % self._scroll_height
+
+    def reset_scroll(self):
+        """Turn the whole panel back into one unscrolled region."""
+        rows = self._h
+        self._cmd_data(_VSCRDEF, bytes([0, 0, rows >> 8, rows & 0xFF, 0, 0]))
+        self._cmd_data(_VSCRSADD, b"\x00\x00")
+        self._scroll_top = 0
+        self._scroll_height = self.height
+        self._scroll_mem_top = 0
+        self._scroll_offset = 0
 
     # --- Common init steps (controller-specific init tables call into these) ---
     def common_init(self):
@@ -225,8 +762,8 @@ class TFTBase:
         self._cmd(_SLPOUT)
         time.sleep_ms(120)
 
-        # Pixel format RGB565
-        self._cmd_data(_COLMOD, bytes([_COLMOD_16BIT]))
+        # Pixel format (RGB565 unless the controller needs another)
+        self._cmd_data(_COLMOD, bytes([self._colmod]))
         time.sleep_ms(10)
 
         self._apply_madctl()
@@ -250,10 +787,19 @@ class TFTBase:
         self.fill(0x0000)  # Black
 
     def pixel(self, x, y, color):
-        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+        c = self._clip
+        if x < c[0] or y < c[1] or x >= c[2] or y >= c[3]:
             return
-        self._set_window(x, y, x, y)
-        self._data(bytes([color >> 8, color & 0xFF]))
+        buf = self._pixbuf
+        self._stream.wait()
+        buf[0] = (color >> 8) & 0xFF
+        buf[1] = color & 0xFF
+        self.begin()
+        try:
+            self._set_window(x, y, x, y)
+            self._pixels(buf)
+        finally:
+            self.end()
 
     def hline(self, x, y, w, color):
         self.fill_rect(x, y, w, 1, color)
@@ -270,109 +816,137 @@ class TFTBase:
         self.vline(x + w - 1, y, h, color)
 
     def fill_rect(self, x, y, w, h, color):
-        if w <= 0 or h <= 0:
+        if w <= 0 or h <= 0 or self._clipped(x, y, w, h):
             return
-        x1 = x + w - 1
-        y1 = y + h - 1
-        if x1 < 0 or y1 < 0 or x >= self.width or y >= self.height:
+        self._prep_color(color)
+        self.begin()
+        try:
+            self._fill_span(x, y, w, h)
+        finally:
+            self.end()
+
+    def _prep_color(self, color):
+        # Fill chunk buffer with repeated color (skipped when already filled)
+        if color == self._chunk_color:
             return
-        # Clip
-        if x < 0:
-            w += x
-            x = 0
-        if y < 0:
-            h += y
-            y = 0
-        if x + w > self.width:
-            w = self.width - x
-        if y + h > self.height:
-            h = self.height - y
-
-        self._set_window(x, y, x + w - 1, y + h - 1)
-        hi = (color >> 8) & 0xFF
-        lo = color & 0xFF
+        self._stream.wait()
+        fill16(self._chunk, color)
+        self._chunk_color = color
 
-        # Fill chunk buffer with repeated color
-        chunk = self._chunk
-        for i in range(0, len(chunk), 2):
-            chunk[i] = hi
-            chunk[i + 1] = lo
-
-        total = w * h
+    def _stream_fill(self, total):
+        # Send `total` pixels of the prepared chunk color into the open window
         self.dc(1)
         self._select()
-        # Stream as many full chunks as possible
-        while total > 0:
-            n = 64 if total >= 64 else total
-            self.spi.write(chunk[:2 * n])
-            total -= n
+        self.spi_writes += self._stream.fill(self._chunkmv, 2 * total)
         self._deselect()
 
     def line(self, x0, y0, x1, y1, color):
-        # Bresenham
-        dx = abs(x1 - x0)
-        sx = 1 if x0 < x1 else -1
-        dy = -abs(y1 - y0)
-        sy = 1 if y0 < y1 else -1
-        err = dx + dy
-        while True:
-            self.pixel(x0, y0, color)
-            if x0 == x1 and y0 == y1:
-                break
-            e2 = 2 * err
-            if e2 >= dy:
-                err += dy
-                x0 += sx
-            if e2 <= dx:
-                err += dx
-                y0 += sy
+        """
+        Draw a line between two points (inclusive) with Bresenham's algorithm.
+
+        Horizontal and vertical lines are a single window. Other lines are
+        sent as maximal horizontal runs (shallow slopes) or vertical runs
+        (steep slopes), one window per run.
+        """
+        if y0 == y1:
+            self.hline(min(x0, x1), y0, abs(x1 - x0) + 1, color)
+            return
+        if x0 == x1:
+            self.vline(x0, min(y0, y1), abs(y1 - y0) + 1, color)
+            return
+        if self._clipped(min(x0, x1), min(y0, y1), abs(x1 - x0) + 1, abs(y1 - y0) + 1):
+            return
+        self._prep_color(color)
+        self.begin()
+        try:
+            for x, y, w, h in _line_runs(x0, y0, x1, y1):
+                self._fill_span(x, y, w, h)
+        finally:
+            self.end()
+
+    def polyline(self, points, color, closed=False):
+        """
+        Draw connected line segments through a sequence of (x, y) points.
+
+        The whole polyline is sent in one transaction with the fill color
+        prepared once. With ``closed`` the last point is joined to the first.
+        """
+        n = len(points)
+        if n == 0:
+            return
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x0 = min(xs)
+        y0 = min(ys)
+        if self._clipped(x0, y0, max(xs) - x0 + 1, max(ys) - y0 + 1):
+            return
+        self._prep_color(color)
+        self.begin()
+        try:
+            if n == 1:
+                self._fill_span(points[0][0], points[0][1], 1, 1)
+            last = n if closed and n > 2 else n - 1
+            for i in range(last):
+                x0, y0 = points[i]
+                x1, y1 = points[(i + 1) % n]
+                for x, y, w, h in _line_runs(x0, y0, x1, y1):
+                    self._fill_span(x, y, w, h)
+        finally:
+            self.end()
+
+    def _fill_span(self, x, y, w, h):
+        # Clip a rect and fill it with the color prepared by _prep_color
+        c = self._clip
+        x1 = x + w
+        y1 = y + h
+        if x < c[0]:
+            x = c[0]
+        if y < c[1]:
+            y = c[1]
+        if x1 > c[2]:
+            x1 = c[2]
+        if y1 > c[3]:
+            y1 = c[3]
+        if x >= x1 or y >= y1:
+            return
+        self._set_window(x, y, x1 - 1, y1 - 1)
+        self._stream_fill((x1 - x) * (y1 - y))
 
     def circle(self, x0, y0, r, color):
-        # Midpoint circle
-        x = r
-        y = 0
-        err = 1 - r
-        while x >= y:
-            self.pixel(x0 + x, y0 + y, color)
-            self.pixel(x0 + y, y0 + x, color)
-            self.pixel(x0 - y, y0 + x, color)
-            self.pixel(x0 - x, y0 + y, color)
-            self.pixel(x0 - x, y0 - y, color)
-            self.pixel(x0 - y, y0 - x, color)
-            self.pixel(x0 + y, y0 - x, color)
-            self.pixel(x0 + x, y0 - y, color)
-            y += 1
-            if err < 0:
-                err += 2 * y + 1
-            else:
-                x -= 1
-                err += 2 * (y - x) + 1
+        """
+        Draw a circle outline (midpoint algorithm) centered at (x0, y0).
+
+        The outline is sent as deduplicated runs, one window each.
+        """
+        self._circle(x0, y0, r, color, False)
 
     def fill_circle(self, x0, y0, r, color):
-        # Scanline fill using midpoint
         """
         Draw a filled circle centered at (x0, y0) with the given radius.
 
+        Every row of the disc is written exactly once; consecutive rows of
+        equal width go out as a single rect.
+
         Parameters:
             x0 (int): X coordinate of the circle center in pixels.
             y0 (int): Y coordinate of the circle center in pixels.
             r (int): Radius of the circle in pixels (>= 0).
             color (int): 16-bit RGB565 color value to fill the circle.
         """
-        x = r
-        y = 0
-        err = 1 - r
-        while x >= y:
-            self.hline(x0 - x, y0 + y, 2 * x + 1, color)
-            self.hline(x0 - x, y0 - y, 2 * x + 1, color)
-            self.hline(x0 - y, y0 + x, 2 * y + 1, color)
-            self.hline(x0 - y, y0 - x, 2 * y + 1, color)
-            y += 1
-            if err < 0:
-                err += 2 * y + 1
-            else:
-                x -= 1
-                err += 2 * (y - x) + 1
+        self._circle(x0, y0, r, color, True)
+
+    def _circle(self, x0, y0, r, color, filled):
+        if r < 0:
+            return
+        if self._clipped(x0 - r, y0 - r, 2 * r + 1, 2 * r + 1):
+            return
+        self._prep_color(color)
+        self.begin()
+        try:
+            for dx, dy, w, h in _circle_rects(r, filled):
+                self._fill_span(x0 + dx, y0 + dy, w, h)
+        finally:
+            self.end()
 
     # --- Text rendering ---
     def text(self, s, x, y, color, bg=None, spacing=1):
@@ -392,18 +966,142 @@ class TFTBase:
         Returns:
             int: The vertical pixel coordinate after rendering the text (y position plus font height plus
         """
-        font_height = self._font.height()
-        cx = x
-        for ch in s:
-            if ch == "\n":
+        font = self._font
+        font_height = font.height()
+        c = self._clip
+        bottom = y + (s.count("\n") + 1) * (font_height + 2)
+        if x >= c[2] or y >= c[3] or bottom <= c[1]:
+            return bottom
+        # One CS assertion for the whole string
+        self.begin()
+        try:
+            if bg is not None:
+                # Opaque text: each line goes out as one strip per window
+                lines = s.split("\n")
+                for i, line in enumerate(lines):
+                    if i:
+                        y += font_height + 2
+                    if y < c[3] and y + font_height + 1 > c[1]:
+                        self._text_strip(line, x, y, color, bg, spacing)
+            else:
                 cx = x
-                y += font_height + 2
-                continue
-            char_width = self._draw_char(ch, cx, y, color, bg)
-            cx += char_width + spacing
+                max_w = font.max_width()
+                visible = y < c[3] and y + font_height + 1 > c[1]
+                for ch in s:
+                    if ch == "\n":
+                        cx = x
+                        y += font_height + 2
+                        visible = y < c[3] and y + font_height + 1 > c[1]
+                        continue
+                    if visible and c[0] <= cx + max_w and cx < c[2]:
+                        char_width = self._draw_char(ch, cx, y, color, bg)
+                    else:
+                        char_width = font.get_ch(ch)[1]
+                    cx += char_width + spacing
+        finally:
+            self.end()
 
         return y + font_height + 2
 
+    def text_box(self, s, rect, color, bg=None, align=ALIGN_LEFT, wrap=WRAP_GREEDY,
+                 spacing=1, ellipsis="..."):
+        """
+        Render text word-wrapped inside a box using the currently selected font.
+
+        Parameters:
+            s (str): The text to draw; "\\n" starts a new line.
+            rect (tuple): (x, y, w, h) box. Lines that do not fit below it are dropped.
+            color (int): Foreground color (RGB565) for glyph pixels.
+            bg (int or None): Background color (RGB565) behind glyphs, or None for transparent.
+            align (int): text_layout.ALIGN_LEFT, ALIGN_CENTER or ALIGN_RIGHT.
+            wrap (int): text_layout.WRAP_NONE, WRAP_GREEDY or WRAP_BALANCED.
+            spacing (int): Additional horizontal spacing in pixels between consecutive characters.
+            ellipsis (str or None): Appended to the last line when text is cut.
+
+        Returns:
+            list: Line boxes (x, y, width, text). Pass them to :meth:`draw_lines` to draw
+            the same text again without measuring it.
+        """
+        lines = layout(self._font, s, rect, align, wrap, spacing, ellipsis)
+        self.draw_lines(lines, color, bg, spacing)
+        return lines
+
+    def draw_lines(self, lines, color, bg=None, spacing=1):
+        """Draw line boxes returned by :meth:`text_box` or :func:`text_layout.layout`."""
+        self.begin()
+        try:
+            draw_lines(self, lines, color, bg, spacing)
+        finally:
+            self.end()
+
+    def _glyph_tile(self, font, ch, color, bg):
+        key = (font, ch, color, bg)
+        entry = self._glyphs.get(key)
+        if entry is None:
+            entry = self._build_tile(font, ch, color, bg)
+            self._glyphs.put(key, entry, len(entry[0]))
+        return entry
+
+    def _text_strip(self, s, x, y, color, bg, spacing):
+        """
+        Draw one line of opaque text as whole-string RGB565 strips.
+
+        Glyph tiles are composed side by side and each strip is streamed
+        under a single CASET/RASET/RAMWR. Every glyph but the last owns a
+        cell of ``char_width + spacing`` columns (at least its tile), so
+        gaps from ``spacing`` are filled with ``bg`` even where the line is
+        split into several strips at a character boundary.
+        """
+        font = self._font
+        h = font.height() + 1
+        strip = self._strip
+        if strip is None:
+            strip = self._strip = bytearray(_TEXT_STRIP_BYTES)
+        max_w = len(strip) // (2 * h)
+        n = len(s)
+        i = 0
+        cx = x
+        while i < n:
+            parts = []
+            while i < n:
+                tile, char_width = self._glyph_tile(font, s[i], color, bg)
+                cell = char_width + 1
+                if spacing > 1 and i + 1 < n:
+                    cell = char_width + spacing
+                if parts and cx + cell - parts[0][0] > max_w:
+                    break
+                parts.append((cx, tile, char_width))
+                end = cx + cell
+                cx += char_width + spacing
+                i += 1
+            x0 = parts[0][0]
+            w = end - x0
+            if w > max_w:
+                # A single glyph larger than the strip buffer
+                self._draw_char(s[i - 1], x0, y, color, bg)
+                continue
+            if self._clipped(x0, y, w, h):
+                continue
+            buf = memoryview(strip)[:2 * w * h]
+            self._stream.wait()
+            fill16(buf, bg)
+            for k in range(len(parts)):
+                px, tile, char_width = parts[k]
+                tw = char_width + 1
+                cols = tw
+                if k + 1 < len(parts):
+                    cols = min(tw, parts[k + 1][0] - px)
+                if cols <= 0:
+                    continue
+                nb = 2 * cols
+                src = 0
+                dst = 2 * (px - x0)
+                for _ in range(h):
+                    buf[dst:dst + nb] = tile[src:src + nb]
+                    src += 2 * tw
+                    dst += 2 * w
+            self._send_rect(x0, y, w, h, buf)
+
     def _draw_char(self, ch, x, y, color, bg):
         # Get glyph data and width from font
         """
@@ -420,92 +1118,557 @@ class TFTBase:
         Returns:
             int: Width of the drawn character in pixels (used to advance the text cursor).
         """
-        glyph, char_width = self._font.get_ch(ch)
-        font_height = self._font.height()
-
-        # Calculate bytes per column (height / 8, rounded up)
-        bytes_per_col = (font_height + 7) // 8
-
-        # Fast path: bg is not None => stream a tile (incl spacing row/col)
+        # Fast path: bg is not None => stream a cached tile (incl spacing row/col)
         if bg is not None:
-            w, h = char_width + 1, font_height + 1
-            self._set_window(x, y, x + w - 1, y + h - 1)
-            # Build a small RGB565 buffer for the tile
-            buf = bytearray(w * h * 2)
-            fg_hi, fg_lo = (color >> 8) & 0xFF, color & 0xFF
-            bg_hi, bg_lo = (bg >> 8) & 0xFF, bg & 0xFF
-
-            # Fill background
-            for i in range(0, len(buf), 2):
-                buf[i] = bg_hi
-                buf[i + 1] = bg_lo
-
-            # Plot glyph - glyph data format: [col0_byte0, col0_byte1, ..., col1_byte0, col1_byte1, ...]
-            for col in range(char_width):
-                for row in range(font_height):
-                    byte_idx = row // 8
-                    bit_idx = row % 8
-                    glyph_idx = col * bytes_per_col + byte_idx
-                    if glyph_idx < len(glyph):
-                        bits = glyph[glyph_idx]
-                        if bits & (1 << bit_idx):
-                            p = (row * w + col) * 2
-                            buf[p] = fg_hi
-                            buf[p + 1] = fg_lo
-
-            self._data(buf)
+            font = self._font
+            tile, char_width = self._glyph_tile(font, ch, color, bg)
+            self._send_rect(x, y, char_width + 1, font.height() + 1, tile)
             return char_width
 
-        # General path: plot pixels (transparent background supported)
-        for col in range(char_width):
-            for row in range(font_height):
-                byte_idx = row // 8
-                bit_idx = row % 8
-                glyph_idx = col * bytes_per_col + byte_idx
-                on = False
-                if glyph_idx < len(glyph):
-                    bits = glyph[glyph_idx]
-                    on = bits & (1 << bit_idx)
-
-                if on:
-                    self.pixel(x + col, y + row, color)
-                elif bg is not None:
-                    self.pixel(x + col, y + row, bg)
-        # Optional spacing column
-        if bg is not None:
-            self.vline(x + char_width, y, font_height, bg)
-            self.hline(x, y + font_height, char_width + 1, bg)
-
+        # Transparent path: one window per precomputed run of lit pixels
+        runs, char_width = _glyph_runs(self._font, ch)
+        if runs:
+            self._draw_runs(runs, x, y, color)
         return char_width
 
+    def _draw_runs(self, runs, x, y, color):
+        # runs holds packed (dx, dy, w, h) rects relative to (x, y)
+        self._prep_color(color)
+        self.begin()
+        try:
+            for i in range(0, len(runs), 4):
+                self._fill_span(x + runs[i], y + runs[i + 1], runs[i + 2], runs[i + 3])
+        finally:
+            self.end()
+
+    def _build_tile(self, font, ch, color, bg):
+        """
+        Rasterize one glyph into a ready-to-stream RGB565 tile.
+
+        The tile covers the glyph plus the one-pixel spacing column and row,
+        matching what the opaque text path has always painted.
+
+        Returns:
+            tuple: (tile bytearray, character width in pixels).
+        """
+        glyph, char_width = font.get_ch(ch)
+        font_height = font.height()
+        w = char_width + 1
+        buf = bytearray(w * (font_height + 1) * 2)
+        fill16(buf, bg)
+        glyph_expand(glyph, font_height, buf, w, color)
+        return buf, char_width
+
+    def set_glyph_cache(self, budget):
+        """
+        Resize the opaque-text glyph cache.
+
+        Parameters:
+            budget (int): Maximum bytes of cached RGB565 tiles; 0 disables caching.
+        """
+        self._glyphs = GlyphCache(budget)
+
+    def glyph_cache_stats(self):
+        """Return hit/miss/eviction statistics of the glyph cache (see :meth:`GlyphCache.stats`)."""
+        return self._glyphs.stats()
+
     # --- Sprites ---
-    def blit_rgb565(self, x, y, w, h, data, key=None):
+    def blit_rgb565(self, x, y, w, h, data, key=None, runs=None):
         """
         Blit a raw RGB565 image to the display at the given coordinates.
 
         Stops immediately if width or height are less than or equal to zero. The
         `data` buffer must contain exactly w*h*2 bytes in big-endian RGB565 pixel
         order (high byte first). If `key` is None the pixel block is streamed
-        directly to the panel (fast); if `key` is provided the function treats that
-        RGB565 value as transparent and plots pixels individually (slower).
+        directly to the panel (fast); if `key` is provided that RGB565 value is
+        treated as transparent and each run of opaque pixels is streamed straight
+        from the source buffer under its own window. Pass ``runs`` from
+        :func:`sprite_runs` to skip scanning the sprite on repeated blits.
+
+        With an asynchronous stream (e.g. DMAStream) inside an outer
+        :meth:`begin`/:meth:`end`, this returns while ``data`` may still be
+        on the wire: do not modify it until :meth:`end`. Outside a
+        transaction the transfer is finished on return.
         """
         if w <= 0 or h <= 0:
             return
+        if self._clipped(x, y, w, h):
+            return
         if key is None:
             # Fast: set window and stream data
-            self._set_window(x, y, x + w - 1, y + h - 1)
-            self._data(data)
+            self._send_rect(x, y, w, h, data)
             return
 
-        # Slow path: transparency key
-        # data must be big-endian pairs
-        i = 0
-        for yy in range(h):
-            for xx in range(w):
-                c = (data[i] << 8) | data[i + 1]
-                if c != key:
-                    self.pixel(x + xx, y + yy, c)
-                i += 2
+        # Transparency key: one window per opaque run, trimmed to the clip
+        if runs is None:
+            runs = sprite_runs(w, h, data, key)
+        src = memoryview(data)
+        left, top, right, bottom = self._clip
+        self.begin()
+        try:
+            for i in range(0, len(runs), 4):
+                row = runs[i]
+                col = runs[i + 1]
+                n = runs[i + 2]
+                rows = runs[i + 3]
+                ry0 = y + row
+                ry1 = ry0 + rows
+                rx0 = x + col
+                rx1 = rx0 + n
+                if ry0 < top:
+                    row += top - ry0
+                    ry0 = top
+                if ry1 > bottom:
+                    ry1 = bottom
+                if rx0 < left:
+                    col += left - rx0
+                    rx0 = left
+                if rx1 > right:
+                    rx1 = right
+                if rx0 >= rx1 or ry0 >= ry1:
+                    continue
+                self._set_window(rx0, ry0, rx1 - 1, ry1 - 1)
+                s = (row * w + col) * 2
+                nb = (rx1 - rx0) * 2
+                if rx1 - rx0 == w:
+                    # Full-width rows are contiguous in the source
+                    self._pixels(src[s:s + nb * (ry1 - ry0)])
+                else:
+                    for _ in range(ry1 - ry0):
+                        self._pixels(src[s:s + nb])
+                        s += 2 * w
+        finally:
+            self.end()
+
+    def _send_rect(self, x, y, w, h, buf):
+        # Stream a contiguous w*h RGB565 block, trimmed to the clip
+        c = self._clip
+        x0 = max(x, c[0])
+        y0 = max(y, c[1])
+        x1 = min(x + w, c[2])
+        y1 = min(y + h, c[3])
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.begin()
+        try:
+            self._set_window(x0, y0, x1 - 1, y1 - 1)
+            if x1 - x0 == w and y1 - y0 == h:
+                self._pixels(buf)
+            else:
+                src = memoryview(buf)
+                s = ((y0 - y) * w + x0 - x) * 2
+                nb = (x1 - x0) * 2
+                if x1 - x0 == w:
+                    # Full-width rows are contiguous in the source
+                    self._pixels(src[s:s + nb * (y1 - y0)])
+                else:
+                    for _ in range(y1 - y0):
+                        self._pixels(src[s:s + nb])
+                        s += 2 * w
+        finally:
+            self.end()
+
+    def blit_rle565(self, x, y, src):
+        """
+        Decode a run-length encoded RGB565 sprite straight to the display.
+
+        ``src`` is either a buffer holding the whole ``.rle`` file (as written
+        by ``utils/img2rgb565.py --rle``) or an open binary file. The image is
+        decoded packet by packet into the driver's chunk buffer while it
+        streams, so no w*h*2 allocation is ever made.
+
+        Format: ``b"R565"``, width and height as big-endian u16, then packets.
+        A control byte ``c`` with the top bit set repeats the following
+        2-byte pixel ``(c & 0x7F) + 1`` times; otherwise ``c + 1`` literal
+        pixels follow.
+
+        Only the part inside the clip is decoded into the output buffer; the
+        window covers just that part.
+
+        Returns:
+            tuple: (width, height) of the sprite.
+        """
+        if hasattr(src, "readinto"):
+            inbuf = bytearray(_RLE_READ_BYTES)
+            end = src.readinto(inbuf)
+        else:
+            inbuf = src
+            end = len(src)
+            src = None
+        data = memoryview(inbuf)
+        if end < 8 or bytes(data[:4]) != _RLE_MAGIC:
+            raise ValueError("not an RGB565 RLE sprite")
+        w = (data[4] << 8) | data[5]
+        h = (data[6] << 8) | data[7]
+        pos = 8
+        clip = self._clip
+        cx0 = max(x, clip[0]) - x
+        cy0 = max(y, clip[1]) - y
+        cx1 = min(x + w, clip[2]) - x
+        cy1 = min(y + h, clip[3]) - y
+        if cx0 >= cx1 or cy0 >= cy1:
+            return w, h
+        clipped = cx0 > 0 or cy0 > 0 or cx1 < w or cy1 < h
+
+        # Decode into alternating halves of the chunk so one half can be in
+        # flight while the other fills
+        self._stream.wait()
+        self._chunk_color = None
+        half = len(self._chunk) // 2
+        outs = (self._chunkmv[:half], self._chunkmv[half:])
+        which = 0
+        out = outs[0]
+        o = 0
+
+        self.begin()
+        try:
+            self._set_window(x + cx0, y + cy0, x + cx1 - 1, y + cy1 - 1)
+            # Stop once the last visible row is decoded
+            remaining = cy1 * w
+            i = 0
+            while remaining > 0:
+                if src is not None and end - pos < 257:
+                    # Refill: keep the unread tail and read behind it
+                    tail = end - pos
+                    data[:tail] = data[pos:end]
+                    n = src.readinto(data[tail:])
+                    end = tail + (n or 0)
+                    pos = 0
+                    if not n:
+                        src = None
+                c = data[pos]
+                pos += 1
+                count = (c & 0x7F) + 1
+                if count > remaining:
+                    count = remaining
+                remaining -= count
+                total = count
+                repeat = c & 0x80
+                if clipped:
+                    # Split the packet at row ends and keep the visible columns
+                    spans = []
+                    j = i
+                    end_i = i + count
+                    while j < end_i:
+                        row = j // w
+                        col = j - row * w
+                        seg_end = min(end_i, j - col + w)
+                        if row >= cy0:
+                            a = max(col, cx0)
+                            b = min(seg_end - j + col, cx1)
+                            if a < b:
+                                spans.append((j - i + a - col, b - a))
+                        j = seg_end
+                else:
+                    spans = ((0, count),)
+                i += count
+                for skip, count in spans:
+                    p = pos if repeat else pos + 2 * skip
+                    while count > 0:
+                        k = (half - o) >> 1
+                        if k > count:
+                            k = count
+                        if repeat:
+                            out[o] = data[p]
+                            out[o + 1] = data[p + 1]
+                            n = 2
+                            size = 2 * k
+                            while n < size:
+                                m = n if n < size - n else size - n
+                                out[o + n:o + n + m] = out[o:o + m]
+                                n += m
+                        else:
+                            out[o:o + 2 * k] = data[p:p + 2 * k]
+                            p += 2 * k
+                        o += 2 * k
+                        count -= k
+                        if o == half:
+                            # The stream waits for the previous transfer before
+                            # starting this one, so the other half is free again
+                            self._pixels(out)
+                            which ^= 1
+                            out = outs[which]
+                            o = 0
+                pos += 2 if repeat else 2 * total
+            if o:
+                self._pixels(out[:o])
+        finally:
+            self.end()
+        return w, h
+
+
+def sprite_runs(w, h, data, key):
+    """
+    Scan an RGB565 sprite for runs of pixels that differ from a color key.
+
+    The result can be passed as ``runs`` to :meth:`TFTBase.blit_rgb565` so
+    repeated blits of the same icon skip the scan. Consecutive rows that are
+    completely opaque are merged into one entry.
+
+    Parameters:
+        w, h (int): Sprite size in pixels.
+        data: Big-endian RGB565 buffer of w*h*2 bytes.
+        key (int): RGB565 color treated as transparent.
+
+    Returns:
+        array: Unsigned 16-bit quads of (row, col, length, rows).
+    """
+    runs = array("H")
+    i = 0
+    for row in range(h):
+        end = i + 2 * w
+        p = skip_key(data, i, end, key)
+        while p < end:
+            q = find_key(data, p, end, key)
+            start = (p - i) >> 1
+            n = (q - p) >> 1
+            if (n == w and len(runs) and runs[-3] == 0 and runs[-2] == w
+                    and runs[-4] + runs[-1] == row):
+                runs[-1] += 1
+            else:
+                runs.extend((row, start, n, 1))
+            p = skip_key(data, q, end, key)
+        i = end
+    return runs
+
+
+class IndexedCanvas:
+    """
+    Full-screen 4-bit indexed framebuffer that is streamed as RGB565.
+
+    A 240x320 screen at 4 bits per pixel is 38 KB and fits in the Pico's RAM,
+    unlike the 150 KB RGB565 equivalent. Primitives draw palette indices into
+    a ``framebuf.GS4_HMSB`` buffer; nothing reaches the panel until
+    :meth:`show`, which expands the pixels through a 256-entry byte-pair
+    lookup table while streaming them under a single window. That gives
+    flicker-free composition, and changing a palette entry recolors the
+    screen on the next :meth:`show` without redrawing anything.
+
+    Drawing methods take RGB565 colors like :class:`TFTBase`; each new color
+    is assigned the next free palette slot (at most 16).
+
+    Every pixel starts at slot 0, so slot 0 is the initial background. With
+    no palette it is reserved for black (0x0000).
+
+    Parameters:
+        tft (TFTBase): Display to stream to. Its width must be even.
+        palette (list or None): Initial RGB565 colors for slots 0..15;
+            palette[0] is the initial background. Defaults to [0x0000].
+        band_rows (int): Rows expanded per SPI write.
+    """
+    def __init__(self, tft, palette=None, band_rows=8):
+        import framebuf
+        self.tft = tft
+        self.width = tft.width
+        self.height = tft.height
+        self._buf = bytearray(self.width * self.height // 2)
+        self.fb = framebuf.FrameBuffer(self._buf, self.width, self.height, framebuf.GS4_HMSB)
+        self._palette = []
+        self._index = {}
+        self._lut = bytearray(1024)
+        # Two band buffers so one can be expanded while the other streams
+        self._bands = [bytearray(2 * self.width * band_rows) for _ in range(2)]
+        self._band_rows = band_rows
+        self._font = tft._font
+        self._dirty = None
+        for color in palette or (0x0000,):
+            self.color_index(color)
+        self._rebuild_lut()
+
+    # --- Palette ---
+    def color_index(self, color):
+        """
+        Return the palette slot for an RGB565 color, allocating one if needed.
+
+        Raises:
+            ValueError: When all 16 slots are taken by other colors.
+        """
+        index = self._index.get(color)
+        if index is None:
+            if len(self._palette) >= 16:
+                raise ValueError("palette full")
+            index = len(self._palette)
+            self._palette.append(color)
+            self._index[color] = index
+            self._set_lut(index)
+        return index
+
+    def set_palette(self, index, color):
+        """Recolor one palette slot; every pixel using it changes on the next show()."""
+        while len(self._palette) <= index:
+            self._palette.append(0)
+        old = self._palette[index]
+        if self._index.get(old) == index:
+            del self._index[old]
+        self._palette[index] = color
+        self._index[color] = index
+        self._set_lut(index)
+        self.invalidate()
+
+    def _rebuild_lut(self):
+        for index in range(len(self._palette)):
+            self._set_lut(index)
+
+    def _set_lut(self, index):
+        # LUT entry b holds the two big-endian RGB565 pixels of byte b
+        color = self._palette[index]
+        hi = (color >> 8) & 0xFF
+        lo = color & 0xFF
+        lut = self._lut
+        for other in range(16):
+            p = ((index << 4) | other) << 2
+            lut[p] = hi
+            lut[p + 1] = lo
+            p = ((other << 4) | index) << 2
+            lut[p + 2] = hi
+            lut[p + 3] = lo
+
+    # --- Damage ---
+    def _touch(self, x, y, w, h):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        d = self._dirty
+        if d is None:
+            self._dirty = [x0, y0, x1, y1]
+        else:
+            d[0] = min(d[0], x0)
+            d[1] = min(d[1], y0)
+            d[2] = max(d[2], x1)
+            d[3] = max(d[3], y1)
+
+    def invalidate(self):
+        """Mark the whole canvas for the next show()."""
+        self._dirty = [0, 0, self.width, self.height]
+
+    # --- Drawing ---
+    def set_font(self, font):
+        self._font = font
+
+    def fill(self, color):
+        self.fb.fill(self.color_index(color))
+        self.invalidate()
+
+    def erase(self):
+        self.fill(0x0000)
+
+    def pixel(self, x, y, color):
+        self.fb.pixel(x, y, self.color_index(color))
+        self._touch(x, y, 1, 1)
+
+    def fill_rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return
+        self.fb.fill_rect(x, y, w, h, self.color_index(color))
+        self._touch(x, y, w, h)
+
+    def hline(self, x, y, w, color):
+        self.fill_rect(x, y, w, 1, color)
+
+    def vline(self, x, y, h, color):
+        self.fill_rect(x, y, 1, h, color)
+
+    def rect(self, x, y, w, h, color):
+        if w <= 0 or h <= 0:
+            return
+        self.hline(x, y, w, color)
+        self.hline(x, y + h - 1, w, color)
+        self.vline(x, y, h, color)
+        self.vline(x + w - 1, y, h, color)
+
+    def line(self, x0, y0, x1, y1, color):
+        for x, y, w, h in _line_runs(x0, y0, x1, y1):
+            self.fill_rect(x, y, w, h, color)
+
+    def circle(self, x0, y0, r, color):
+        if r < 0:
+            return
+        for dx, dy, w, h in _circle_rects(r, False):
+            self.fill_rect(x0 + dx, y0 + dy, w, h, color)
+
+    def fill_circle(self, x0, y0, r, color):
+        if r < 0:
+            return
+        for dx, dy, w, h in _circle_rects(r, True):
+            self.fill_rect(x0 + dx, y0 + dy, w, h, color)
+
+    def text(self, s, x, y, color, bg=None, spacing=1):
+        """Draw text into the canvas; arguments and return value match :meth:`TFTBase.text`."""
+        font = self._font
+        font_height = font.height()
+        fb = self.fb
+        fg = self.color_index(color)
+        for i, line in enumerate(s.split("\n")):
+            if i:
+                y += font_height + 2
+            if bg is not None and line:
+                w = 1 - spacing
+                for ch in line:
+                    w += font.get_ch(ch)[1] + spacing
+                self.fill_rect(x, y, w, font_height + 1, bg)
+            cx = x
+            for ch in line:
+                runs, char_width = _glyph_runs(font, ch)
+                for k in range(0, len(runs), 4):
+                    fb.fill_rect(cx + runs[k], y + runs[k + 1], runs[k + 2], runs[k + 3], fg)
+                cx += char_width + spacing
+            self._touch(x, y, cx - x + 1, font_height + 1)
+        return y + font_height + 2
+
+    # --- Output ---
+    def show(self, rect=None):
+        """
+        Expand and stream a region to the panel.
+
+        With no rect, the area drawn since the last show() is sent (nothing
+        if the canvas is clean). The region is widened to even x so whole
+        bytes are expanded, and goes out under one window.
+        """
+        if rect is None:
+            if self._dirty is None:
+                return
+            x0, y0, x1, y1 = self._dirty
+        else:
+            x0 = max(rect[0], 0)
+            y0 = max(rect[1], 0)
+            x1 = min(rect[0] + rect[2], self.width)
+            y1 = min(rect[1] + rect[3], self.height)
+            if x0 >= x1 or y0 >= y1:
+                return
+        self._dirty = None
+        x0 &= ~1
+        x1 += x1 & 1
+        nbytes = (x1 - x0) >> 1
+        row_bytes = self.width >> 1
+        stride = 4 * nbytes
+        tft = self.tft
+        src = memoryview(self._buf)
+        lut = self._lut
+        bands = self._bands
+        rows = len(bands[0]) // stride
+        which = 0
+
+        tft.begin()
+        try:
+            tft._set_window(x0, y0, x1 - 1, y1 - 1)
+            y = y0
+            while y < y1:
+                n = min(rows, y1 - y)
+                band = bands[which]
+                which ^= 1
+                bandmv = memoryview(band)
+                d = 0
+                for row in range(y, y + n):
+                    s = row * row_bytes + (x0 >> 1)
+                    expand_gs4(src[s:s + nbytes], lut, bandmv[d:])
+                    d += stride
+                tft._pixels(memoryview(band)[:d])
+                y += n
+        finally:
+            tft.end()
 
 
 class ILI9341(TFTBase):
@@ -535,12 +1698,13 @@ class ILI9341(TFTBase):
     :param rotation: Display rotation (0-3, default 0)
     :param bgr: Use BGR color order if True, RGB if False (default True)
     :param invert: Enable display inversion if True (default False)
+    :param stream: Optional pixel streaming backend (default blocking spi.write)
     """
     def __init__(self, spi, cs, dc, rst=None, bl=None,
-                 rotation=0, bgr=True, invert=False):
+                 rotation=0, bgr=True, invert=False, stream=None):
         super().__init__(spi, cs, dc, rst=rst, bl=bl,
                          width=240, height=320,
-                         rotation=rotation, bgr=bgr, invert=invert)
+                         rotation=rotation, bgr=bgr, invert=invert, stream=stream)
 
     def init(self):
         # Common reset / sleep out / colmod / madctl / disp on
@@ -572,10 +1736,10 @@ class ST7796S(TFTBase):
     Usage is identical to ILI9341 once initialized.
     """
     def __init__(self, spi, cs, dc, rst=None, bl=None,
-                 rotation=0, bgr=True, invert=False):
+                 rotation=0, bgr=True, invert=False, stream=None):
         super().__init__(spi, cs, dc, rst=rst, bl=bl,
                          width=320, height=480,
-                         rotation=rotation, bgr=bgr, invert=invert)
+                         rotation=rotation, bgr=bgr, invert=invert, stream=stream)
 
     def init(self):
         # ST7796S often expects a command-set control unlock sequence (F0).
@@ -609,3 +1773,137 @@ class ST7796S(TFTBase):
 
         if self.bl is not None:
             self.bl(1)
+
+
+_RGB666_LUT = None
+
+
+def _rgb666_lut():
+    # 1 KB of tables for RGB565 -> RGB666, indexed by the high byte (red,
+    # upper green bits) and the low byte (lower green bits, blue). Each
+    # 5/6-bit channel is widened to the top 6 bits of its output byte.
+    global _RGB666_LUT
+    if _RGB666_LUT is None:
+        lut = bytearray(1024)
+        for v in range(256):
+            r = v >> 3
+            lut[v] = (r << 3) | (r >> 2)
+            lut[256 + v] = (v & 0x07) << 5
+            lut[512 + v] = (v >> 3) & 0x1C
+            b = v & 0x1F
+            lut[768 + v] = (b << 3) | (b >> 2)
+        _RGB666_LUT = lut
+    return _RGB666_LUT
+
+
+class ILI9488(TFTBase):
+    """
+    Driver for ILI9488 TFT displays (320x480).
+
+    Over SPI the ILI9488 only accepts 18-bit pixels (3 bytes, RGB666). The
+    drawing API still takes RGB565 colors and images: every pixel payload is
+    converted on the way out through small lookup tables into two reused
+    conversion buffers, so an image is never copied in full. Solid fills
+    expand their color once and replicate the 3-byte pattern.
+
+    Parameters are the same as :class:`ILI9341`.
+    """
+    _colmod = _COLMOD_18BIT
+
+    def __init__(self, spi, cs, dc, rst=None, bl=None,
+                 rotation=0, bgr=True, invert=False, stream=None):
+        super().__init__(spi, cs, dc, rst=rst, bl=bl,
+                         width=320, height=480,
+                         rotation=rotation, bgr=bgr, invert=invert, stream=stream)
+        self._lut = _rgb666_lut()
+        self._fill666 = bytearray(3 * _RGB666_PIXELS)
+        self._fill666mv = memoryview(self._fill666)
+        # Convert into one buffer while the other may still be in flight
+        self._conv = (bytearray(3 * _RGB666_PIXELS), bytearray(3 * _RGB666_PIXELS))
+        self._conv_which = 0
+
+    def init(self):
+        self.reset()
+        self._cmd(_SWRESET)
+        time.sleep_ms(120)
+        for c, data in (
+                (0xE0, b"\x00\x03\x09\x08\x16\x0A\x3F\x78\x4C\x09\x0A\x08\x16\x1A\x0F"),  # positive gamma
+                (0xE1, b"\x00\x16\x19\x03\x0F\x05\x32\x45\x46\x04\x0E\x0D\x35\x37\x0F"),  # negative gamma
+                (0xC0, b"\x17\x15"),              # power control 1
+                (0xC1, b"\x41"),                  # power control 2
+                (0xC5, b"\x00\x12\x80"),          # VCOM control
+                (0xB0, b"\x00"),                  # interface mode: SDO used
+                (0xB1, b"\xA0"),                  # frame rate 60 Hz
+                (0xB4, b"\x02"),                  # 2-dot inversion
+                (0xB6, b"\x02\x02\x3B"),          # display function control
+                (0xE9, b"\x00"),                  # disable 24-bit data bus
+                (0xF7, b"\xA9\x51\x2C\x82")):      # adjust control 3
+            self._cmd_data(c, data)
+
+        self._cmd(_SLPOUT)
+        time.sleep_ms(120)
+        self._cmd_data(_COLMOD, bytes([_COLMOD_18BIT]))
+        self._apply_madctl()
+        self._cmd(_INVON if self._invert else _INVOFF)
+        self._cmd(_DISPON)
+        time.sleep_ms(50)
+        if self.bl is not None:
+            self.bl(1)
+
+    # --- RGB666 pixel path ---
+    def _pixels(self, buf):
+        # Convert an RGB565 payload in buffer-sized pieces and stream each one
+        n = len(buf) >> 1
+        src = memoryview(buf)
+        lut = self._lut
+        conv = self._conv
+        s = 0
+        while n > 0:
+            k = _RGB666_PIXELS if n > _RGB666_PIXELS else n
+            out = conv[self._conv_which]
+            self._conv_which ^= 1
+            # The stream waits for the write before last, which used this buffer
+            rgb565_to_666(src[s:], lut, out, k)
+            self._data(out if k == _RGB666_PIXELS else memoryview(out)[:3 * k])
+            s += 2 * k
+            n -= k
+
+    def _prep_color(self, color):
+        # Expand the color once and replicate the 3-byte pattern
+        if color == self._chunk_color:
+            return
+        self._stream.wait()
+        lut = self._lut
+        hi = (color >> 8) & 0xFF
+        lo = color & 0xFF
+        buf = self._fill666
+        buf[0] = lut[hi]
+        buf[1] = lut[256 + hi] | lut[512 + lo]
+        buf[2] = lut[768 + lo]
+        n = 3
+        size = len(buf)
+        while n < size:
+            k = n if n < size - n else size - n
+            buf[n:n + k] = buf[:k]
+            n += k
+        self._chunk_color = color
+
+    def _stream_fill(self, total):
+        # Send `total` pixels of the prepared color; the same buffer is
+        # resent, so it never changes while in flight
+        self.dc(1)
+        self._select()
+        mv = self._fill666mv
+        size = len(mv)
+        nbytes = 3 * total
+        write = self._stream.write
+        count = 0
+        while nbytes >= size:
+            write(mv)
+            nbytes -= size
+            count += 1
+        if nbytes > 0:
+            write(mv[:nbytes])
+            count += 1
+        self.spi_writes += count
+        self._deselect()
@@ -0,0 +1,195 @@
+# tft_spi_bench.py
+# Rendering benchmarks for TFTBase displays
+#
+# Each benchmark is run a number of times and reported as one JSON object
+# per line, so runs can be saved and compared over time:
+#
+#   {"bench": "fill_rect_32x32", "driver": "ILI9341", "runs": 20,
+#    "median_us": 812, "p95_us": 840, "min_us": 801,
+#    "cs_cycles": 1, "spi_writes": 6, "windows": 1, ...}
+#
+# Times come from time.ticks_us. cs_cycles/spi_writes/windows are the
+# driver's own counters for a single run. On Linux, utils/tft_bench.py runs
+# the same suite against the emulated panel and adds the bytes and
+# commands seen on the bus.
+#
+# Usage on the device:
+#     import drivers.tft_spi_bench as bench
+#     bench.run(tft)                       # all benchmarks
+#     bench.run(tft, only="text")          # names containing "text"
+
+import json
+import time
+
+import fonts.tt7
+import fonts.tt14
+import fonts.tt24
+import fonts.tt32
+
+FORECAST_JSON = "docs/example_forecast.json"
+
+_TEXT = "Alpine 3 - Considerable"
+
+
+def _sprite(w, h, key):
+    # Diagonal stripes of two colors with key-colored holes
+    data = bytearray(2 * w * h)
+    for y in range(h):
+        for x in range(w):
+            c = key if (x + y) % 7 == 0 else (0xF800 if (x // 4 + y // 4) & 1 else 0x07E0)
+            i = 2 * (y * w + x)
+            data[i] = c >> 8
+            data[i + 1] = c & 0xFF
+    return data
+
+
+def _load_forecast(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except OSError:
+        return None
+
+
+def _plain(html):
+    # Forecast text fields are HTML; keep the text between the tags
+    out = []
+    start = 0
+    while True:
+        lt = html.find("<", start)
+        if lt < 0:
+            out.append(html[start:])
+            break
+        out.append(html[start:lt])
+        gt = html.find(">", lt)
+        if gt < 0:
+            break
+        if html[lt:gt + 1] == "</p>":
+            out.append(" ")
+        start = gt + 1
+    return "".join(out).strip()
+
+
+def _forecast_case(tft, data):
+    from forecast import AvalancheForecast
+
+    def draw():
+        # A fresh scene repaints the whole screen every run
+        forecast = AvalancheForecast(tft)
+        forecast.cache_path = None
+        forecast.display_forecast(data, 10)
+    return draw
+
+
+def cases(tft, forecast_path=FORECAST_JSON):
+    """
+    Build the benchmark list for a display.
+
+    Returns:
+        list: (name, callable) pairs; the callables take no arguments.
+    """
+    out = [
+        ("fill", lambda: tft.fill(0x001F)),
+        ("erase", tft.erase),
+    ]
+    for w, h in ((8, 8), (32, 32), (100, 16), (tft.width, 100)):
+        out.append(("fill_rect_%dx%d" % (w, h),
+                    lambda w=w, h=h: tft.fill_rect(10 if w < tft.width else 0, 10, w, h, 0xFFFF)))
+
+    for font in (fonts.tt7, fonts.tt14, fonts.tt24, fonts.tt32):
+        name = font.__name__.split(".")[-1]
+
+        def opaque(font=font):
+            tft.set_font(font)
+            tft.text(_TEXT, 2, 40, 0x0000, bg=0xFFE0)
+
+        def transparent(font=font):
+            tft.set_font(font)
+            tft.text(_TEXT, 2, 40, 0xFFFF)
+        out.append(("text_%s_opaque" % name, opaque))
+        out.append(("text_%s_transparent" % name, transparent))
+
+    sprite = _sprite(32, 32, 0x0000)
+    out.append(("blit_rgb565_32x32", lambda: tft.blit_rgb565(50, 50, 32, 32, sprite)))
+    out.append(("blit_rgb565_32x32_key", lambda: tft.blit_rgb565(50, 50, 32, 32, sprite, key=0x0000)))
+    out.append(("line_diagonal", lambda: tft.line(0, 0, tft.width - 1, tft.height - 1, 0xF800)))
+    out.append(("line_shallow", lambda: tft.line(0, 100, tft.width - 1, 140, 0x07E0)))
+    out.append(("circle_r40", lambda: tft.circle(tft.width // 2, tft.height // 2, 40, 0xFFFF)))
+    out.append(("fill_circle_r40", lambda: tft.fill_circle(tft.width // 2, tft.height // 2, 40, 0xF81F)))
+
+    data = _load_forecast(forecast_path)
+    if data is not None:
+        out.append(("display_forecast", _forecast_case(tft, data)))
+        highlights = _plain(data["report"]["highlights"])
+
+        def text_box():
+            tft.set_font(fonts.tt7)
+            tft.text_box(highlights, (10, 10, tft.width - 20, 100), 0xFFFF, bg=0x0000)
+        out.append(("text_box_highlights", text_box))
+    return out
+
+
+def _percentile(values, p):
+    # values must be sorted
+    return values[min(len(values) - 1, int(p * (len(values) - 1) + 0.5))]
+
+
+def run(tft, repeat=20, only=None, measure=None, out=None, forecast_path=FORECAST_JSON):
+    """
+    Run the benchmarks and emit one JSON line per benchmark.
+
+    Parameters:
+        tft (TFTBase): Display to draw on.
+        repeat (int): Timed runs per benchmark (after one warm-up run).
+        only (str or None): Only run benchmarks whose name contains this.
+        measure: Optional object with ``reset_stats()`` and ``stats()``;
+            the dict from the last run's ``stats()`` is merged into the
+            result (the host emulator uses this for bus bytes).
+        out: Object with ``write``; defaults to printing.
+        forecast_path (str): Forecast JSON for the display_forecast and
+            text_box_highlights benchmarks; skipped if the file does not exist.
+
+    Returns:
+        list: The result dicts.
+    """
+    results = []
+    driver = type(tft).__name__
+    font = tft._font
+    for name, fn in cases(tft, forecast_path):
+        if only is not None and only not in name:
+            continue
+        fn()  # warm caches and allocations
+        times = []
+        for _ in range(repeat):
+            tft.reset_counters()
+            if measure is not None:
+                measure.reset_stats()
+            t0 = time.ticks_us()
+            fn()
+            times.append(time.ticks_diff(time.ticks_us(), t0))
+        times.sort()
+        result = {
+            "bench": name,
+            "driver": driver,
+            "runs": repeat,
+            "median_us": _percentile(times, 0.5),
+            "p95_us": _percentile(times, 0.95),
+            "min_us": times[0],
+        }
+        result.update(tft.counters())
+        if measure is not None:
+            for k, v in measure.stats().items():
+                result["bus_" + k] = v
+        line = json.dumps(result)
+        if out is None:
+            print(line)
+        else:
+            out.write(line + "\n")
+        results.append(result)
+    tft.set_font(font)
+    return results
+
+
+if __name__ == "__main__":
+    import display
+    run(display.initialize())
@@ -0,0 +1,125 @@
+# viewport.py
+# Hardware-scrolled text viewport for TFTBase displays
+#
+# TextViewport shows a window of text lines inside a TFTBase hardware scroll
+# region. Moving by one line rewrites the VSCRSADD register and draws only
+# the line that scrolled into view; the rest of the panel is untouched.
+#
+# Usage:
+#     view = TextViewport(tft, 40, 200, WHITE, font=fonts.tt7)
+#     view.set_lines(["first", "second", ...])
+#     view.scroll_down()
+#     view.append("another line")
+#     view.close()
+
+
+class TextViewport:
+    """
+    Scrollable list of text lines backed by hardware vertical scrolling.
+
+    The region spans the full display width and is rounded down to a whole
+    number of lines, so a line never straddles the GRAM wrap-around.
+
+    Parameters:
+        tft (TFTBase): Display in rotation 0 or 2.
+        top (int): First logical row of the viewport.
+        height (int): Available height in pixels.
+        fg, bg (int): RGB565 text and background colors.
+        font: Font module; defaults to the display's current font.
+        x (int): Left margin of the text.
+        line_gap (int): Extra pixels between lines.
+        max_lines (int or None): Oldest lines are dropped beyond this count.
+    """
+    def __init__(self, tft, top, height, fg, bg=0x0000, font=None, x=2, line_gap=2,
+                 max_lines=None):
+        self.tft = tft
+        self.font = tft._font if font is None else font
+        self.fg = fg
+        self.bg = bg
+        self.x = x
+        self.line_height = self.font.height() + line_gap
+        self.rows = height // self.line_height
+        if self.rows < 1:
+            raise ValueError("viewport too small for one line")
+        self.top = top
+        self.height = self.rows * self.line_height
+        self.max_lines = max_lines
+        self._lines = []
+        self._first = 0
+        tft.set_scroll_area(top, self.height)
+        tft.fill_rect(0, top, tft.width, self.height, bg)
+
+    def _draw(self, row, s):
+        # Paint one viewport row at whatever GRAM rows currently show it
+        tft = self.tft
+        y = tft.scroll_row(row * self.line_height)
+        tft.begin()
+        # Keep long or tall text inside its row
+        tft.push_clip(0, y, tft.width, self.line_height)
+        font = tft._font
+        try:
+            tft.fill_rect(0, y, tft.width, self.line_height, self.bg)
+            if s:
+                tft.set_font(self.font)
+                tft.text(s, self.x, y, self.fg)
+        finally:
+            tft.set_font(font)
+            tft.pop_clip()
+            tft.end()
+
+    def _scroll_lines(self, n):
+        self.tft.scroll_to(self.tft._scroll_offset + n * self.line_height)
+
+    def set_lines(self, lines):
+        """Replace the content and show it from the first line."""
+        self._lines = list(lines)
+        self._first = 0
+        self.tft.scroll_to(0)
+        for row in range(self.rows):
+            self._draw(row, self._lines[row] if row < len(self._lines) else "")
+
+    def append(self, s):
+        """
+        Add a line at the end. If the view was showing the last line it
+        scrolls to keep following the tail.
+        """
+        lines = self._lines
+        following = self._first + self.rows >= len(lines)
+        lines.append(s)
+        if self.max_lines is not None and len(lines) > self.max_lines:
+            lines.pop(0)
+            if self._first > 0:
+                self._first -= 1
+            else:
+                # The top visible line was dropped; redraw what is shown
+                self.set_lines(lines)
+                return
+        if len(lines) <= self.rows:
+            self._draw(len(lines) - 1, s)
+        elif following:
+            self.scroll_down()
+
+    def scroll_down(self):
+        """Reveal the next line at the bottom. Returns False at the end."""
+        if self._first + self.rows >= len(self._lines):
+            return False
+        self._first += 1
+        self._scroll_lines(1)
+        self._draw(self.rows - 1, self._lines[self._first + self.rows - 1])
+        return True
+
+    def scroll_up(self):
+        """Reveal the previous line at the top. Returns False at the start."""
+        if self._first == 0:
+            return False
+        self._first -= 1
+        self._scroll_lines(-1)
+        self._draw(0, self._lines[self._first])
+        return True
+
+    def clear(self):
+        self.set_lines([])
+
+    def close(self):
+        """Restore an unscrolled panel; the caller should redraw the viewport area."""
+        self.tft.reset_scroll()
@@ -1,10 +1,21 @@
 import colors
 import fonts.tt7, fonts.tt14
+from drivers.displaylist import DisplayList
+from drivers.scene import Scene
+
+# Flash copy of the last laid-out forecast, replayed when no fresh data can be fetched
+_CACHE_PATH = "forecast.dl"
 
 class AvalancheForecast:
-    ...
+    # Where display_forecast() caches its display list; None disables caching
+    cache_path = _CACHE_PATH
+
     def __init__(self, tft) -> None:
         self.tft = tft
+        self.scene = Scene(tft)
+        self.display_list = None
+        # The list cache_path holds, once known, so unchanged layouts are not rewritten
+        self._cached = None
 
     def get_forecast(self, lat: float, long: float) -> dict:
         """
@@ -28,13 +39,38 @@ class AvalancheForecast:
             response.close()
             raise Exception(f"Failed to fetch forecast data: HTTP {response.status_code}")
 
-    def _display_day_forecast(self, today: dict, y: int) -> int:
+    def _display_rating_row(self, scene, day: int, band: str, label: str, label_color: int,
+                            today: dict, y: int) -> None:
         """
-        Render the forecast date and three danger-rating rows (Alpine, Treeline, Below
-        Treeline) onto the provided TFT display and return the next vertical drawing position.
+        Add the label cell and danger-rating cell for one elevation band to the scene.
 
         Parameters:
-            tft: TFT display instance used for drawing (must support text, set_font, fill_rect).
+            scene (Scene): Scene the cells are added to.
+            day (int): Index of the forecast day, used to build stable item ids.
+            band (str): Elevation band key ('alp', 'tln' or 'btl').
+            label (str): Text shown in the label cell.
+            label_color (int): RGB565 background color of the label cell.
+            today (dict): Forecast data for a single day.
+            y (int): Top of the row in pixels.
+        """
+        item = "d%d.%s." % (day, band)
+        rating = today['ratings'][band]['rating']['value']
+        bg_color = colors.DANGER_BG_COLORS.get(rating, colors.GRAY)
+        fg_color = colors.DANGER_FG_COLORS.get(rating, colors.BLACK)
+        scene.rect(item + "label_bg", 10, y, 100, 16, label_color)
+        scene.text(item + "label", label, 14, y + 4, colors.BLACK, font=fonts.tt7)
+        scene.rect(item + "rating_bg", 112, y, 100, 16, bg_color)
+        scene.text(item + "rating", today['ratings'][band]['rating']['display'], 116, y + 4,
+                   fg_color, font=fonts.tt7)
+
+    def _display_day_forecast(self, scene, day: int, today: dict, y: int) -> int:
+        """
+        Lay out the forecast date and three danger-rating rows (Alpine, Treeline, Below
+        Treeline) in the scene and return the next vertical drawing position.
+
+        Parameters:
+            scene (Scene): Scene the date and rows are added to.
+            day (int): Index of the forecast day, used to build stable item ids.
             today (dict): Forecast data for a single day; expected to contain 'date'->'display'
             and 'ratings'->{'alp','tln','btl'} with each having 'rating'->{'value','display'}.
             y (int): Starting vertical pixel coordinate for rendering.
@@ -42,49 +78,135 @@ class AvalancheForecast:
         Returns:
             int: The vertical pixel coordinate to continue drawing after this block.
         """
-        self.tft.set_font(fonts.tt14)
-        self.tft.text(today['date']['display'], 10, y, colors.GRAY)
-        self.tft.set_font(fonts.tt7)
+        scene.text("d%d.date" % day, today['date']['display'], 10, y, colors.GRAY,
+                   font=fonts.tt14)
 
         y = y + 18
-        rating = today['ratings']['alp']['rating']['value']
-        bg_color = colors.DANGER_BG_COLORS.get(rating, colors.GRAY)
-        fg_color = colors.DANGER_FG_COLORS.get(rating, colors.BLACK)
-        self.tft.fill_rect(10, y, 100, 16, colors.ALP)
-        self.tft.text("Alpine", 14, y + 4, colors.BLACK)
-        self.tft.fill_rect(112, y, 100, 16, bg_color)
-        self.tft.text(today['ratings']['alp']['rating']['display'], 116,  y + 4, fg_color)
+        self._display_rating_row(scene, day, 'alp', "Alpine", colors.ALP, today, y)
         y = y + 18
-        rating = today['ratings']['tln']['rating']['value']
-        bg_color = colors.DANGER_BG_COLORS.get(rating, colors.GRAY)
-        fg_color = colors.DANGER_FG_COLORS.get(rating, colors.BLACK)
-        self.tft.fill_rect(10, y, 100, 16, colors.TLN)
-        self.tft.text("Treeline", 14, y + 4, colors.BLACK)
-        self.tft.fill_rect(112, y, 100, 16, bg_color)
-        self.tft.text(today['ratings']['tln']['rating']['display'], 116,  y + 4, fg_color)
-
+        self._display_rating_row(scene, day, 'tln', "Treeline", colors.TLN, today, y)
         y = y + 18
-        rating = today['ratings']['btl']['rating']['value']
-        bg_color = colors.DANGER_BG_COLORS.get(rating, colors.GRAY)
-        fg_color = colors.DANGER_FG_COLORS.get(rating, colors.BLACK)
-        self.tft.fill_rect(10, y, 100, 16, colors.BTL)
-        self.tft.text("Below Treeline", 14, y + 4, colors.BLACK)
-        self.tft.fill_rect(112, y, 100, 16, bg_color)
-        self.tft.text(today['ratings']['btl']['rating']['display'], 116,  y + 4, fg_color)
+        self._display_rating_row(scene, day, 'btl', "Below Treeline", colors.BTL, today, y)
         return y + 24
 
     def display_forecast(self, data: dict, y: int) -> int:
         """
-        Render the full avalanche forecast onto the provided TFT display and return the next
+        Render the full avalanche forecast onto the TFT display and return the next
         vertical drawing position.
+
+        The layout is kept in a retained scene, so a later call only repaints the cells
+        whose content changed (the first call repaints the whole screen);
+        scene.last_pixels and scene.last_damage describe the last repaint.
+
+        Parameters:
+            data (dict): Full forecast data as returned by get_forecast().
+            y (int): Starting vertical pixel coordinate for rendering.
+        Returns:
+            int: The vertical pixel coordinate to continue drawing after this block.
+        """
+        y = self._layout(self.scene, data, y)
+        self.scene.commit()
+        self.display_list = self._record(self.scene)
+        self.save_cache()
+        return y
+
+    async def display_forecast_async(self, atft, data: dict, y: int) -> int:
+        """
+        Same as display_forecast(), but the repaint yields to other uasyncio tasks
+        after every band.
+
         Parameters:
-            tft: TFT display instance used for drawing (must support text, set_font, fill_rect).
+            atft (AsyncTFT): Async wrapper of this forecast's display.
             data (dict): Full forecast data as returned by get_forecast().
             y (int): Starting vertical pixel coordinate for rendering.
         Returns:
             int: The vertical pixel coordinate to continue drawing after this block.
         """
-        for danger_rating in data['report']['dangerRatings']:
+        y = self._layout(self.scene, data, y)
+        await atft.commit(self.scene)
+        self.display_list = self._record(self.scene)
+        self.save_cache()
+        return y
+
+    def layout_forecast(self, data: dict, y: int) -> tuple:
+        """
+        Lay out the forecast without drawing anything, e.g. for a render worker
+        on the other core to draw.
+
+        The layout goes into a new scene and a new display list on every call;
+        neither self.scene nor a display list that was handed out is changed, so
+        the worker can draw while the next forecast is laid out. Nothing is
+        written to flash either; call save_cache() once the worker is idle.
+
+        Parameters:
+            data (dict): Full forecast data as returned by get_forecast().
+            y (int): Starting vertical pixel coordinate for rendering.
+        Returns:
+            tuple: (DisplayList, next vertical pixel coordinate).
+        """
+        # Items only: a scene that is never committed allocates no strips
+        scene = Scene(self.tft, bg=self.scene.bg)
+        y = self._layout(scene, data, y)
+        self.display_list = self._record(scene)
+        return self.display_list, y
+
+    def _layout(self, scene, data: dict, y: int) -> int:
+        # Replace the scene's items with the layout of `data`
+        scene.clear()
+        for day, danger_rating in enumerate(data['report']['dangerRatings']):
             print("Danger rating:", danger_rating)
-            y = self._display_day_forecast(danger_rating, y)
+            y = self._display_day_forecast(scene, day, danger_rating, y)
         return y
+
+    def _record(self, scene) -> DisplayList:
+        # Keep the finished layout as a display list so redraws skip the layout
+        dl = DisplayList()
+        dl.fill(scene.bg)
+        scene.record(dl)
+        return dl
+
+    def save_cache(self) -> None:
+        """
+        Write the last laid-out display list to flash for redraw() after a reboot.
+
+        Nothing is written when the cached list is the same, e.g. when a refresh
+        brought no new forecast. Flash writes stall code running from flash on both
+        cores, so with a render worker call this only while the worker is idle.
+        """
+        dl = self.display_list
+        if dl is None or not self.cache_path:
+            return
+        if self._cached is None:
+            try:
+                self._cached = DisplayList.load(self.cache_path)
+            except (OSError, ValueError):
+                pass
+        if dl == self._cached:
+            return
+        try:
+            dl.save(self.cache_path)
+            self._cached = dl
+        except OSError as e:
+            print("Could not cache forecast:", e)
+
+    def redraw(self) -> bool:
+        """
+        Repaint the last forecast by replaying its display list, without any layout work.
+
+        If no forecast was laid out since boot, the list cached in flash is used.
+
+        Returns:
+            bool: False if there was no forecast to show.
+        """
+        dl = self.display_list
+        if dl is None:
+            if not self.cache_path:
+                return False
+            try:
+                dl = DisplayList.load(self.cache_path)
+            except (OSError, ValueError):
+                return False
+            self.display_list = dl
+            self._cached = dl
+        self.scene.replay(dl)
+        return True
@@ -4,34 +4,55 @@ import fonts.tt7
 import ntptime
 import os
 import pins
+import time
+import uasyncio as asyncio
 import wifi
 
+from drivers.console import Console
 from drivers.xpt2046 import Touch
 from forecast import AvalancheForecast
 from machine import Pin, RTC, SPI
 from secrets import SSID, PASSWORD
 
+# Print a per-call SPI profile (see drivers/tft_profile.py) and the repainted area
+# of each forecast refresh
+PROFILE = False
+
+# Opt in to the uasyncio event loop, so touch and NTP keep running during
+# repaints; run() stays the default
+USE_ASYNC = False
+
+# Draw on core 1 with a RenderWorker (drivers/render_worker.py); takes precedence
+# over USE_ASYNC
+USE_WORKER = False
+
+# With USE_WORKER, compare touch polling gaps during repaints with and without the
+# worker before entering the event loop
+MEASURE_TOUCH_LATENCY = False
+
 class AvalancheForecastApplication:
     def __init__(self):
-        print(os.uname()) # type: ignore
         self.tft = display.initialize()
 
+        # Boot messages scroll on the panel until the forecast is shown
+        self.console = Console(self.tft, fg=colors.GREEN, font=fonts.tt7)
+        self.console.attach()
+        self._log(os.uname()) # type: ignore
+
         self.y = 10 # Initial vertical position for drawing
 
-        print("Initializing Touch...")
+        self._log("Initializing Touch...")
         self.spi2 = SPI(1, baudrate=1000000, sck=Pin(pins.TOUCH_CLK_PIN), mosi=Pin(pins.TOUCH_MOSI_PIN), miso=Pin(pins.TOUCH_MISO_PIN))
         # The Pico Breadboard Kit does not have the interrupt pin connected, so we
         # won't use it here, instead we will poll for touches
         self.touch = Touch(self.spi2, cs=Pin(pins.TOUCH_CS_PIN))# , int_pin=Pin(pins.TOUCH_INT_PIN)), int_handler=touchscreen_press)
 
-        print("Connecting to WiFi...")
-        self.y = self.tft.text("Connecting to WiFi...", 10, self.y, colors.GREEN)
+        self._log("Connecting to WiFi...")
 
         wlan = wifi.connect(SSID, PASSWORD, timeout_s=20, country="CA", verbose=True)
 
         # Setting device time
-        print("Setting device time via NTP...")
-        self.y = self.tft.text("Setting device time via NTP...", 10, self.y, colors.GREEN)
+        self._log("Setting device time via NTP...")
         self._sync_time()
 
         self.rtc = RTC()
@@ -39,10 +60,25 @@ class AvalancheForecastApplication:
         # RTC returns (year, month, day, weekday, hour, minute, second, subseconds)
         t = self.rtc.datetime()
         ts = "{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d} UTC".format(t[0], t[1], t[2], t[4], t[5], t[6])
-        print(ts)
-        self.y = self.tft.text(ts, 10, self.y, colors.GREEN)
+        self._log(ts)
         self.forecast = AvalancheForecast(self.tft)
 
+    # --- Boot console ---
+    def _log(self, *args):
+        """Print a status line; it also shows on the panel while the boot console is open."""
+        print(*args)
+        console = getattr(self, "console", None)
+        if console is not None and not console.attached:
+            # No os.dupterm() on this port
+            print(*args, file=console)
+
+    def _close_console(self):
+        # Give the whole panel back to the forecast
+        console = getattr(self, "console", None)
+        if console is not None:
+            console.close()
+            self.console = None
+
     # --- NTP sync ---
     def _sync_time(self):
         """Synchronize the device's RTC with an NTP server."""
@@ -56,61 +92,226 @@ class AvalancheForecastApplication:
         x = (display.SCR_WIDTH - 1) - x
         print(f"Touch at x={x}, y={y}")
 
-    def get_forecast(self):
+    def _fetch_forecast(self) -> bool:
+        """
+        Fetch the forecast into self.data. If fetching fails but a cached forecast
+        exists, show that instead and return False.
+        """
         # Fetch avalanche forecast data from the Avalanche Canada API
-        print("Getting Avalanche Forecast...")
-        self.y = self.tft.text("Getting Avalanche Forecast...", 10, self.y, colors.GREEN)
+        self._log("Getting Avalanche Forecast...")
 
-        self.data = self.forecast.get_forecast(49.516324, -115.068756)  # Example: Fernie, BC
-        self.tft.erase()
+        try:
+            self.data = self.forecast.get_forecast(49.516324, -115.068756)  # Example: Fernie, BC
+        except Exception as e:
+            # Fall back to the forecast cached in flash, if any
+            self._close_console()
+            if not self.forecast.redraw():
+                raise
+            print("Showing cached forecast:", e)
+            return False
 
-        print("Parsing forecast data...")
+        self._log("Parsing forecast data...")
         self.title = self.data['report']['title']
+        self._close_console()
         # display.set_font(tt14)
         # display.set_color(color565(0, 255, 255), color565(0, 0, 0))
         # display.print(title + "\n")
+        return True
+
+    def get_forecast(self):
+        if not self._fetch_forecast():
+            return
 
         # Display danger ratings
         self.y = 10;
+        self.tft.reset_counters()
+        if PROFILE:
+            from drivers.tft_profile import Profiler
+            profiler = Profiler(self.tft)
+            profiler.enable()
         self.y = self.forecast.display_forecast(self.data, self.y)
+        if PROFILE:
+            profiler.disable()
+            profiler.dump()
+            self._print_repaint()
+        print("Forecast bus usage:", self.tft.counters())
+
+    async def get_forecast_async(self):
+        """Like get_forecast(), but the repaint yields to the other tasks."""
+        if not self._fetch_forecast():
+            return
+        self.y = 10
+        self.tft.reset_counters()
+        self.y = await self.forecast.display_forecast_async(self.atft, self.data, self.y)
+        if PROFILE:
+            self._print_repaint()
+        print("Forecast bus usage:", self.tft.counters())
+
+    def _print_repaint(self):
+        scene = self.forecast.scene
+        print("Repainted", scene.last_pixels, "pixels in", len(scene.last_damage), "regions")
+
+    def get_forecast_worker(self):
+        """
+        Like get_forecast(), but the layout is done here on core 0 and the repaint on
+        core 1 by the render worker, which owns the display from then on.
+        """
+        from drivers.render_worker import DoubleBuffer, RenderWorker, draw_latest
+        from drivers.scene import Scene
+        # The boot console draws from this core until the fetch is done, so the
+        # worker starts afterwards
+        fetched = self._fetch_forecast()
+        self.worker = RenderWorker(self.tft)
+        self.forecasts = DoubleBuffer()
+        # Only the worker paints through this scene (and its strips); display
+        # lists reach it through self.forecasts and are never changed afterwards
+        self.painter = Scene(self.tft, bg=self.forecast.scene.bg)
+        self.worker.start()
+        if not fetched:
+            return
+        self.y = 10
+        display_list, self.y = self.forecast.layout_forecast(self.data, self.y)
+        self.forecasts.publish(display_list)
+        self.worker.submit(draw_latest, self.forecasts, self.painter.replay)
+        # Write the flash cache only once the worker is done drawing
+        self.worker.wait_idle()
+        self.forecast.save_cache()
+
+    def measure_touch_latency(self, redraws=5, poll_ms=200):
+        """
+        Repaint the forecast `redraws` times while polling touch, first on this core
+        and then through the render worker, and print the longest and mean gap
+        between two polls for each.
+
+        Parameters:
+            redraws (int): Repaints per measurement.
+            poll_ms (int): Polling time after each repaint is started.
+        """
+        from drivers.render_worker import LatencyProbe
+        display_list = self.forecast.display_list
+        if display_list is None:
+            return
+        painter = self.painter
+        worker = self.worker
+        probe = LatencyProbe()
+
+        def poll(redraw):
+            probe.reset()
+            for _ in range(redraws):
+                probe.tick()
+                redraw()
+                t0 = time.ticks_ms()
+                while time.ticks_diff(time.ticks_ms(), t0) < poll_ms:
+                    probe.tick()
+                    self._check_touch()
+                worker.wait_idle()
+            return probe.stats()
+
+        # Only one core may drive the display at a time
+        worker.wait_idle()
+        inline = poll(lambda: painter.replay(display_list))
+        offloaded = poll(lambda: worker.submit(painter.replay, display_list))
+        print("Touch latency during repaints (us):")
+        print("  core 0 repaint: max {max_us} mean {mean_us} over {polls} polls".format(**inline))
+        print("  render worker:  max {max_us} mean {mean_us} over {polls} polls".format(**offloaded))
+
+    def _check_ntp(self):
+        # Re-sync occasionally to limit drift (e.g. once per hour)
+        t = self.rtc.datetime()
+        if t[5] == 0 and t[6] < 2:  # near top of the hour
+            try:
+                self._sync_time()
+                print("NTP re-sync OK")
+            except Exception as e:
+                print("NTP re-sync failed:", e)
+
+    def _check_touch(self):
+        result = self.touch.get_touch()
+        if result is not None:
+            x, y = self.touch.normalize(*result)
+            self._touchscreen_press(x, y)
+
+    def _stop_worker(self):
+        # Hand the display back to this core
+        worker = getattr(self, "worker", None)
+        if worker is not None:
+            worker.stop()
+            self.worker = None
+
+    def _shutdown(self):
+        print("\nCtrl-C pressed.  Cleaning up and exiting...")
+        self._stop_worker()
+        self._close_console()
+        if self.tft is not None:
+            self.tft.erase()
+            self.y = self.tft.text("Done.", 10, 10, colors.GREEN)
+
+    async def _touch_task(self):
+        while True:
+            self._check_touch()
+            await asyncio.sleep_ms(20)
+
+    async def _ntp_task(self):
+        while True:
+            self._check_ntp()
+            await asyncio.sleep(1)
+
+    async def run_async(self):
+        """
+        uasyncio counterpart of get_forecast() followed by run(). Touch polling and
+        the NTP check are tasks of their own and keep running while the forecast
+        repaints.
+        """
+        from drivers.tft_async import AsyncTFT
+        self.atft = AsyncTFT(self.tft)
+        print("Entering event loop.  Press Ctrl-C to exit.")
+        asyncio.create_task(self._touch_task())
+        asyncio.create_task(self._ntp_task())
+        await self.get_forecast_async()
+        while True:
+            await asyncio.sleep(3600)
 
     def run(self):
         try:
             print("Entering event loop.  Press Ctrl-C to exit.")
             while True:
-                # Re-sync occasionally to limit drift (e.g. once per hour)
-                t = self.rtc.datetime()
-                if t[5] == 0 and t[6] < 2:  # near top of the hour
-                    try:
-                        self._sync_time()
-                        print("NTP re-sync OK")
-                    except Exception as e:
-                        print("NTP re-sync failed:", e)
+                self._check_ntp()
 
                 # Check for touch events
-                result = self.touch.get_touch()
-                if result is not None:
-                    x, y = self.touch.normalize(*result)
-                    self._touchscreen_press(x, y)
+                self._check_touch()
         except KeyboardInterrupt:
-            print("\nCtrl-C pressed.  Cleaning up and exiting...")
-            if self.tft is not None:
-                self.tft.erase()
-                self.y = self.tft.text("Done.", 10, 10, colors.GREEN)
+            self._shutdown()
             return
 
     def error(self, msg: str):
         """Display an error message on the TFT display and the console."""
         print("Error:", msg)
+        self._stop_worker()
+        self._close_console()
         self.tft.erase()
         self.tft.set_font(fonts.tt7)
         self.y = self.tft.text(msg, 10, 10, colors.RED)
+        # The forecast scene no longer matches the panel
+        forecast = getattr(self, "forecast", None)
+        if forecast is not None:
+            forecast.scene.invalidate()
 
 def main():
     try:
         app = AvalancheForecastApplication()
-        app.get_forecast()
-        app.run()
+        if USE_WORKER:
+            app.get_forecast_worker()
+            if MEASURE_TOUCH_LATENCY:
+                app.measure_touch_latency()
+            app.run()
+        elif USE_ASYNC:
+            try:
+                asyncio.run(app.run_async())
+            except KeyboardInterrupt:
+                app._shutdown()
+        else:
+            app.get_forecast()
+            app.run()
     except Exception as e:
         # Handle network or parsing errors
         app.error(str(e))
@@ -0,0 +1,49 @@
+# test_band.py
+# Host tests that BandRenderer draws the same pixels as immediate TFTBase calls
+#
+# Usage:
+#     python3 -m unittest discover -s tests -t .
+
+import unittest
+
+from utils.tft_emulator import Emulator
+
+Emulator()
+
+import fonts.tt7
+import fonts.tt14
+import fonts.tt24
+from drivers.band import BandRenderer
+from drivers.tft_spi import ILI9341
+
+BG = 0x1234
+
+
+def make():
+    emu = Emulator("ili9341")
+    tft = ILI9341(emu.spi, emu.cs, emu.dc, rst=emu.rst, rotation=0)
+    tft.init()
+    tft.fill(BG)
+    return emu, tft
+
+
+class BandTextTest(unittest.TestCase):
+    def test_opaque_text_matches_immediate(self):
+        # Lines long enough to be split into several text strips
+        s = "Avalanche forecast WWW mm\nline two"
+        for font in (fonts.tt7, fonts.tt14, fonts.tt24):
+            for spacing in (0, 1, 2, 4):
+                immediate, tft = make()
+                tft.set_font(font)
+                tft.text(s, 3, 20, 0xFFFF, 0x001F, spacing)
+                banded, tft = make()
+                band = BandRenderer(tft, bg=BG)
+                band.set_font(font)
+                band.text(s, 3, 20, 0xFFFF, 0x001F, spacing)
+                band.render()
+                self.assertTrue(immediate.panel.gram == banded.panel.gram,
+                                (font.__name__, spacing))
+
+
+if __name__ == "__main__":
+    unittest.main()
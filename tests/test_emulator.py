@@ -0,0 +1,172 @@
+# test_emulator.py
+# Draws a fixed scene on every emulated controller and checks GRAM and bus traffic
+#
+# The scene covers the main TFTBase paths: solid fills, outlines, lines,
+# circles, opaque and transparent text, plain and color-keyed sprites and
+# clipping. Each controller is checked in a portrait and a landscape rotation.
+#
+# GRAM is checked through the logical frame (logical pixel (x, y) of the
+# driver at (x, y)), compared in RGB565 so that ILI9488's RGB666 matches:
+# probe pixels must have their expected colors, and the scene must look the
+# same on every controller and rotation. The bus counters are pinned, so a
+# change in the traffic a driver sends (bytes, commands, windows, CS cycles)
+# fails here until the expected numbers are updated on purpose.
+#
+# Usage:
+#     python3 -m unittest discover -s tests -t .
+
+import unittest
+
+from utils.tft_emulator import Emulator
+
+Emulator()
+
+import fonts.tt7
+import fonts.tt14
+import drivers.tft_spi as tft_spi
+from drivers.text_layout import measure
+
+BLACK = 0x0000
+RED = 0xF800
+GREEN = 0x07E0
+BLUE = 0x001F
+WHITE = 0xFFFF
+YELLOW = 0xFFE0
+KEY = 0xF81F
+
+# Area of the screen the scene draws into, the same on every controller
+SCENE_W, SCENE_H = 240, 160
+
+# Expected emulator.stats() per (controller, rotation), without "us"
+EXPECTED_TRAFFIC = {
+    ("ili9341", 0): {"bytes": 166489, "pixel_bytes": 164432, "writes": 1430, "commands": 561,
+                     "windows": 187, "cs_cycles": 14},
+    ("ili9341", 1): {"bytes": 166489, "pixel_bytes": 164432, "writes": 1430, "commands": 561,
+                     "windows": 187, "cs_cycles": 14},
+    ("st7796s", 0): {"bytes": 320089, "pixel_bytes": 318032, "writes": 1730, "commands": 561,
+                     "windows": 187, "cs_cycles": 14},
+    ("st7796s", 1): {"bytes": 320089, "pixel_bytes": 318032, "writes": 1730, "commands": 561,
+                     "windows": 187, "cs_cycles": 14},
+    # RGB666: three bytes per pixel
+    ("ili9488", 0): {"bytes": 479105, "pixel_bytes": 477048, "writes": 1734, "commands": 561,
+                     "windows": 187, "cs_cycles": 14},
+    ("ili9488", 1): {"bytes": 479105, "pixel_bytes": 477048, "writes": 1734, "commands": 561,
+                     "windows": 187, "cs_cycles": 14},
+}
+
+
+def sprite(w, h, key=None):
+    # Opaque pixels count up from 0x0841; every third pixel is the key
+    data = bytearray(2 * w * h)
+    for i in range(w * h):
+        c = key if key is not None and i % 3 == 0 else 0x0841 + i
+        data[2 * i] = c >> 8
+        data[2 * i + 1] = c & 0xFF
+    return data
+
+
+def draw_scene(tft):
+    tft.erase()
+    tft.fill_rect(10, 10, 60, 30, RED)
+    tft.rect(80, 10, 40, 30, GREEN)
+    tft.line(130, 10, 190, 40, YELLOW)
+    tft.fill_circle(40, 80, 20, BLUE)
+    tft.circle(100, 80, 20, WHITE)
+    tft.set_font(fonts.tt14)
+    tft.text("Avalanche", 10, 110, WHITE, BLUE)
+    tft.set_font(fonts.tt7)
+    tft.text("3 - Considerable", 120, 110, YELLOW)
+    tft.blit_rgb565(140, 60, 16, 8, sprite(16, 8))
+    tft.blit_rgb565(140, 75, 9, 4, sprite(9, 4, KEY), key=KEY)
+    tft.push_clip(10, 140, 50, 10)
+    tft.fill_rect(0, 130, SCENE_W, 30, GREEN)
+    tft.pop_clip()
+
+
+def lit_pixels(font, s):
+    # Lit glyph pixels of a line of text, counted from the font data
+    height = font.height()
+    per_col = (height + 7) // 8
+    n = 0
+    for ch in s:
+        glyph, width = font.get_ch(ch)
+        for col in range(width):
+            for row in range(height):
+                i = col * per_col + (row >> 3)
+                if i < len(glyph) and glyph[i] >> (row & 7) & 1:
+                    n += 1
+    return n
+
+
+def to565(rgb, k):
+    return ((rgb[k] >> 3) << 11) | ((rgb[k + 1] >> 2) << 5) | (rgb[k + 2] >> 3)
+
+
+def render(controller, rotation):
+    emu = Emulator(controller)
+    tft = getattr(tft_spi, controller.upper())(emu.spi, emu.cs, emu.dc, rst=emu.rst,
+                                               rotation=rotation)
+    tft.init()
+    emu.reset_stats()
+    draw_scene(tft)
+    stats = emu.stats()
+    del stats["us"]
+    w, h, rgb = emu.panel.logical_frame()
+    # The scene area as RGB565 rows
+    scene = [[to565(rgb, (y * w + x) * 3) for x in range(SCENE_W)] for y in range(SCENE_H)]
+    return tft, stats, scene
+
+
+class EmulatorSceneTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.results = {}
+        for controller in ("ili9341", "st7796s", "ili9488"):
+            for rotation in (0, 1):
+                cls.results[(controller, rotation)] = render(controller, rotation)
+
+    def test_probe_pixels(self):
+        probes = (
+            ((10, 10), RED), ((69, 39), RED), ((70, 39), BLACK),
+            ((80, 10), GREEN), ((119, 39), GREEN), ((100, 25), BLACK),
+            ((130, 10), YELLOW), ((190, 40), YELLOW),
+            ((40, 80), BLUE), ((40, 61), BLUE), ((40, 58), BLACK),
+            ((100, 60), WHITE), ((100, 80), BLACK),
+            ((140, 60), 0x0841), ((155, 67), 0x0841 + 127),
+            # Key pixels of the keyed sprite let the background through
+            ((140, 75), BLACK), ((141, 75), 0x0842),
+            ((10, 140), GREEN), ((59, 149), GREEN), ((60, 140), BLACK), ((10, 139), BLACK),
+        )
+        for key, (_, _, scene) in self.results.items():
+            for (x, y), color in probes:
+                self.assertEqual(scene[y][x], color, (key, x, y))
+
+    def test_text(self):
+        for key, (_, _, scene) in self.results.items():
+            # Opaque text: lit pixels in the text color, the rest of its box in bg
+            h = fonts.tt14.height()
+            box = [scene[y][x] for y in range(110, 110 + h) for x in range(10, 10 + measure(fonts.tt14, "Avalanche"))]
+            self.assertEqual(box.count(WHITE), lit_pixels(fonts.tt14, "Avalanche"), key)
+            self.assertEqual(box.count(WHITE) + box.count(BLUE), len(box), key)
+            # Transparent text: only lit pixels are drawn
+            h = fonts.tt7.height()
+            box = [scene[y][x] for y in range(110, 110 + h) for x in range(120, 120 + measure(fonts.tt7, "3 - Considerable"))]
+            self.assertEqual(box.count(YELLOW), lit_pixels(fonts.tt7, "3 - Considerable"), key)
+            self.assertEqual(box.count(YELLOW) + box.count(BLACK), len(box), key)
+
+    def test_same_on_every_controller(self):
+        reference = self.results[("ili9341", 0)][2]
+        for key, (_, _, scene) in self.results.items():
+            self.assertTrue(scene == reference, key)
+
+    def test_transactions_closed(self):
+        for key, (tft, _, _) in self.results.items():
+            self.assertEqual(tft._txn, 0, key)
+
+    def test_bus_traffic(self):
+        for key, (_, stats, _) in self.results.items():
+            self.assertEqual(stats, EXPECTED_TRAFFIC.get(key), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
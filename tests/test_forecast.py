@@ -0,0 +1,95 @@
+# test_forecast.py
+# Host tests for the forecast layout cache
+#
+# Usage:
+#     python3 -m unittest discover -s tests -t .
+
+import contextlib
+import copy
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.tft_emulator import Emulator
+
+Emulator()
+
+from drivers.displaylist import DisplayList
+from drivers.tft_spi import ILI9341
+from forecast import AvalancheForecast
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_example():
+    with open(os.path.join(_ROOT, "docs", "example_forecast.json")) as f:
+        return json.load(f)
+
+
+class ForecastCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "forecast.dl")
+        self.data = load_example()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def forecast(self):
+        emu = Emulator("ili9341")
+        tft = ILI9341(emu.spi, emu.cs, emu.dc, rst=emu.rst, rotation=2)
+        tft.init()
+        forecast = AvalancheForecast(tft)
+        forecast.cache_path = self.path
+        return forecast
+
+    def display(self, forecast, data):
+        # Count the flash writes of one refresh
+        with mock.patch.object(DisplayList, "save", autospec=True,
+                               side_effect=DisplayList.save) as save:
+            with contextlib.redirect_stdout(io.StringIO()):
+                forecast.display_forecast(data, 10)
+        return save.call_count
+
+    def test_unchanged_layout_is_not_rewritten(self):
+        forecast = self.forecast()
+        self.assertEqual(self.display(forecast, self.data), 1)
+        self.assertEqual(self.display(forecast, self.data), 0)
+        changed = copy.deepcopy(self.data)
+        changed['report']['dangerRatings'][0]['ratings']['alp']['rating']['display'] = "4 - High"
+        self.assertEqual(self.display(forecast, changed), 1)
+        self.assertEqual(DisplayList.load(self.path), forecast.display_list)
+
+    def test_cache_from_a_previous_boot(self):
+        self.assertEqual(self.display(self.forecast(), self.data), 1)
+        # Same forecast after a reboot: the file on flash already matches
+        self.assertEqual(self.display(self.forecast(), self.data), 0)
+
+    def test_redraw_from_cache(self):
+        self.display(self.forecast(), self.data)
+        forecast = self.forecast()
+        self.assertTrue(forecast.redraw())
+        self.assertEqual(self.display(forecast, self.data), 0)
+
+
+class DisplayListEqualityTest(unittest.TestCase):
+    def test_equal(self):
+        a = DisplayList()
+        b = DisplayList()
+        for dl in (a, b):
+            dl.fill_rect(1, 2, 3, 4, 0xF800)
+            dl.text("hi", 5, 6, 0xFFFF)
+            dl.blit_rgb565(0, 0, 1, 1, bytearray(b"\x12\x34"))
+        self.assertTrue(a == b)
+        self.assertFalse(a != b)
+        b.text("!", 0, 0, 0xFFFF)
+        self.assertFalse(a == b)
+        self.assertTrue(a != b)
+        self.assertFalse(a == None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# test_glyph_cache.py
+# Host tests for the GlyphCache LRU and its statistics
+#
+# Usage:
+#     python3 -m unittest discover -s tests -t .
+
+import unittest
+
+from utils.tft_emulator import Emulator
+
+Emulator()
+
+from drivers.tft_spi import GlyphCache
+
+
+class GlyphCacheTest(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = GlyphCache(budget=8)
+        cache.put("a", (b"aaaa", 2), 4)
+        cache.put("b", (b"bbbb", 2), 4)
+        cache.get("a")
+        cache.put("c", (b"cccc", 2), 4)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_clear_resets_statistics(self):
+        cache = GlyphCache(budget=8)
+        cache.put("a", (b"aaaa", 2), 4)
+        cache.get("a")
+        cache.get("x")
+        cache.put("b", (b"bbbb", 2), 4)
+        cache.put("c", (b"cccc", 2), 4)
+        cache.clear()
+        self.assertEqual(cache.stats(), {
+            "hits": 0, "misses": 0, "evictions": 0,
+            "entries": 0, "bytes": 0, "budget": 8,
+        })
+        cache.get("a")
+        self.assertEqual(cache.stats()["misses"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# test_indexed_canvas.py
+# Host tests for IndexedCanvas palette handling
+#
+# Usage:
+#     python3 -m unittest discover -s tests -t .
+
+import unittest
+
+from utils.tft_emulator import Emulator
+
+Emulator()
+
+from drivers.tft_spi import ILI9341, IndexedCanvas
+
+RED = 0xF800
+BLUE = 0x001F
+
+
+def make():
+    emu = Emulator("ili9341")
+    tft = ILI9341(emu.spi, emu.cs, emu.dc, rst=emu.rst, rotation=0)
+    tft.init()
+    tft.fill(0x1234)
+    return emu, tft
+
+
+def count(emu, rgb888):
+    _, _, rgb = emu.panel.logical_frame()
+    return sum(1 for i in range(0, len(rgb), 3) if rgb[i:i + 3] == rgb888)
+
+
+class IndexedCanvasTest(unittest.TestCase):
+    def test_default_background_is_black(self):
+        emu, tft = make()
+        canvas = IndexedCanvas(tft)
+        canvas.fill_rect(0, 0, 10, 10, RED)
+        canvas.show((0, 0, tft.width, tft.height))
+        self.assertEqual(count(emu, b"\xff\x00\x00"), 100)
+        self.assertEqual(count(emu, b"\x00\x00\x00"), tft.width * tft.height - 100)
+        self.assertEqual(canvas.color_index(0x0000), 0)
+
+    def test_palette_slot_0_is_background(self):
+        emu, tft = make()
+        canvas = IndexedCanvas(tft, palette=[BLUE, RED])
+        canvas.fill_rect(0, 0, 10, 10, RED)
+        canvas.show((0, 0, tft.width, tft.height))
+        self.assertEqual(count(emu, b"\xff\x00\x00"), 100)
+        self.assertEqual(count(emu, b"\x00\x00\xff"), tft.width * tft.height - 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
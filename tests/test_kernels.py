@@ -0,0 +1,250 @@
+# test_kernels.py
+# Host equivalence tests for drivers/kernels.py and drivers/kernels_viper.py
+#
+# Both kernel sets are checked against the loops tft_spi used inline before
+# the kernels existed. The viper module runs here as plain Python: the
+# emulator's micropython.viper is a no-op decorator, and ptr8() is given as
+# the identity, so its loop logic (bounds, odd lengths) is what is tested.
+#
+# Usage:
+#     python3 -m unittest discover -s tests -t .
+
+import unittest
+
+from utils.tft_emulator import install
+
+install()
+
+import fonts.tt7
+import fonts.tt14
+import fonts.tt24
+from drivers import kernels
+from drivers import kernels_viper
+
+kernels_viper.ptr8 = lambda buf: buf
+
+PURE = {"fill16": kernels._fill16, "glyph": kernels._glyph, "skip_key": kernels._skip_key,
+        "find_key": kernels._find_key, "expand_gs4": kernels._expand_gs4,
+        "rgb565_to_666": kernels._rgb565_to_666}
+VIPER = {"fill16": kernels_viper.fill16, "glyph": kernels_viper.glyph,
+         "skip_key": kernels_viper.skip_key, "find_key": kernels_viper.find_key,
+         "expand_gs4": kernels_viper.expand_gs4, "rgb565_to_666": kernels_viper.rgb565_to_666}
+IMPLEMENTATIONS = (("pure", PURE), ("viper", VIPER))
+
+
+# --- The loops tft_spi used before drivers/kernels.py ---
+def ref_fill565(buf, color):
+    size = len(buf)
+    if size < 2:
+        return
+    buf[0] = (color >> 8) & 0xFF
+    buf[1] = color & 0xFF
+    n = 2
+    while n < size:
+        k = n if n < size - n else size - n
+        buf[n:n + k] = buf[:k]
+        n += k
+
+
+def ref_glyph_tile(glyph, char_width, font_height, color, bg):
+    bytes_per_col = (font_height + 7) // 8
+    w, h = char_width + 1, font_height + 1
+    buf = bytearray(w * h * 2)
+    fg_hi, fg_lo = (color >> 8) & 0xFF, color & 0xFF
+    ref_fill565(buf, bg)
+    glyph_len = len(glyph)
+    for col in range(char_width):
+        base = col * bytes_per_col
+        for byte_idx in range(bytes_per_col):
+            glyph_idx = base + byte_idx
+            if glyph_idx >= glyph_len:
+                break
+            bits = glyph[glyph_idx]
+            row = byte_idx * 8
+            while bits and row < font_height:
+                if bits & 1:
+                    p = (row * w + col) * 2
+                    buf[p] = fg_hi
+                    buf[p + 1] = fg_lo
+                bits >>= 1
+                row += 1
+    return buf
+
+
+def ref_key_runs(w, h, data, key):
+    # (row, start, length) of every run of non-key pixels
+    khi = (key >> 8) & 0xFF
+    klo = key & 0xFF
+    runs = []
+    i = 0
+    for row in range(h):
+        col = 0
+        while col < w:
+            p = i + 2 * col
+            if data[p] == khi and data[p + 1] == klo:
+                col += 1
+                continue
+            start = col
+            col += 1
+            p += 2
+            while col < w and (data[p] != khi or data[p + 1] != klo):
+                col += 1
+                p += 2
+            runs.append((row, start, col - start))
+        i += 2 * w
+    return runs
+
+
+def ref_expand_gs4(src, s, n, lut, dst, d):
+    for i in range(s, s + n):
+        p = src[i] << 2
+        dst[d] = lut[p]
+        dst[d + 1] = lut[p + 1]
+        dst[d + 2] = lut[p + 2]
+        dst[d + 3] = lut[p + 3]
+        d += 4
+
+
+def ref_rgb565_to_666(src, s, n, lut, dst):
+    d = 0
+    for i in range(s, s + 2 * n, 2):
+        hi = src[i]
+        lo = src[i + 1]
+        dst[d] = lut[hi]
+        dst[d + 1] = lut[256 + hi] | lut[512 + lo]
+        dst[d + 2] = lut[768 + lo]
+        d += 3
+
+
+def key_runs(k, w, h, data, key):
+    # The same runs found with skip_key/find_key, as sprite_runs() does
+    runs = []
+    for row in range(h):
+        i = 2 * w * row
+        end = i + 2 * w
+        p = k["skip_key"](data, i, end, key)
+        while p < end:
+            q = k["find_key"](data, p, end, key)
+            runs.append((row, (p - i) >> 1, (q - p) >> 1))
+            p = k["skip_key"](data, q, end, key)
+    return runs
+
+
+def pseudo_random(n, seed):
+    out = bytearray(n)
+    x = seed
+    for i in range(n):
+        x = (x * 1103515245 + 12345) & 0x7FFFFFFF
+        out[i] = x >> 16 & 0xFF
+    return out
+
+
+class KernelTest(unittest.TestCase):
+    def test_fill16(self):
+        for name, k in IMPLEMENTATIONS:
+            for size in (0, 1, 2, 3, 4, 5, 7, 8, 511, 512, 2048):
+                for color in (0x0000, 0xF81F, 0x1234, 0xFFFF):
+                    expected = bytearray(b"\xAA" * size)
+                    ref_fill565(expected, color)
+                    buf = bytearray(b"\xAA" * size)
+                    k["fill16"](buf, color)
+                    self.assertEqual(buf, expected, (name, size, hex(color)))
+
+    def test_fill16_memoryview(self):
+        # tft_spi fills slices of its strip buffer in place
+        for name, k in IMPLEMENTATIONS:
+            buf = bytearray(20)
+            k["fill16"](memoryview(buf)[3:14], 0xABCD)
+            expected = bytearray(20)
+            ref_fill565(memoryview(expected)[3:14], 0xABCD)
+            self.assertEqual(buf, expected, name)
+
+    def test_glyph(self):
+        for name, k in IMPLEMENTATIONS:
+            for font in (fonts.tt7, fonts.tt14, fonts.tt24):
+                height = font.height()
+                for c in range(32, 127):
+                    glyph, char_width = font.get_ch(chr(c))
+                    w = char_width + 1
+                    expected = ref_glyph_tile(glyph, char_width, height, 0xF800, 0x001F)
+                    tile = bytearray(2 * w * (height + 1))
+                    kernels.fill16(tile, 0x001F)
+                    k["glyph"](glyph, tile, (w << 8) | height, 0xF800)
+                    self.assertEqual(tile, expected, (name, font.__name__, chr(c)))
+
+    def test_glyph_empty(self):
+        for name, k in IMPLEMENTATIONS:
+            tile = bytearray(2 * 4 * 8)
+            k["glyph"](b"", tile, (4 << 8) | 7, 0xFFFF)
+            self.assertEqual(tile, bytearray(len(tile)), name)
+
+    def test_key_runs(self):
+        key = 0x0000
+        w = 16
+        image = pseudo_random(2 * w * 3, 1)
+        rows = [
+            bytes(2 * w),                    # all key
+            b"\x12\x34" * w,                 # no key
+            b"\x00\x00\x12\x34" * (w // 2),  # alternating
+            b"\x00\x01" * w,                 # low byte differs from the key
+            b"\x01\x00" * w,                 # high byte differs from the key
+            b"\x12\x34" + bytes(2 * w - 4) + b"\x12\x34",  # opaque ends only
+            bytes(image[:2 * w]),
+        ]
+        for i in range(3):
+            row = bytearray(image[2 * w * i:2 * w * (i + 1)])
+            for j in range(0, len(row), 6):
+                row[j:j + 2] = b"\x00\x00"
+            rows.append(bytes(row))
+        data = b"".join(rows)
+        h = len(rows)
+        expected = ref_key_runs(w, h, data, key)
+        for name, k in IMPLEMENTATIONS:
+            self.assertEqual(key_runs(k, w, h, data, key), expected, name)
+            # Empty range
+            self.assertEqual(k["skip_key"](data, 8, 8, key), 8, name)
+            self.assertEqual(k["find_key"](data, 8, 8, key), 8, name)
+            # A row of key pixels is skipped to its end, and has no key to find
+            self.assertEqual(k["skip_key"](data, 0, 2 * w, key), 2 * w, name)
+            self.assertEqual(k["find_key"](data, 2 * w, 4 * w, key), 4 * w, name)
+
+    def test_key_runs_other_key(self):
+        w, h = 24, 10
+        data = bytearray(pseudo_random(2 * w * h, 5))
+        for i in range(0, len(data), 10):
+            data[i:i + 4] = b"\xF8\x1F\xF8\x1F"
+        expected = ref_key_runs(w, h, data, 0xF81F)
+        for name, k in IMPLEMENTATIONS:
+            self.assertEqual(key_runs(k, w, h, data, 0xF81F), expected, name)
+
+    def test_expand_gs4(self):
+        lut = pseudo_random(1024, 3)
+        src = pseudo_random(120, 2)
+        for name, k in IMPLEMENTATIONS:
+            for s, n in ((0, 0), (0, 1), (7, 33), (0, 120)):
+                expected = bytearray(4 * n + 8)
+                ref_expand_gs4(src, s, n, lut, expected, 4)
+                dst = bytearray(4 * n + 8)
+                k["expand_gs4"](memoryview(src)[s:s + n], lut, memoryview(dst)[4:])
+                self.assertEqual(dst, expected, (name, s, n))
+
+    def test_rgb565_to_666(self):
+        lut = pseudo_random(1024, 4)
+        image = pseudo_random(2 * 240, 1)
+        for name, k in IMPLEMENTATIONS:
+            for src, s, n in ((image, 0, 0), (image, 0, 1), (image, 6, 101),
+                              (image, 0, 240), (b"\xFF" * 20, 0, 10), (bytes(20), 0, 10)):
+                expected = bytearray(3 * 240)
+                ref_rgb565_to_666(src, s, n, lut, expected)
+                dst = bytearray(3 * 240)
+                k["rgb565_to_666"](memoryview(src)[s:], lut, dst, n)
+                self.assertEqual(dst, expected, (name, s, n))
+
+    def test_selected(self):
+        # Off the device drivers.kernels must use the pure versions
+        self.assertFalse(kernels.VIPER)
+        self.assertIs(kernels.fill16, kernels._fill16)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+# test_spi_stream.py
+# Host tests for RecordingStream and TFTBase drawing through an asynchronous stream
+#
+# RecordingStream behaves like DMAStream (write() returns with the buffer in
+# flight until the next wait()) but forwards everything to the emulated SPI
+# bus, so the transfers a draw call starts and the pixels it leaves in GRAM
+# can both be checked on Linux.
+#
+# Usage:
+#     python3 -m unittest discover -s tests -t .
+
+import unittest
+
+from utils.tft_emulator import Emulator
+
+Emulator()
+
+from drivers.spi_stream import RecordingStream
+from drivers.tft_spi import ILI9341
+
+W, H = 240, 320
+
+
+def make(recording=True):
+    emu = Emulator("ili9341")
+    stream = RecordingStream(emu.spi) if recording else None
+    tft = ILI9341(emu.spi, emu.cs, emu.dc, rst=emu.rst, rotation=0, stream=stream)
+    tft.init()
+    if recording:
+        del stream.transfers[:]
+    return emu, tft, stream
+
+
+def pixel(emu, x, y):
+    w, _, rgb = emu.panel.logical_frame()
+    k = (y * w + x) * 3
+    return tuple(rgb[k:k + 3])
+
+
+def sprite(w, h, key=None):
+    # Opaque pixels count up from 0x0841; every third pixel is the key
+    data = bytearray(2 * w * h)
+    for i in range(w * h):
+        c = key if key is not None and i % 3 == 0 else 0x0841 + i
+        data[2 * i] = c >> 8
+        data[2 * i + 1] = c & 0xFF
+    return data
+
+
+class RecordingStreamTest(unittest.TestCase):
+    def test_write_and_fill_are_recorded(self):
+        stream = RecordingStream()
+        buf = bytearray(10)
+        stream.write(buf)
+        self.assertEqual(stream.fill(b"\x12\x34", 7), 1)
+        self.assertEqual(stream.fill(b"\x12\x34", 0), 0)
+        self.assertEqual(stream.transfers, [("write", 10), ("fill", 7)])
+        self.assertEqual(stream.waits, 1)
+
+    def test_changed_buffer_raises_on_wait(self):
+        stream = RecordingStream()
+        buf = bytearray(4)
+        stream.write(buf)
+        buf[0] = 1
+        with self.assertRaises(RuntimeError):
+            stream.wait()
+        # The error is reported once; the stream is usable again
+        stream.wait()
+        stream.write(buf)
+        stream.wait()
+
+    def test_changed_buffer_raises_on_next_write(self):
+        stream = RecordingStream()
+        buf = bytearray(4)
+        stream.write(buf)
+        buf[3] = 7
+        with self.assertRaises(RuntimeError):
+            stream.write(bytearray(2))
+
+
+class DrawThroughStreamTest(unittest.TestCase):
+    def test_fill_rect(self):
+        emu, tft, stream = make()
+        tft.fill_rect(10, 20, 30, 5, 0xF800)
+        self.assertEqual(stream.transfers, [("fill", 2 * 30 * 5)])
+        self.assertEqual(pixel(emu, 10, 20), (255, 0, 0))
+        self.assertEqual(pixel(emu, 39, 24), (255, 0, 0))
+        self.assertEqual(pixel(emu, 40, 24), (0, 0, 0))
+        self.assertEqual(pixel(emu, 10, 25), (0, 0, 0))
+        self.assertEqual(emu.cs.value(), 1)
+
+    def test_fill_rect_clipped(self):
+        emu, tft, stream = make()
+        tft.fill_rect(W - 10, H - 4, 50, 50, 0x07E0)
+        self.assertEqual(stream.transfers, [("fill", 2 * 10 * 4)])
+        self.assertEqual(pixel(emu, W - 1, H - 1), (0, 255, 0))
+        tft.fill_rect(W, 0, 10, 10, 0x07E0)
+        self.assertEqual(len(stream.transfers), 1)
+
+    def test_erase(self):
+        emu, tft, stream = make()
+        tft.fill_rect(0, 0, 8, 8, 0xFFFF)
+        del stream.transfers[:]
+        tft.erase()
+        self.assertEqual(stream.transfers, [("fill", 2 * W * H)])
+        self.assertEqual(pixel(emu, 0, 0), (0, 0, 0))
+
+    def test_blit_rgb565(self):
+        emu, tft, stream = make()
+        data = sprite(16, 8)
+        tft.blit_rgb565(5, 7, 16, 8, data)
+        self.assertEqual(stream.transfers, [("write", len(data))])
+        ref, ref_tft, _ = make(False)
+        ref_tft.blit_rgb565(5, 7, 16, 8, data)
+        self.assertEqual(emu.panel.gram, ref.panel.gram)
+
+    def test_blit_rgb565_key(self):
+        emu, tft, stream = make()
+        data = sprite(9, 4, key=0x0000)
+        tft.blit_rgb565(3, 3, 9, 4, data, key=0x0000)
+        # Each row is key, opaque, opaque, ... so three 2-pixel runs per row
+        self.assertEqual(stream.transfers, [("write", 4)] * 12)
+        ref, ref_tft, _ = make(False)
+        ref_tft.blit_rgb565(3, 3, 9, 4, data, key=0x0000)
+        self.assertEqual(emu.panel.gram, ref.panel.gram)
+        self.assertEqual(pixel(emu, 3, 3), (0, 0, 0))
+
+    def test_same_gram_as_blocking_stream(self):
+        frames = []
+        for recording in (True, False):
+            emu, tft, _ = make(recording)
+            tft.begin()
+            tft.erase()
+            tft.fill_rect(4, 4, 100, 40, 0x001F)
+            tft.text("Recording", 10, 10, 0xFFFF, 0x001F)
+            tft.blit_rgb565(120, 60, 16, 8, sprite(16, 8))
+            tft.end()
+            frames.append(bytes(emu.panel.gram))
+        self.assertEqual(frames[0], frames[1])
+
+
+class BufferLifetimeTest(unittest.TestCase):
+    def test_buffer_free_after_call_outside_transaction(self):
+        emu, tft, stream = make()
+        data = sprite(4, 4)
+        tft.blit_rgb565(0, 0, 4, 4, data)
+        data[0] ^= 0xFF
+        tft.fill_rect(0, 0, 1, 1, 0xFFFF)
+        self.assertEqual(emu.cs.value(), 1)
+
+    def test_buffer_in_flight_until_end(self):
+        emu, tft, stream = make()
+        data = sprite(4, 4)
+        tft.begin()
+        tft.blit_rgb565(0, 0, 4, 4, data)
+        data[0] ^= 0xFF
+        with self.assertRaises(RuntimeError):
+            tft.end()
+        # The transaction is closed and CS released regardless
+        self.assertEqual(tft._txn, 0)
+        self.assertEqual(emu.cs.value(), 1)
+
+    def test_buffer_unchanged_until_end(self):
+        emu, tft, stream = make()
+        data = sprite(4, 4)
+        tft.begin()
+        tft.blit_rgb565(0, 0, 4, 4, data)
+        tft.blit_rgb565(4, 0, 4, 4, data)
+        tft.end()
+        data[0] ^= 0xFF
+        self.assertEqual(stream.transfers, [("write", 32), ("write", 32)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,14 @@ Usage:
   python img_to_rgb565be.py input.png
   python img_to_rgb565be.py input.jpg --rot 1
   python img_to_rgb565be.py input.bmp --rot 2 --out custom.bin
+  python img_to_rgb565be.py icon.png --rle
+
+With --rle the output is a run-length encoded sprite (.rle) for
+TFTBase.blit_rle565:
+
+  b"R565", width (u16 BE), height (u16 BE), then packets. A control byte c
+  with the top bit set is followed by one pixel repeated (c & 0x7F) + 1
+  times; otherwise c + 1 literal pixels follow.
 
 Rotation (--rot):
   0 = 0°   (no rotation)
@@ -53,9 +61,41 @@ def image_to_rgb565_be_bytes(img: Image.Image) -> bytes:
     return bytes(out)
 
 
-def derive_output_path(input_path: str) -> str:
+def rgb565_rle_encode(data: bytes, width: int, height: int) -> bytes:
+    """Run-length encode big-endian RGB565 pixel data (see module docstring)."""
+    out = bytearray(b"R565")
+    out += bytes([width >> 8, width & 0xFF, height >> 8, height & 0xFF])
+    pixels = [data[i:i + 2] for i in range(0, len(data), 2)]
+    literal = []
+
+    def flush_literal():
+        while literal:
+            chunk = literal[:128]
+            del literal[:128]
+            out.append(len(chunk) - 1)
+            for px in chunk:
+                out.extend(px)
+
+    i = 0
+    n = len(pixels)
+    while i < n:
+        j = i + 1
+        while j < n and j - i < 128 and pixels[j] == pixels[i]:
+            j += 1
+        if j - i >= 2:
+            flush_literal()
+            out.append(0x80 | (j - i - 1))
+            out += pixels[i]
+        else:
+            literal.append(pixels[i])
+        i = j
+    flush_literal()
+    return bytes(out)
+
+
+def derive_output_path(input_path: str, rle: bool = False) -> str:
     base, _ = os.path.splitext(input_path)
-    return base + ".bin"
+    return base + (".rle" if rle else ".bin")
 
 
 def main() -> int:
@@ -71,7 +111,12 @@ def main() -> int:
     parser.add_argument(
         "--out",
         default=None,
-        help="Optional output file path (default: same name as input with .bin extension)",
+        help="Optional output file path (default: same name as input with .bin or .rle extension)",
+    )
+    parser.add_argument(
+        "--rle",
+        action="store_true",
+        help="Write a run-length encoded sprite for TFTBase.blit_rle565",
     )
 
     args = parser.parse_args()
@@ -81,7 +126,7 @@ def main() -> int:
         print(f"ERROR: Input file not found: {input_path}", file=sys.stderr)
         return 2
 
-    out_path = args.out or derive_output_path(input_path)
+    out_path = args.out or derive_output_path(input_path, args.rle)
 
     try:
         img = Image.open(input_path)
@@ -95,11 +140,16 @@ def main() -> int:
             img = img.transpose(transpose_op)
 
         data = image_to_rgb565_be_bytes(img)
+        raw_size = len(data)
+        if args.rle:
+            data = rgb565_rle_encode(data, *img.size)
 
         with open(out_path, "wb") as f:
             f.write(data)
 
         print(f"Wrote {len(data)} bytes to: {out_path}")
+        if args.rle:
+            print(f"Compression: {raw_size} -> {len(data)} bytes ({raw_size / len(data):.1f}x)")
         return 0
 
     except Exception as e:
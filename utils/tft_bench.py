@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Run drivers/tft_spi_bench.py on Linux against the emulated panel.
+
+Every benchmark line gets the bus traffic of one run from the emulator
+(bus_bytes, bus_commands, bus_windows, bus_cs_cycles, ...) and bus_us, the
+time those bytes take at --baud. Host timings (median_us/p95_us) measure
+the Python code on this machine, not the device.
+
+Usage:
+  python utils/tft_bench.py > bench.jsonl
+  python utils/tft_bench.py --only text --repeat 5
+  python utils/tft_bench.py --controller st7796s --baud 62500000 --out st7796s.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tft_emulator import CONTROLLERS, Emulator, _ROOT  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark TFTBase drawing on an emulated panel.")
+    ap.add_argument("--controller", choices=sorted(CONTROLLERS), default="ili9341")
+    ap.add_argument("--rotation", type=int, default=2)
+    ap.add_argument("--baud", type=int, default=40_000_000)
+    ap.add_argument("--overhead-us", type=float, default=0.0,
+                    help="Fixed cost per spi.write call added to bus_us")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", default=None, help="Only run benchmarks whose name contains this")
+    ap.add_argument("--out", default=None, help="Write JSON lines here instead of stdout")
+    args = ap.parse_args()
+
+    emu = Emulator(args.controller, baud=args.baud, write_overhead_us=args.overhead_us)
+    import drivers.tft_spi as tft_spi
+    import drivers.tft_spi_bench as bench
+
+    cls = getattr(tft_spi, args.controller.upper())
+    tft = cls(emu.spi, emu.cs, emu.dc, rst=emu.rst, rotation=args.rotation)
+    tft.init()
+
+    out = open(args.out, "w") if args.out else sys.stdout
+    forecast_path = os.path.join(_ROOT, bench.FORECAST_JSON)
+    cwd = os.getcwd()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            # Driver and forecast chatter goes to stderr; stdout is JSON only
+            with redirect_stdout(sys.stderr):
+                bench.run(tft, repeat=args.repeat, only=args.only, measure=emu, out=out,
+                          forecast_path=forecast_path)
+    finally:
+        os.chdir(cwd)
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,721 @@
+#!/usr/bin/env python3
+"""
+Host-side emulator for the SPI TFT drivers (drivers/tft_spi.py, drivers/ili934x.py).
+
+The emulator stands in for machine.SPI and machine.Pin and decodes the exact
+byte stream a driver produces: CASET/RASET(PASET)/RAMWR windows, MADCTL
+(MY/MX/MV/BGR), COLMOD (16 or 18 bit pixels), VSCRDEF and VSCRSADD. Pixels
+land in a model of the controller's GRAM, which can be saved as a PNG the
+way the panel would show it, including hardware scrolling.
+
+Every byte is counted, so a change to a driver can be measured on Linux:
+bytes, commands, windows and CS cycles, plus the time the traffic takes at
+a given SPI baud rate, either in total or per driver call.
+
+Usage (library):
+  from utils.tft_emulator import Emulator
+  emu = Emulator("ili9341", baud=40_000_000)   # installs machine/micropython stand-ins
+  from drivers.tft_spi import ILI9341
+  tft = ILI9341(emu.spi, emu.cs, emu.dc, rst=emu.rst, rotation=2)
+  tft.init()
+  emu.profile(tft)                # per-call statistics for public methods
+  tft.fill_rect(10, 10, 100, 16, 0xFFFF)
+  emu.print_report()
+  emu.save_png("out.png")
+
+Usage (command line):
+  python utils/tft_emulator.py --forecast docs/example_forecast.json --out forecast.png
+  python utils/tft_emulator.py --driver ili934x --out legacy.png
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import time
+import types
+import zlib
+from contextlib import contextmanager
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Controller commands the model understands
+_CASET = 0x2A
+_RASET = 0x2B
+_RAMWR = 0x2C
+_RAMWRC = 0x3C
+_MADCTL = 0x36
+_COLMOD = 0x3A
+_VSCRDEF = 0x33
+_VSCRSADD = 0x37
+
+_MADCTL_MY = 0x80
+_MADCTL_MX = 0x40
+_MADCTL_MV = 0x20
+_MADCTL_BGR = 0x08
+
+# Native GRAM size (portrait) of the supported controllers
+CONTROLLERS = {
+    "ili9341": (240, 320),
+    "st7796s": (320, 480),
+    "ili9488": (320, 480),
+}
+
+
+# --- MicroPython stand-ins ---
+class Pin:
+    """Minimal machine.Pin: holds a level and notifies an optional watcher on change."""
+    IN = 0
+    OUT = 1
+
+    def __init__(self, id=None, mode=OUT, value=0):
+        self.id = id
+        self._v = 1 if value else 0
+        self._watch = None
+
+    def init(self, mode=None, value=None):
+        if value is not None:
+            self.value(value)
+
+    def value(self, v=None):
+        if v is None:
+            return self._v
+        v = 1 if v else 0
+        if v != self._v:
+            self._v = v
+            if self._watch is not None:
+                self._watch(v)
+
+    __call__ = value
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+
+class NullSPI:
+    """machine.SPI that accepts and discards everything (for code that builds its own bus)."""
+    def __init__(self, *args, **kwargs):
+        self.baudrate = kwargs.get("baudrate", 0)
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def write(self, buf):
+        pass
+
+    def read(self, n, write=0):
+        return bytes(n)
+
+    def readinto(self, buf, write=0):
+        for i in range(len(buf)):
+            buf[i] = 0
+
+    def write_readinto(self, wbuf, rbuf):
+        self.readinto(rbuf)
+
+
+def _framebuf_module():
+    # Pure-Python subset of MicroPython's framebuf: pixel access, rects and
+    # palette blits in the formats the drivers use
+    mod = types.ModuleType("framebuf")
+    MONO_VLSB, RGB565, GS4_HMSB, MONO_HLSB, MONO_HMSB, GS2_HMSB, GS8 = 0, 1, 2, 3, 4, 5, 6
+    mod.MONO_VLSB = mod.MVLSB = MONO_VLSB
+    mod.RGB565 = RGB565
+    mod.GS4_HMSB = GS4_HMSB
+    mod.MONO_HLSB = MONO_HLSB
+    mod.MONO_HMSB = MONO_HMSB
+    mod.GS2_HMSB = GS2_HMSB
+    mod.GS8 = GS8
+
+    class FrameBuffer:
+        def __init__(self, buf, width, height, format, stride=None):
+            self.buf = buf
+            self.width = width
+            self.height = height
+            self.format = format
+            self.stride = width if stride is None else stride
+
+        def _get(self, x, y):
+            b, s, f = self.buf, self.stride, self.format
+            if f == MONO_VLSB:
+                return (b[(y >> 3) * s + x] >> (y & 7)) & 1
+            if f == MONO_HLSB:
+                return (b[(y * s + x) >> 3] >> (7 - (x & 7))) & 1
+            if f == MONO_HMSB:
+                return (b[(y * s + x) >> 3] >> (x & 7)) & 1
+            if f == GS2_HMSB:
+                return (b[(y * s + x) >> 2] >> ((x & 3) << 1)) & 3
+            if f == GS4_HMSB:
+                v = b[(y * s + x) >> 1]
+                return v & 0x0F if x & 1 else v >> 4
+            if f == GS8:
+                return b[y * s + x]
+            i = (y * s + x) << 1
+            return b[i] | (b[i + 1] << 8)
+
+        def _set(self, x, y, c):
+            b, s, f = self.buf, self.stride, self.format
+            if f == MONO_VLSB:
+                i, m = (y >> 3) * s + x, 1 << (y & 7)
+            elif f == MONO_HLSB:
+                i, m = (y * s + x) >> 3, 0x80 >> (x & 7)
+            elif f == MONO_HMSB:
+                i, m = (y * s + x) >> 3, 1 << (x & 7)
+            elif f == GS2_HMSB:
+                i, sh = (y * s + x) >> 2, (x & 3) << 1
+                b[i] = (b[i] & ~(3 << sh)) | ((c & 3) << sh)
+                return
+            elif f == GS4_HMSB:
+                i = (y * s + x) >> 1
+                if x & 1:
+                    b[i] = (b[i] & 0xF0) | (c & 0x0F)
+                else:
+                    b[i] = (b[i] & 0x0F) | ((c & 0x0F) << 4)
+                return
+            elif f == GS8:
+                b[y * s + x] = c & 0xFF
+                return
+            else:
+                i = (y * s + x) << 1
+                b[i] = c & 0xFF
+                b[i + 1] = (c >> 8) & 0xFF
+                return
+            b[i] = (b[i] | m) if c & 1 else (b[i] & ~m)
+
+        def pixel(self, x, y, c=None):
+            if not (0 <= x < self.width and 0 <= y < self.height):
+                return None
+            if c is None:
+                return self._get(x, y)
+            self._set(x, y, c)
+
+        def fill_rect(self, x, y, w, h, c):
+            for yy in range(max(y, 0), min(y + h, self.height)):
+                for xx in range(max(x, 0), min(x + w, self.width)):
+                    self._set(xx, yy, c)
+
+        def fill(self, c):
+            self.fill_rect(0, 0, self.width, self.height, c)
+
+        def hline(self, x, y, w, c):
+            self.fill_rect(x, y, w, 1, c)
+
+        def vline(self, x, y, h, c):
+            self.fill_rect(x, y, 1, h, c)
+
+        def rect(self, x, y, w, h, c, f=False):
+            if f:
+                self.fill_rect(x, y, w, h, c)
+                return
+            self.hline(x, y, w, c)
+            self.hline(x, y + h - 1, w, c)
+            self.vline(x, y, h, c)
+            self.vline(x + w - 1, y, h, c)
+
+        def blit(self, fb, x, y, key=-1, palette=None):
+            for sy in range(fb.height):
+                ty = y + sy
+                if not 0 <= ty < self.height:
+                    continue
+                for sx in range(fb.width):
+                    tx = x + sx
+                    if not 0 <= tx < self.width:
+                        continue
+                    c = fb._get(sx, sy)
+                    if c == key:
+                        continue
+                    if palette is not None:
+                        c = palette._get(c, 0)
+                    self._set(tx, ty, c)
+
+    mod.FrameBuffer = FrameBuffer
+    return mod
+
+
+def install():
+    """
+    Register stand-ins for the MicroPython modules the drivers import
+    (machine, micropython, ustruct, framebuf, glcdfont) and add the
+    ``time.*_ms``/``ticks_*`` helpers. Safe to call more than once.
+    """
+    if _ROOT not in sys.path:
+        sys.path.insert(0, _ROOT)
+    if "machine" not in sys.modules:
+        machine = types.ModuleType("machine")
+        machine.Pin = Pin
+        machine.SPI = NullSPI
+        sys.modules["machine"] = machine
+    if "micropython" not in sys.modules:
+        micropython = types.ModuleType("micropython")
+        micropython.const = lambda x: x
+        micropython.native = lambda f: f
+        micropython.viper = lambda f: f
+        sys.modules["micropython"] = micropython
+    import builtins
+    if not hasattr(builtins, "const"):
+        # Scripts like display.py use const() without importing it
+        builtins.const = sys.modules["micropython"].const
+    sys.modules.setdefault("ustruct", struct)
+    if "framebuf" not in sys.modules:
+        sys.modules["framebuf"] = _framebuf_module()
+    if "glcdfont" not in sys.modules:
+        # ili934x.py imports its font as a top-level module
+        import fonts.glcdfont
+        sys.modules["glcdfont"] = fonts.glcdfont
+    if not hasattr(time, "sleep_ms"):
+        # Panel delays cost nothing on the host
+        time.sleep_ms = lambda ms: None
+        time.sleep_us = lambda us: None
+        time.ticks_ms = lambda: int(time.perf_counter() * 1000)
+        time.ticks_us = lambda: int(time.perf_counter() * 1000000)
+        time.ticks_diff = lambda a, b: a - b
+        time.ticks_add = lambda a, b: a + b
+
+
+# --- Controller model ---
+class Panel:
+    """
+    GRAM model of a MIPI-DBI controller driven by its command stream.
+
+    GRAM is ``width`` x ``height`` in native (portrait) orientation and
+    holds RGB888 pixels. MADCTL decides how window addresses map to GRAM:
+    MV exchanges the column and page counters, then MX mirrors GRAM x and
+    MY mirrors GRAM y. Scanline n shows GRAM row n, redirected inside the
+    VSCRDEF scroll area by VSCRSADD.
+
+    Parameters:
+        width, height (int): Native GRAM size.
+        bgr (bool): Panel is wired BGR (colors come out right when the
+            driver sets the MADCTL BGR bit).
+        mirror_x (bool): The glass shows GRAM columns right to left, which is
+            why drivers set MX for the upright portrait rotation.
+    """
+    def __init__(self, width=240, height=320, bgr=True, mirror_x=True):
+        self.width = width
+        self.height = height
+        self.bgr = bgr
+        self.mirror_x = mirror_x
+        self.gram = bytearray(width * height * 3)
+        self.madctl = 0
+        self.colmod = 0x55
+        self.window = [0, width - 1, 0, height - 1]
+        self.scroll_area = (0, height, 0)
+        self.scroll_start = 0
+        self._cmd = None
+        self._args = bytearray()
+        self._pending = bytearray()
+        self._c = 0
+        self._p = 0
+
+    # --- Stream decoding ---
+    def command(self, c):
+        self._cmd = c
+        self._args = bytearray()
+        self._pending = bytearray()
+        if c == _RAMWR:
+            self._c = self.window[0]
+            self._p = self.window[2]
+
+    def data(self, buf):
+        c = self._cmd
+        if c == _RAMWR or c == _RAMWRC:
+            self._pixels(buf)
+            return
+        args = self._args
+        args.extend(buf)
+        if c == _CASET and len(args) >= 4:
+            self.window[0:2] = [args[0] << 8 | args[1], args[2] << 8 | args[3]]
+        elif c == _RASET and len(args) >= 4:
+            self.window[2:4] = [args[0] << 8 | args[1], args[2] << 8 | args[3]]
+        elif c == _MADCTL and args:
+            self.madctl = args[0]
+        elif c == _COLMOD and args:
+            self.colmod = args[0]
+        elif c == _VSCRDEF and len(args) >= 6:
+            self.scroll_area = (args[0] << 8 | args[1], args[2] << 8 | args[3], args[4] << 8 | args[5])
+        elif c == _VSCRSADD and len(args) >= 2:
+            self.scroll_start = args[0] << 8 | args[1]
+
+    def _pixels(self, buf):
+        size = 3 if (self.colmod & 0x07) == 0x06 else 2
+        data = self._pending + bytes(buf)
+        usable = len(data) - len(data) % size
+        self._pending = data[usable:]
+        madctl = self.madctl
+        mv = madctl & _MADCTL_MV
+        mx = madctl & _MADCTL_MX
+        my = madctl & _MADCTL_MY
+        swap = bool(madctl & _MADCTL_BGR) != self.bgr
+        w, h = self.width, self.height
+        c0, c1, p0, p1 = self.window
+        c, p = self._c, self._p
+        gram = self.gram
+        for i in range(0, usable, size):
+            if size == 2:
+                v = data[i] << 8 | data[i + 1]
+                r = (v >> 11) & 0x1F
+                g = (v >> 5) & 0x3F
+                b = v & 0x1F
+                r, g, b = (r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)
+            else:
+                r, g, b = data[i] & 0xFC, data[i + 1] & 0xFC, data[i + 2] & 0xFC
+            if swap:
+                r, b = b, r
+            x, y = (p, c) if mv else (c, p)
+            if mx:
+                x = w - 1 - x
+            if my:
+                y = h - 1 - y
+            if 0 <= x < w and 0 <= y < h:
+                k = (y * w + x) * 3
+                gram[k] = r
+                gram[k + 1] = g
+                gram[k + 2] = b
+            c += 1
+            if c > c1:
+                c = c0
+                p += 1
+                if p > p1:
+                    p = p0
+        self._c, self._p = c, p
+
+    # --- Output ---
+    def _source_row(self, n):
+        tfa, vsa, _ = self.scroll_area
+        if vsa and tfa <= n < tfa + vsa:
+            return tfa + (n - tfa + self.scroll_start - tfa) % vsa
+        return n
+
+    def frame(self):
+        """
+        Return the image on the glass in native portrait orientation.
+
+        Returns:
+            tuple: (width, height, RGB888 bytes).
+        """
+        w, h = self.width, self.height
+        gram = self.gram
+        out = bytearray(w * h * 3)
+        for n in range(h):
+            row = gram[self._source_row(n) * w * 3:(self._source_row(n) + 1) * w * 3]
+            if self.mirror_x:
+                for x in range(w):
+                    k = (w - 1 - x) * 3
+                    out[(n * w + x) * 3:(n * w + x) * 3 + 3] = row[k:k + 3]
+            else:
+                out[n * w * 3:(n + 1) * w * 3] = row
+        return w, h, bytes(out)
+
+    def logical_frame(self):
+        """
+        Return the image on the glass turned to the orientation set by MADCTL,
+        so logical pixel (x, y) of the driver lands at (x, y) of the image.
+
+        Returns:
+            tuple: (width, height, RGB888 bytes).
+        """
+        fw, fh, frame = self.frame()
+        madctl = self.madctl
+        mv = madctl & _MADCTL_MV
+        lw, lh = (fh, fw) if mv else (fw, fh)
+        out = bytearray(lw * lh * 3)
+        for p in range(lh):
+            for c in range(lw):
+                x, y = (p, c) if mv else (c, p)
+                if madctl & _MADCTL_MX:
+                    x = fw - 1 - x
+                if madctl & _MADCTL_MY:
+                    y = fh - 1 - y
+                if self.mirror_x:
+                    x = fw - 1 - x
+                k = (y * fw + x) * 3
+                o = (p * lw + c) * 3
+                out[o:o + 3] = frame[k:k + 3]
+        return lw, lh, bytes(out)
+
+
+def write_png(path, width, height, rgb):
+    """Write RGB888 pixels as a PNG using only zlib."""
+    def chunk(kind, payload):
+        crc = zlib.crc32(kind + payload) & 0xFFFFFFFF
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", crc)
+
+    stride = width * 3
+    raw = b"".join(b"\x00" + rgb[y * stride:(y + 1) * stride] for y in range(height))
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+# --- Bus ---
+class EmulatedSPI:
+    """
+    machine.SPI stand-in that feeds a :class:`Panel` and counts traffic.
+
+    Bytes are only accepted while CS is low; DC low marks a command byte.
+    """
+    def __init__(self, emulator):
+        self._emu = emulator
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def write(self, buf):
+        emu = self._emu
+        if emu.cs.value():
+            return
+        n = len(buf)
+        stats = emu._stats
+        stats["bytes"] += n
+        stats["writes"] += 1
+        panel = emu.panel
+        if emu.dc.value():
+            if panel._cmd in (_RAMWR, _RAMWRC):
+                stats["pixel_bytes"] += n
+            panel.data(buf)
+        else:
+            for c in bytes(buf):
+                stats["commands"] += 1
+                if c == _RAMWR:
+                    stats["windows"] += 1
+                panel.command(c)
+
+    def read(self, n, write=0):
+        self._emu._stats["bytes"] += n
+        return bytes(n)
+
+    def readinto(self, buf, write=0):
+        self._emu._stats["bytes"] += len(buf)
+        for i in range(len(buf)):
+            buf[i] = 0
+
+    def write_readinto(self, wbuf, rbuf):
+        self.write(wbuf)
+
+
+_STAT_KEYS = ("bytes", "pixel_bytes", "writes", "commands", "windows", "cs_cycles")
+
+
+class Emulator:
+    """
+    Emulated display: a :class:`Panel` behind an SPI bus with CS/DC/RST pins.
+
+    Pass ``spi``, ``cs``, ``dc`` and ``rst`` to a driver constructor.
+
+    Parameters:
+        controller (str): Key of :data:`CONTROLLERS`.
+        baud (int): SPI clock used for the time estimates.
+        write_overhead_us (float): Fixed cost added per spi.write call, to
+            model interpreter overhead on the target (0 counts wire time only).
+    """
+    def __init__(self, controller="ili9341", baud=40_000_000, write_overhead_us=0.0):
+        install()
+        width, height = CONTROLLERS[controller]
+        self.panel = Panel(width, height)
+        self.baud = baud
+        self.write_overhead_us = write_overhead_us
+        self.cs = Pin("cs", Pin.OUT, 1)
+        self.dc = Pin("dc", Pin.OUT, 0)
+        self.rst = Pin("rst", Pin.OUT, 1)
+        self.cs._watch = self._cs_changed
+        self.spi = EmulatedSPI(self)
+        self._stats = dict.fromkeys(_STAT_KEYS, 0)
+        self.calls = {}
+        self._depth = 0
+
+    def _cs_changed(self, v):
+        if not v:
+            self._stats["cs_cycles"] += 1
+
+    # --- Statistics ---
+    def stats(self):
+        """
+        Return the traffic counted since the last :meth:`reset_stats`.
+
+        Returns:
+            dict: bytes, pixel_bytes, writes, commands, windows, cs_cycles and
+            us (estimated bus time in microseconds).
+        """
+        s = dict(self._stats)
+        s["us"] = self.bus_time_us(s)
+        return s
+
+    def bus_time_us(self, s):
+        return s["bytes"] * 8e6 / self.baud + s["writes"] * self.write_overhead_us
+
+    def reset_stats(self):
+        self._stats = dict.fromkeys(_STAT_KEYS, 0)
+        self.calls = {}
+
+    @contextmanager
+    def track(self, name):
+        """
+        Attribute the traffic inside the block to ``name`` in :attr:`calls`.
+
+        Nested tracked calls are folded into the outermost one, so a
+        ``text`` call that fills rects is reported once, as ``text``.
+        """
+        if self._depth:
+            yield
+            return
+        before = dict(self._stats)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry = self.calls.get(name)
+            if entry is None:
+                entry = self.calls[name] = dict.fromkeys(("calls",) + _STAT_KEYS, 0)
+            entry["calls"] += 1
+            for k in _STAT_KEYS:
+                entry[k] += self._stats[k] - before[k]
+
+    def profile(self, obj, names=None):
+        """
+        Wrap public methods of a driver instance with :meth:`track`.
+
+        Parameters:
+            obj: Driver instance.
+            names (iterable or None): Method names; defaults to every public
+                callable attribute.
+        """
+        if names is None:
+            names = [n for n in dir(obj) if not n.startswith("_")]
+        for name in names:
+            try:
+                fn = getattr(obj, name)
+            except Exception:
+                continue
+            if not callable(fn) or isinstance(fn, type):
+                continue
+            setattr(obj, name, self._wrap(name, fn))
+
+    def _wrap(self, name, fn):
+        def wrapper(*args, **kwargs):
+            with self.track(name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def report(self):
+        """
+        Returns:
+            list: One dict per tracked name (busiest first) with the counters,
+            ``us`` and ``us_per_call``.
+        """
+        rows = []
+        for name, entry in self.calls.items():
+            row = dict(entry, name=name)
+            row["us"] = self.bus_time_us(entry)
+            row["us_per_call"] = row["us"] / entry["calls"]
+            rows.append(row)
+        rows.sort(key=lambda r: -r["us"])
+        return rows
+
+    def print_report(self, file=None):
+        rows = self.report()
+        print("%-18s %6s %9s %7s %8s %7s %6s %10s" % (
+            "call", "calls", "bytes", "writes", "commands", "windows", "cs", "bus ms"), file=file)
+        for r in rows:
+            print("%-18s %6d %9d %7d %8d %7d %6d %10.3f" % (
+                r["name"], r["calls"], r["bytes"], r["writes"], r["commands"], r["windows"],
+                r["cs_cycles"], r["us"] / 1000), file=file)
+        s = self.stats()
+        print("%-18s %6s %9d %7d %8d %7d %6d %10.3f  @ %d baud" % (
+            "total", "", s["bytes"], s["writes"], s["commands"], s["windows"], s["cs_cycles"],
+            s["us"] / 1000, self.baud), file=file)
+
+    # --- Output ---
+    def save_png(self, path, logical=True):
+        """
+        Save what the panel shows as a PNG.
+
+        Parameters:
+            logical (bool): Turn the image to the driver's rotation (default);
+                otherwise save the native portrait view.
+        """
+        if logical:
+            w, h, rgb = self.panel.logical_frame()
+        else:
+            w, h, rgb = self.panel.frame()
+        write_png(path, w, h, rgb)
+
+
+# --- Command line ---
+def _run_forecast(emu, controller, path, rotation):
+    import json
+    import drivers.tft_spi as tft_spi
+    from forecast import AvalancheForecast
+    cls = getattr(tft_spi, controller.upper())
+    tft = cls(emu.spi, emu.cs, emu.dc, rst=emu.rst, rotation=rotation)
+    tft.init()
+    tft.erase()
+    emu.reset_stats()
+    emu.profile(tft)
+    with open(path) as f:
+        data = json.load(f)
+    forecast = AvalancheForecast(tft)
+    with emu.track("display_forecast"):
+        forecast.display_forecast(data, 10)
+
+
+def _run_legacy(emu, rotation):
+    from drivers.ili934x import ILI9341
+    # The legacy driver takes the landscape size and swaps it for portrait rotations
+    tft = ILI9341(emu.spi, emu.cs, emu.dc, emu.rst, emu.panel.height, emu.panel.width, rotation)
+    emu.reset_stats()
+    emu.profile(tft, ("erase", "fill_rectangle", "pixel", "chars", "print", "write"))
+    tft.erase()
+    tft.set_color(0xFFFF, 0x0000)
+    tft.set_pos(10, 10)
+    tft.print("Avalanche forecast")
+    tft.fill_rectangle(10, 40, 100, 16, 0xF800)
+
+
+def main() -> int:
+    import argparse
+    ap = argparse.ArgumentParser(description="Run a TFT driver against an emulated panel.")
+    ap.add_argument("--controller", choices=sorted(CONTROLLERS), default="ili9341")
+    ap.add_argument("--driver", choices=("tft_spi", "ili934x"), default="tft_spi")
+    ap.add_argument("--forecast", default=os.path.join(_ROOT, "docs", "example_forecast.json"),
+                    help="Forecast JSON drawn with forecast.py (tft_spi driver)")
+    ap.add_argument("--rotation", type=int, default=2)
+    ap.add_argument("--baud", type=int, default=40_000_000)
+    ap.add_argument("--overhead-us", type=float, default=0.0,
+                    help="Fixed cost per spi.write call added to the time estimate")
+    ap.add_argument("--out", default=None, help="PNG file for the final screen")
+    args = ap.parse_args()
+
+    import tempfile
+    emu = Emulator(args.controller, baud=args.baud, write_overhead_us=args.overhead_us)
+    forecast_path = os.path.abspath(args.forecast)
+    out = os.path.abspath(args.out) if args.out else None
+    cwd = os.getcwd()
+    # forecast.py caches its display list in the working directory
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            if args.driver == "tft_spi":
+                _run_forecast(emu, args.controller, forecast_path, args.rotation)
+            else:
+                _run_legacy(emu, args.rotation)
+        finally:
+            os.chdir(cwd)
+    emu.print_report()
+    if out:
+        emu.save_png(out)
+        print("Wrote", out)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())